@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Social Writer Dashboard Animated Export
+
+Renders a sequence of dashboard snapshots as an animated APNG or GIF. Every
+frame goes through ``DashboardGenerator.update``, so the background, header
+and left sidebar are drawn once and reused from the layer cache; only panels
+whose inputs changed (the opportunity cards, and the trending chart and
+alerts in the right sidebar) are redrawn. Frames are streamed into the file
+as they are rendered: each is stored as the bounding box of its difference
+from the previous one, and frames that did not change at all are merged into
+the previous frame's duration. GIFs use the renderer's fixed indexed palette
+for every frame.
+
+Each snapshot is a dashboard spec; sections it leaves out keep their value
+from the previous frame. A ``seed`` entry reseeds the trending chart.
+
+Usage:
+    python dashboard_animation.py --frames 60 --output preview.png
+    python dashboard_animation.py --specs snapshots.jsonl --format gif --output preview.gif
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+import zlib
+
+from PIL import GifImagePlugin, Image, ImageChops
+
+from dashboard_batch import read_specs
+from dashboard_data import DashboardData
+from dashboard_feed import PNG_SIGNATURE, png_chunk, up_filter
+from dashboard_generator import DEFAULT_ALERTS, DEFAULT_OPPORTUNITIES, DashboardGenerator, indexed_palette
+
+ANIMATION_FORMATS = {
+    'apng': {'extension': '.png'},
+    'gif': {'extension': '.gif'},
+}
+
+
+def render_frames(generator, snapshots):
+    """Yield one image per snapshot, redrawing only the panels that changed"""
+    for snapshot in snapshots:
+        snapshot = dict(snapshot)
+        if 'seed' in snapshot:
+            generator.seed = snapshot.pop('seed')
+        yield generator.update(**{name: value for name, value in snapshot.items()
+                                  if name in DashboardData.__slots__})
+
+
+class AnimationWriter:
+    """Write frames to a file as they arrive, keeping only the previous frame
+
+    Each frame after the first is stored as the bounding box of its
+    difference from the previous one. A frame identical to the previous one
+    only extends that frame's display time, so one encoded frame is held back
+    until the next different frame (or ``close``) fixes its duration.
+    Subclasses write the container format.
+    """
+
+    def __init__(self, fileobj, duration=100, loop=0):
+        self.fileobj = fileobj
+        self.duration = duration
+        self.loop = loop
+        self.frames = 0
+        self._previous = None
+        self._pending = None
+
+    def prepare(self, frame):
+        """Convert a rendered frame to what the format stores"""
+        return frame
+
+    def add(self, frame):
+        """Append one full-size frame"""
+        frame = self.prepare(frame)
+        if self._previous is None:
+            self._write_header(frame)
+            region, offset = frame, (0, 0)
+        else:
+            bbox = _difference_bbox(self._previous, frame)
+            if bbox is None:
+                self._pending[2] += self.duration
+                return
+            region, offset = frame.crop(bbox), bbox[:2]
+        self._flush()
+        self._pending = [region, offset, self.duration]
+        self._previous = frame
+
+    def _flush(self):
+        if self._pending is not None:
+            self._write_frame(*self._pending)
+            self.frames += 1
+            self._pending = None
+
+    def close(self):
+        """Write the last frame and the trailer"""
+        if self._previous is None:
+            raise ValueError("No frames to write")
+        self._flush()
+        self._write_trailer()
+
+
+def _difference_bbox(a, b):
+    """Bounding box of the pixels that differ between two images of the same mode"""
+    if a.mode == 'P':
+        # Compare palette indexes, not the colors they map to
+        a = Image.frombytes('L', a.size, a.tobytes())
+        b = Image.frombytes('L', b.size, b.tobytes())
+    return ImageChops.difference(a, b).getbbox()
+
+
+class GifStreamWriter(AnimationWriter):
+    """Animated GIF with one fixed global palette shared by every frame
+
+    A fixed palette keeps unchanged pixels identical from frame to frame, and
+    colors that only appear in later frames map as well as those in the first.
+    """
+
+    def __init__(self, fileobj, palette, duration=100, loop=0):
+        super().__init__(fileobj, duration, loop)
+        self.palette = palette
+
+    def prepare(self, frame):
+        if frame.mode == 'P':
+            return frame
+        return frame.convert('RGB').quantize(palette=self.palette, dither=Image.Dither.NONE)
+
+    def _write_header(self, frame):
+        header, _ = GifImagePlugin.getheader(frame.copy(), info={'loop': self.loop})
+        for part in header:
+            self.fileobj.write(part)
+
+    def _write_frame(self, region, offset, duration):
+        for part in GifImagePlugin.getdata(region.copy(), offset, duration=duration):
+            self.fileobj.write(part)
+
+    def _write_trailer(self):
+        self.fileobj.write(b';')
+
+
+class ApngStreamWriter(AnimationWriter):
+    """Animated PNG; RGB frames, or palette frames for indexed output
+
+    The frame count in ``acTL`` is only known at the end, so ``fileobj`` must
+    be seekable; the chunk is rewritten by ``close``.
+    """
+
+    def __init__(self, fileobj, duration=100, loop=0, level=6):
+        super().__init__(fileobj, duration, loop)
+        self.level = level
+        self._sequence = 0
+        self._actl_offset = None
+
+    def prepare(self, frame):
+        return frame if frame.mode in ('RGB', 'P') else frame.convert('RGB')
+
+    def _write_header(self, frame):
+        color_type = 3 if frame.mode == 'P' else 2
+        self.fileobj.write(PNG_SIGNATURE)
+        self.fileobj.write(png_chunk(b'IHDR', struct.pack('>IIBBBBB', *frame.size, 8, color_type, 0, 0, 0)))
+        if frame.mode == 'P':
+            self.fileobj.write(png_chunk(b'PLTE', bytes(frame.getpalette()[:768])))
+        self._actl_offset = self.fileobj.tell()
+        self.fileobj.write(png_chunk(b'acTL', struct.pack('>II', 0, self.loop)))
+
+    def _next_sequence(self):
+        self._sequence += 1
+        return self._sequence - 1
+
+    def _write_frame(self, region, offset, duration):
+        # Source blending and no disposal: each region replaces what was there
+        self.fileobj.write(png_chunk(b'fcTL', struct.pack('>IIIIIHHBB', self._next_sequence(), *region.size,
+                                                          *offset, duration, 1000, 0, 0)))
+        data = zlib.compress(up_filter(region), self.level)
+        if self.frames == 0:
+            self.fileobj.write(png_chunk(b'IDAT', data))
+        else:
+            self.fileobj.write(png_chunk(b'fdAT', struct.pack('>I', self._next_sequence()) + data))
+
+    def _write_trailer(self):
+        self.fileobj.write(png_chunk(b'IEND', b''))
+        end = self.fileobj.tell()
+        self.fileobj.seek(self._actl_offset)
+        self.fileobj.write(png_chunk(b'acTL', struct.pack('>II', self.frames, self.loop)))
+        self.fileobj.seek(end)
+
+
+def export_animation(generator, snapshots, output_path, fmt='apng', duration=100, loop=0):
+    """Render ``snapshots`` and stream them into an animation; returns frame count and timings
+
+    ``duration`` is the display time of each frame in milliseconds. Frames are
+    written as they are rendered, so memory does not grow with the number of
+    frames. GIF frames are mapped onto the generator's fixed indexed palette.
+    Raises ValueError when there are no snapshots.
+    """
+    if fmt not in ANIMATION_FORMATS:
+        raise ValueError(f"Unknown animation format: {fmt}")
+
+    stats = {'frames': 0, 'render_seconds': 0.0}
+    start = time.perf_counter()
+    with open(output_path, 'wb') as f:
+        if fmt == 'gif':
+            palette = generator.palette_image or indexed_palette(generator.palette)
+            writer = GifStreamWriter(f, palette, duration, loop)
+        else:
+            writer = ApngStreamWriter(f, duration, loop)
+        frames = render_frames(generator, snapshots)
+        while True:
+            render_start = time.perf_counter()
+            frame = next(frames, None)
+            stats['render_seconds'] += time.perf_counter() - render_start
+            if frame is None:
+                break
+            stats['frames'] += 1
+            writer.add(frame)
+        if stats['frames'] == 0:
+            raise ValueError("No snapshots to animate")
+        writer.close()
+    stats['stored_frames'] = writer.frames
+    stats['seconds'] = time.perf_counter() - start
+    stats['encode_seconds'] = stats['seconds'] - stats['render_seconds']
+    return stats
+
+
+def demo_snapshots(count, seed=0):
+    """Snapshots that rotate the sample opportunities and alerts and reseed the chart every frame"""
+    for i in range(count):
+        shift = i // 4
+        yield {
+            'seed': seed + i,
+            'opportunities': DEFAULT_OPPORTUNITIES[shift % len(DEFAULT_OPPORTUNITIES):]
+            + DEFAULT_OPPORTUNITIES[:shift % len(DEFAULT_OPPORTUNITIES)],
+            'alerts': DEFAULT_ALERTS[i % len(DEFAULT_ALERTS):] + DEFAULT_ALERTS[:i % len(DEFAULT_ALERTS)],
+        }
+
+
+def main(argv=None):
+    """Command line entry point for animated export"""
+    parser = argparse.ArgumentParser(description="Export an animated dashboard preview")
+    parser.add_argument('--specs', help="JSONL file with one snapshot spec per frame (default: a sample sequence)")
+    parser.add_argument('--frames', type=int, default=60, help="frames in the sample sequence")
+    parser.add_argument('--format', dest='fmt', default='apng', choices=sorted(ANIMATION_FORMATS))
+    parser.add_argument('--output', default=None, help="output file (default: social-writer-dashboard + extension)")
+    parser.add_argument('--duration', type=int, default=100, help="milliseconds per frame")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first frame's chart")
+    parser.add_argument('--indexed', action='store_true', help="render onto the fixed indexed palette")
+    parser.add_argument('--font-path', action='append', dest='font_paths',
+                        help="directory to search for fonts (repeatable)")
+    args = parser.parse_args(argv)
+
+    if args.specs:
+        snapshots = (spec for _, spec, error in read_specs(args.specs) if not error)
+    else:
+        snapshots = demo_snapshots(args.frames, args.seed)
+    output_path = args.output or "social-writer-dashboard" + ANIMATION_FORMATS[args.fmt]['extension']
+
+    generator = DashboardGenerator(font_search_paths=args.font_paths, verbose=False, seed=args.seed,
+                                   indexed=args.indexed)
+    try:
+        stats = export_animation(generator, snapshots, output_path, args.fmt, args.duration)
+    except ValueError as e:
+        if os.path.exists(output_path):
+            os.unlink(output_path)
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    frames = stats['frames']
+    print(f"Animation written: {output_path} ({frames} frames)")
+    print(f"- render: {stats['render_seconds'] * 1000:.1f} ms ({stats['render_seconds'] * 1000 / frames:.1f} ms/frame)")
+    print(f"- encode: {stats['encode_seconds'] * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
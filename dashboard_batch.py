@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Social Writer Dashboard Batch Renderer
+
+Renders one dashboard per line of a JSONL spec file across a pool of worker
+processes. Each spec is a JSON object with optional ``id``, ``user``,
+``keywords``, ``opportunities``, ``trending`` and ``alerts`` entries, the same
+shape accepted by ``DashboardGenerator.generate_dashboard``, plus optional
+``colors`` (palette overrides), ``scale`` and ``seed`` (default 0, so a spec
+always renders the same image).
+
+With ``--shared-chrome`` (``render_tenants``) everything that is the same in
+every dashboard (panel frames, headings, static labels, the filter bar) is
+rendered per palette and scale in the parent process and published in
+shared memory for as long as jobs in flight use it. Jobs carry only the
+small description of their layer; a worker maps each layer by name the
+first time it needs it and only draws each user's content over it, so no
+layer is pickled per job. Workers keep a few generators and layer mappings,
+least recently used dropped first, so many per-brand palettes do not add up.
+
+Usage:
+    python dashboard_batch.py specs.jsonl --out-dir previews --workers 8
+    python dashboard_batch.py specs.jsonl --out-dir previews --shared-chrome
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import resource_tracker, shared_memory, util
+
+from PIL import Image
+
+from dashboard_generator import ENCODER_PROFILES, DashboardGenerator, resolve_palette
+
+# Shared chrome layers a render_tenants worker keeps mapped
+MAX_ATTACHED_LAYERS = 4
+
+# Largest ``scale`` a spec may ask for; a 4x dashboard is already 7680x4320
+MAX_SPEC_SCALE = 4
+
+# Per-process GeneratorPool, set up by the pool initializer
+_generators = None
+# Per-process LRU of {shared memory block name: (SharedMemory, layer)} for render_tenants
+_tenant_layers = OrderedDict()
+
+
+def spec_options(spec, default_scale=1):
+    """The (scale, colors) a spec asks for; raises ValueError if they are unusable
+
+    Every entry point (render_batch, render_tenants, the HTTP server and the
+    render daemon) reads ``scale`` and ``colors`` through this, so a spec
+    renders the same wherever it is sent.
+    """
+    scale = spec.get('scale', default_scale)
+    colors = spec.get('colors') or {}
+    if type(scale) is not int or not 1 <= scale <= MAX_SPEC_SCALE:
+        raise ValueError(f"scale must be an integer from 1 to {MAX_SPEC_SCALE}")
+    if not isinstance(colors, dict) or not all(isinstance(value, str) for value in colors.values()):
+        raise ValueError("colors must be an object of color strings")
+    try:
+        resolve_palette(colors)
+    except ValueError as e:
+        raise ValueError(f"invalid colors: {e}") from None
+    return scale, colors
+
+
+def _generator_key(scale=1, colors=None):
+    return json.dumps([scale, colors or {}], sort_keys=True)
+
+
+class GeneratorPool:
+    """DashboardGenerators for the palettes and scales specs ask for, least recently used dropped first
+
+    Each generator holds its own fonts, sprites and text layouts, so only
+    ``maxsize`` are kept. ``colors`` are applied under every spec's own
+    colors; the other keyword arguments go to ``DashboardGenerator``.
+    """
+
+    def __init__(self, maxsize=4, colors=None, **options):
+        self.maxsize = maxsize
+        self.colors = dict(colors or {})
+        self.options = options
+        self._generators = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, scale=1, colors=None):
+        """The generator for a palette and scale; raises ValueError for colors Pillow cannot parse"""
+        colors = dict(self.colors, **(colors or {}))
+        key = _generator_key(scale, colors)
+        with self._lock:
+            generator = self._generators.get(key)
+            if generator is not None:
+                self._generators.move_to_end(key)
+                return generator
+        generator = DashboardGenerator(verbose=False, scale=scale, **self.options)
+        if colors:
+            generator.set_colors(**colors)
+        with self._lock:
+            generator = self._generators.setdefault(key, generator)
+            while len(self._generators) > self.maxsize:
+                _, evicted = self._generators.popitem(last=False)
+                evicted.close()
+        return generator
+
+    def close(self):
+        with self._lock:
+            for generator in self._generators.values():
+                generator.close()
+            self._generators.clear()
+
+
+def _worker_generator(scale=1, colors=None):
+    """The worker's DashboardGenerator for a palette and scale"""
+    if _generators is None:
+        _init_worker()
+    return _generators.get(scale, colors)
+
+
+def _init_worker(font_search_paths=None, cache_dir=None, indexed=False):
+    """Set up the worker's GeneratorPool and warm the default generator's font cache"""
+    global _generators
+    _generators = GeneratorPool(font_search_paths=font_search_paths, cache_dir=cache_dir, indexed=indexed)
+    generator = _generators.get()
+    for size in set(generator.fonts.values()):
+        generator.font_registry.get(size)
+
+
+def _render_job(job_id, spec, output_path, encoder='png'):
+    """Render a single spec in a worker; failures are returned, not raised"""
+    start = time.perf_counter()
+    try:
+        generator = _worker_generator(*spec_options(spec))
+        generator.seed = spec.get('seed', 0)
+        generator.generate_dashboard(output_path, data=spec, encoder=encoder)
+    except Exception:
+        return job_id, None, time.perf_counter() - start, traceback.format_exc(), False
+    return job_id, output_path, time.perf_counter() - start, None, generator.last_encode['cached']
+
+
+def read_specs(path):
+    """Yield (job_id, spec, error) for each non-empty line of a JSONL file"""
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                spec = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield f"line-{line_number}", None, f"invalid JSON: {e}"
+                continue
+            if not isinstance(spec, dict):
+                yield f"line-{line_number}", None, "spec must be a JSON object"
+                continue
+            yield str(spec.get('id', f"line-{line_number}")), spec, None
+
+
+def _safe_filename(job_id):
+    return ''.join(c if c.isalnum() or c in '-_.' else '_' for c in job_id)
+
+
+def render_batch(spec_path, out_dir, workers=None, font_search_paths=None, max_pending=None, encoder='png',
+                 cache_dir=None):
+    """Render every spec in ``spec_path`` into ``out_dir``
+
+    Returns a dict with the rendered paths, per-job failures, render cache
+    hits, elapsed time and throughput. A failing job, invalid ``colors``
+    included, is recorded and the rest of the batch continues. With
+    ``cache_dir``, specs whose inputs match an earlier render reuse the cached
+    image.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+
+    rendered = {}
+    failures = {}
+    cache_hits = 0
+    start = time.perf_counter()
+
+    def collect(done):
+        nonlocal cache_hits
+        job_id, path, elapsed, error, cached = done.result()
+        if error:
+            failures[job_id] = error
+        else:
+            rendered[job_id] = path
+            cache_hits += cached
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(font_search_paths, cache_dir)) as executor:
+        pending = set()
+        for job_id, spec, error in read_specs(spec_path):
+            if error:
+                failures[job_id] = error
+                continue
+            extension = ENCODER_PROFILES[encoder]['extension']
+            output_path = os.path.join(out_dir, f"{_safe_filename(job_id)}{extension}")
+            pending.add(executor.submit(_render_job, job_id, spec, output_path, encoder))
+
+            # Keep the spec file streaming instead of queueing every job up front
+            if len(pending) >= max_pending:
+                done = next(as_completed(pending))
+                pending.remove(done)
+                collect(done)
+
+        for done in as_completed(pending):
+            collect(done)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'rendered': rendered,
+        'failures': failures,
+        'cache_hits': cache_hits,
+        'elapsed': elapsed,
+        'throughput': len(rendered) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+class SharedChrome:
+    """Chrome layers rendered per palette and scale and published in shared memory
+
+    ``layers`` maps a layer key to a small picklable description (shared
+    memory block name, image mode, size and palette, and the generator
+    options) from which a worker can read the layer back. Layers are
+    reference counted: ``publish`` takes a reference for one job and
+    ``release`` drops it, and a layer no job references is unlinked, so only
+    the palettes of jobs in flight stay in shared memory.
+    """
+
+    def __init__(self, font_search_paths=None, indexed=False):
+        self.font_search_paths = font_search_paths
+        self.indexed = indexed
+        self.layers = {}
+        self.published = 0
+        self.peak_nbytes = 0
+        self._blocks = {}
+        self._refs = {}
+
+    layer_key = staticmethod(_generator_key)
+
+    def publish(self, scale=1, colors=None):
+        """Take a reference to the chrome for a palette and scale, rendering it if needed; returns its key"""
+        key = self.layer_key(scale, colors)
+        if key not in self.layers:
+            self._publish(key, scale, colors)
+        self._refs[key] += 1
+        return key
+
+    def _publish(self, key, scale, colors):
+        generator = DashboardGenerator(font_search_paths=self.font_search_paths, verbose=False,
+                                       indexed=self.indexed, scale=scale)
+        if colors:
+            generator.set_colors(**colors)
+        img = generator.render_chrome()
+        data = img.tobytes()
+        block = shared_memory.SharedMemory(create=True, size=len(data))
+        block.buf[:len(data)] = data
+        self._blocks[key] = block
+        self._refs[key] = 0
+        self.layers[key] = {
+            'name': block.name,
+            'mode': img.mode,
+            'size': img.size,
+            'nbytes': len(data),
+            'palette': img.getpalette() if img.mode == 'P' else None,
+            'scale': scale,
+            'colors': colors or {},
+        }
+        self.published += 1
+        self.peak_nbytes = max(self.peak_nbytes, self.nbytes)
+
+    def release(self, key):
+        """Drop one job's reference to a layer, unlinking the layer when it was the last"""
+        self._refs[key] -= 1
+        if self._refs[key] == 0:
+            self._unlink(key)
+
+    def _unlink(self, key):
+        block = self._blocks.pop(key)
+        del self._refs[key], self.layers[key]
+        block.close()
+        if sys.version_info < (3, 13):
+            # Pool workers share this process's resource tracker, and before 3.13 they
+            # unregister the blocks they attach (see _attach_layer); register the block
+            # again so that unlink() finds it
+            resource_tracker.register(block._name, 'shared_memory')
+        block.unlink()
+
+    @property
+    def nbytes(self):
+        """Total size of the layers currently published"""
+        return sum(layer['nbytes'] for layer in self.layers.values())
+
+    def close(self):
+        """Release and remove every shared memory block"""
+        for key in list(self._blocks):
+            self._unlink(key)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _init_tenant_worker(font_search_paths=None, indexed=False):
+    """Set up a render_tenants worker; chrome layers are mapped as jobs need them"""
+    _init_worker(font_search_paths, indexed=indexed)
+    _tenant_layers.clear()
+    # Finalizers run when the worker exits, forked or spawned, unlike atexit handlers
+    util.Finalize(None, _close_tenant_layers, exitpriority=10)
+
+
+def _attach_layer(layer):
+    """Map a published chrome layer's shared memory block, keeping the most recent few mapped"""
+    entry = _tenant_layers.get(layer['name'])
+    if entry is not None:
+        _tenant_layers.move_to_end(layer['name'])
+    else:
+        if sys.version_info >= (3, 13):
+            block = shared_memory.SharedMemory(name=layer['name'], track=False)
+        else:
+            block = shared_memory.SharedMemory(name=layer['name'])
+            # Attaching registers the block as if this process owned it; the parent removes it
+            resource_tracker.unregister(block._name, 'shared_memory')
+        entry = _tenant_layers[layer['name']] = (block, layer)
+        while len(_tenant_layers) > MAX_ATTACHED_LAYERS:
+            evicted, _ = _tenant_layers.popitem(last=False)[1]
+            evicted.close()
+    return entry
+
+
+def _close_tenant_layers():
+    """Release the worker's mappings of the shared chrome layers"""
+    for block, _ in _tenant_layers.values():
+        block.close()
+    _tenant_layers.clear()
+
+
+def _render_tenant_job(job_id, spec, layer, output_path, encoder='png'):
+    """Draw one user's content over a shared chrome layer; failures are returned, not raised"""
+    start = time.perf_counter()
+    try:
+        block, layer = _attach_layer(layer)
+        generator = _worker_generator(layer['scale'], layer['colors'])
+        # Reading the layer back is the per-job copy the content is drawn on
+        chrome = Image.frombytes(layer['mode'], tuple(layer['size']), block.buf[:layer['nbytes']])
+        if layer['palette'] is not None:
+            chrome.putpalette(layer['palette'])
+        generator.seed = spec.get('seed', 0)
+        img = generator.render_content(spec, chrome)
+        encoded, _ = generator.encode(img, encoder)
+        with open(output_path, 'wb') as f:
+            f.write(encoded)
+    except Exception:
+        return job_id, None, time.perf_counter() - start, traceback.format_exc()
+    return job_id, output_path, time.perf_counter() - start, None
+
+
+def render_tenants(specs, out_dir, workers=None, font_search_paths=None, max_pending=None, encoder='png',
+                   indexed=False):
+    """Render one dashboard per user spec into ``out_dir`` over shared chrome layers
+
+    ``specs`` is an iterable of spec dicts, each optionally with ``id``,
+    ``colors``, ``scale`` and ``seed``; it is consumed as jobs are submitted,
+    with at most ``max_pending`` in flight. The chrome for a palette and
+    scale is rendered when a job needs it and no job in flight has it
+    already, and is unlinked once its last job finishes; workers draw only
+    the user, keywords, cards, trending topics and alerts. Returns the same
+    dict as ``render_batch`` (without cache hits) plus the number of chrome
+    layers published and the peak size of those held at once, in bytes.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+    extension = ENCODER_PROFILES[encoder]['extension']
+
+    rendered = {}
+    failures = {}
+    start = time.perf_counter()
+
+    with SharedChrome(font_search_paths, indexed) as chrome:
+
+        def collect(done):
+            chrome.release(pending.pop(done))
+            job_id, path, elapsed, error = done.result()
+            if error:
+                failures[job_id] = error
+            else:
+                rendered[job_id] = path
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_tenant_worker,
+                                 initargs=(font_search_paths, indexed)) as executor:
+            # {future: layer key it holds a reference to}
+            pending = {}
+            for index, spec in enumerate(specs, 1):
+                job_id = str(spec.get('id', f"spec-{index}"))
+                try:
+                    key = chrome.publish(*spec_options(spec))
+                except (TypeError, ValueError) as e:
+                    failures[job_id] = f"invalid spec: {e}"
+                    continue
+                output_path = os.path.join(out_dir, f"{_safe_filename(job_id)}{extension}")
+                future = executor.submit(_render_tenant_job, job_id, spec, chrome.layers[key], output_path, encoder)
+                pending[future] = key
+                if len(pending) >= max_pending:
+                    collect(next(as_completed(pending)))
+
+            for done in as_completed(list(pending)):
+                collect(done)
+        layer_count, layer_bytes = chrome.published, chrome.peak_nbytes
+
+    elapsed = time.perf_counter() - start
+    return {
+        'rendered': rendered,
+        'failures': failures,
+        'chrome_layers': layer_count,
+        'chrome_bytes': layer_bytes,
+        'elapsed': elapsed,
+        'throughput': len(rendered) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main(argv=None):
+    """Command line entry point for batch rendering"""
+    parser = argparse.ArgumentParser(description="Render dashboard previews from a JSONL spec file")
+    parser.add_argument('specs', help="JSONL file with one dashboard spec per line")
+    parser.add_argument('--out-dir', default='dashboards', help="directory for rendered images")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--encoder', default='png', choices=sorted(ENCODER_PROFILES), help="encoder profile")
+    parser.add_argument('--cache-dir', help="reuse unchanged renders from this content-addressed cache")
+    parser.add_argument('--shared-chrome', action='store_true',
+                        help="render the shared chrome once per palette and scale and draw only per-user content")
+    parser.add_argument('--font-path', action='append', dest='font_paths',
+                        help="directory to search for fonts (repeatable)")
+    args = parser.parse_args(argv)
+
+    if args.shared_chrome and args.cache_dir:
+        parser.error("--cache-dir cannot be combined with --shared-chrome")
+
+    if args.shared_chrome:
+        read_failures = {}
+
+        def specs():
+            for job_id, spec, error in read_specs(args.specs):
+                if error:
+                    read_failures[job_id] = error
+                else:
+                    yield dict(spec, id=job_id)
+
+        result = render_tenants(specs(), args.out_dir, workers=args.workers, font_search_paths=args.font_paths,
+                                encoder=args.encoder)
+        result['failures'].update(read_failures)
+    else:
+        result = render_batch(args.specs, args.out_dir, workers=args.workers,
+                              font_search_paths=args.font_paths, encoder=args.encoder,
+                              cache_dir=args.cache_dir)
+
+    for job_id, error in sorted(result['failures'].items()):
+        print(f"FAILED {job_id}: {error.strip().splitlines()[-1]}", file=sys.stderr)
+
+    if args.shared_chrome:
+        reuse = f"{result['chrome_layers']} shared chrome layers (peak {result['chrome_bytes'] / 2 ** 20:.1f} MiB)"
+    else:
+        reuse = f"{result['cache_hits']} from cache"
+    print(f"Rendered {len(result['rendered'])} dashboards in {result['elapsed']:.2f}s "
+          f"({result['throughput']:.2f} dashboards/sec), {len(result['failures'])} failed, {reuse}")
+    return 1 if result['failures'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
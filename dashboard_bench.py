@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Social Writer Dashboard Renderer Benchmarks
+
+Times DashboardGenerator end to end and stage by stage (background, each
+draw_* section and PNG encoding) across canvas sizes and
+data volumes. Every run is seeded, so the rendered pixels and synthetic data
+are identical between runs and the JSON output can be diffed across commits.
+
+Usage:
+    python dashboard_bench.py --seed 42 --repeat 7 --output bench.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import PIL
+from dashboard_fixtures import synthetic_spec
+from dashboard_generator import DashboardGenerator, encode_image, gradient_background
+
+DEFAULT_SIZES = ((1280, 720), (1920, 1080), (2560, 1440))
+DEFAULT_VOLUMES = (4, 100, 10000)
+
+
+def summarize(samples):
+    """Median, p95, min and mean of timing samples in milliseconds"""
+    ordered = sorted(samples)
+    p95_index = max(0, -(-len(ordered) * 95 // 100) - 1)
+    return {
+        'median_ms': round(statistics.median(ordered) * 1000, 3),
+        'p95_ms': round(ordered[p95_index] * 1000, 3),
+        'min_ms': round(ordered[0] * 1000, 3),
+        'mean_ms': round(statistics.fmean(ordered) * 1000, 3),
+    }
+
+
+def measure(func, repeat, warmup=1):
+    """Time ``func`` ``repeat`` times, then run it once more under tracemalloc for peak memory
+
+    ``peak_kib`` is the Python heap peak; Pillow allocates image buffers in C,
+    outside what tracemalloc sees.
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    result = summarize(samples)
+    result['peak_kib'] = round(peak / 1024, 1)
+    return result
+
+
+def bench_case(width, height, volume, seed, repeat):
+    """Benchmark every stage for one canvas size and data volume"""
+    generator = DashboardGenerator(verbose=False, seed=seed)
+    generator.width, generator.height = width, height
+    spec = synthetic_spec(volume, seed)
+
+    def section(name, *args):
+        img, draw = generator.create_base_image()
+        return lambda: getattr(generator, name)(img, draw, *args)
+
+    def cold_background():
+        gradient_background.cache_clear()
+        generator.create_base_image()
+
+    frame = generator.render(spec)
+    stages = {
+        'generate_dashboard': lambda: generator.generate_dashboard(None, data=spec),
+        'create_base_image': generator.create_base_image,
+        'create_base_image_cold': cold_background,
+        'draw_header': section('draw_header', spec['user']),
+        'draw_sidebar_left': section('draw_sidebar_left', spec['keywords']),
+        'draw_main_content': section('draw_main_content', spec['opportunities']),
+        'draw_sidebar_right': section('draw_sidebar_right', spec['trending'], spec['alerts']),
+        'png_encode': lambda: encode_image(frame, 'png'),
+    }
+    return {
+        'width': width,
+        'height': height,
+        'volume': volume,
+        'stages': {name: measure(func, repeat) for name, func in stages.items()},
+    }
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, volumes=DEFAULT_VOLUMES, seed=42, repeat=5):
+    """Run every size/volume combination and return a JSON-serializable report"""
+    return {
+        'seed': seed,
+        'repeat': repeat,
+        'python': platform.python_version(),
+        'pillow': PIL.__version__,
+        'platform': platform.platform(),
+        'cases': [bench_case(width, height, volume, seed, repeat)
+                  for width, height in sizes for volume in volumes],
+    }
+
+
+def _parse_size(value):
+    width, _, height = value.lower().partition('x')
+    return int(width), int(height)
+
+
+def main(argv=None):
+    """Command line entry point for the benchmark suite"""
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard renderer")
+    parser.add_argument('--seed', type=int, default=42, help="seed for the chart and synthetic data")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per stage")
+    parser.add_argument('--size', action='append', type=_parse_size, dest='sizes',
+                        help="canvas size as WIDTHxHEIGHT (repeatable)")
+    parser.add_argument('--volume', action='append', type=int, dest='volumes',
+                        help="records per data section (repeatable)")
+    parser.add_argument('--output', help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(sizes=args.sizes or DEFAULT_SIZES, volumes=args.volumes or DEFAULT_VOLUMES,
+                            seed=args.seed, repeat=args.repeat)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Content-addressed on-disk cache for rendered dashboards
+
+Artifacts are stored as ``<directory>/<key[:2]>/<key><extension>`` where the
+key is a hash of everything that affects the output. Writes go to a temporary
+file in the same directory and are moved into place with ``os.replace``, so
+concurrent workers never see a partial file. Hits are read in one step, so an
+artifact another worker evicts is simply a miss.
+
+Each process keeps an estimate of the cache size from its own writes. The
+real size is re-read from disk when the estimate passes the byte budget, or
+once the process has written the gap between the budget and the low-water
+mark since it last looked, so concurrent writers overshoot the budget by at
+most that gap each. If the cache is over budget the least recently accessed
+artifacts are removed down to the low-water mark, so eviction runs once per
+batch of writes rather than on every one. Access times are refreshed on every hit so this works on
+``noatime`` mounts too.
+"""
+
+import os
+import tempfile
+import threading
+
+
+class DiskRenderCache:
+    """Size-bounded, LRU-by-access-time cache of encoded images on disk"""
+
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024, low_water=0.9):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # Eviction trims the cache to this size, leaving room for later writes
+        self.low_water_bytes = int(max_bytes * low_water)
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._size = None
+        # Bytes this process has written since it last read the real size
+        self._unsynced = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, key, extension):
+        return os.path.join(self.directory, key[:2], key + extension)
+
+    def get(self, key, extension):
+        """Return the cached bytes for ``key``, or None on a miss"""
+        path = self.path_for(key, extension)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            # Never stored, or already evicted by another worker
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted after it was read; the bytes are still good
+            pass
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key, extension, data):
+        """Atomically store ``data`` under ``key`` and return its path"""
+        path = self.path_for(key, extension)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            replaced = os.stat(path).st_size
+        except FileNotFoundError:
+            replaced = 0
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+        with self._lock:
+            self.writes += 1
+            if self._size is not None:
+                self._size += len(data) - replaced
+            self._unsynced += len(data)
+            stale = (self._size is None or self._size > self.max_bytes
+                     or self._unsynced >= self.max_bytes - self.low_water_bytes)
+        if stale:
+            self.evict()
+        return path
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.startswith('.tmp-'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield path, stat.st_size, stat.st_atime
+
+    def evict(self):
+        """Re-read the real cache size; when it is over budget, remove the least
+        recently accessed artifacts until it is down to the low-water mark
+
+        The size estimate is reset to the real size either way, which also
+        accounts for what other processes have written or removed.
+        """
+        entries = list(self._entries())
+        size = sum(entry[1] for entry in entries)
+        evicted = 0
+        if size > self.max_bytes:
+            for path, entry_size, _ in sorted(entries, key=lambda entry: entry[2]):
+                if size <= self.low_water_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                    evicted += 1
+                except FileNotFoundError:
+                    # Another worker evicted it first
+                    pass
+                size -= entry_size
+        with self._lock:
+            self._size = size
+            self._unsynced = 0
+            self.evictions += evicted
+
+    def stats(self):
+        """Hit/miss counters for this process plus the current on-disk totals"""
+        entries = list(self._entries())
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'writes': self.writes,
+                'evictions': self.evictions,
+                'entries': len(entries),
+                'bytes': sum(entry[1] for entry in entries),
+            }
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Social Writer Render Daemon Client
+
+A stdlib-only client for ``dashboard_daemon.py``. It does not import Pillow or
+the generator, so a render request costs an interpreter start and a socket
+round trip rather than a full renderer start.
+
+Wire format: every message is one line of JSON. A response that carries an
+image has a ``size`` field and is followed by exactly that many raw bytes.
+
+Usage:
+    python dashboard_client.py render spec.json --output dashboard.png
+    python dashboard_client.py render spec.json --stdout > dashboard.png
+    python dashboard_client.py status
+    python dashboard_client.py reload
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+
+DEFAULT_SOCKET = os.environ.get('SOCIAL_WRITER_RENDER_SOCKET') or os.path.join(
+    tempfile.gettempdir(), 'social-writer-render.sock')
+
+# Upper bound on one JSON message line and on the image bytes that follow it
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+
+class DaemonError(RuntimeError):
+    """The daemon rejected or failed a request"""
+
+    def __init__(self, message, response=None):
+        super().__init__(message)
+        self.response = response or {}
+
+    @property
+    def retry(self):
+        """True when the request was refused only because the queue was full"""
+        return bool(self.response.get('retry'))
+
+
+def send_message(stream, message, data=None):
+    """Write one JSON message, followed by ``data`` if given, to a binary stream"""
+    if data is not None:
+        message = dict(message, size=len(data))
+    stream.write(json.dumps(message, separators=(',', ':')).encode('utf-8') + b'\n')
+    if data is not None:
+        stream.write(data)
+    stream.flush()
+
+
+def read_message(stream):
+    """Read one message from a binary stream; returns (message, data) or (None, None) at EOF"""
+    line = stream.readline(MAX_MESSAGE_BYTES + 1)
+    if not line:
+        return None, None
+    if len(line) > MAX_MESSAGE_BYTES:
+        raise ValueError("message too large")
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError("message must be a JSON object")
+    data = None
+    size = message.get('size')
+    if size is not None:
+        if type(size) is not int or not 0 <= size <= MAX_MESSAGE_BYTES:
+            raise ValueError(f"size must be an integer from 0 to {MAX_MESSAGE_BYTES}")
+        data = stream.read(size)
+        if len(data) != size:
+            raise ConnectionError("connection closed in the middle of an image")
+    return message, data
+
+
+class RenderClient:
+    """One connection to a render daemon; requests on it are answered in order"""
+
+    def __init__(self, socket_path=DEFAULT_SOCKET, timeout=120):
+        self.socket_path = socket_path
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        self._socket.connect(socket_path)
+        self._stream = self._socket.makefile('rwb')
+
+    def request(self, message):
+        """Send a request and return (response, data), raising DaemonError on failure"""
+        send_message(self._stream, message)
+        response, data = read_message(self._stream)
+        if response is None:
+            raise ConnectionError("daemon closed the connection")
+        if not response.get('ok'):
+            raise DaemonError(response.get('error', 'request failed'), response)
+        return response, data
+
+    def render(self, spec=None, encoder='png', output=None, job_id=None):
+        """Render a spec; returns the written path with ``output``, otherwise the image bytes
+
+        ``output`` is a path on the daemon's side of the socket.
+        """
+        message = {'command': 'render', 'spec': spec or {}, 'encoder': encoder}
+        if output is not None:
+            message['output'] = os.path.abspath(output)
+        if job_id is not None:
+            message['id'] = job_id
+        response, data = self.request(message)
+        return response['path'] if output is not None else data
+
+    def status(self):
+        return self.request({'command': 'status'})[0]
+
+    def reload(self, colors=None):
+        """Ask the daemon to rebuild its generator, optionally with new palette colors"""
+        message = {'command': 'reload'}
+        if colors:
+            message['colors'] = colors
+        return self.request(message)[0]
+
+    def shutdown(self):
+        return self.request({'command': 'shutdown'})[0]
+
+    def close(self):
+        self._stream.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main(argv=None):
+    """Command line entry point for the daemon client"""
+    parser = argparse.ArgumentParser(description="Talk to a running dashboard render daemon")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help="daemon socket path")
+    commands = parser.add_subparsers(dest='command', required=True)
+    render = commands.add_parser('render', help="render a spec")
+    render.add_argument('spec', nargs='?', help="JSON spec file (default: the sample data)")
+    render.add_argument('--encoder', default='png', help="encoder profile")
+    render.add_argument('--id', dest='job_id', help="job id echoed back by the daemon")
+    target = render.add_mutually_exclusive_group()
+    target.add_argument('--output', help="have the daemon write the image to this path")
+    target.add_argument('--stdout', action='store_true', help="write the image bytes to stdout")
+    commands.add_parser('status', help="print queue and generator status")
+    reload = commands.add_parser('reload', help="rebuild the generator, e.g. after a font or palette change")
+    reload.add_argument('--colors', help="JSON file of palette colors to apply")
+    commands.add_parser('shutdown', help="stop the daemon after the queued jobs")
+    args = parser.parse_args(argv)
+
+    try:
+        with RenderClient(args.socket) as client:
+            if args.command == 'render':
+                spec = {}
+                if args.spec:
+                    with open(args.spec, encoding='utf-8') as f:
+                        spec = json.load(f)
+                if args.stdout:
+                    sys.stdout.buffer.write(client.render(spec, args.encoder, job_id=args.job_id))
+                else:
+                    output = args.output or 'social-writer-dashboard.png'
+                    print(client.render(spec, args.encoder, output=output, job_id=args.job_id))
+            elif args.command == 'reload':
+                colors = None
+                if args.colors:
+                    with open(args.colors, encoding='utf-8') as f:
+                        colors = json.load(f)
+                print(json.dumps(client.reload(colors)))
+            else:
+                print(json.dumps(getattr(client, args.command)(), indent=2))
+    except (OSError, DaemonError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Social Writer Render Daemon
+
+Keeps a warmed DashboardGenerator (fonts resolved and loaded, palette,
+background, sprites and text metrics cached) alive behind a Unix domain
+socket, so rendering a dashboard no longer pays for interpreter start-up,
+the Pillow import and font discovery. ``dashboard_client.py`` is the thin
+client; see it for the wire format.
+
+Requests are JSON objects with a ``command``:
+    render    ``spec``, optional ``encoder``, ``id`` and ``output`` (a path to
+              write; otherwise the image bytes are returned). The spec's
+              ``scale``, ``colors`` and ``seed`` are read as
+              ``dashboard_batch`` reads them, over the daemon's own palette
+    status    queue depth, job counters and the generator generation
+    reload    rebuild the generator, optionally with new ``colors``; invalid
+              colors are refused and the current ones kept
+    shutdown  finish the queued jobs and exit
+
+Render jobs go through a bounded queue. When it is full a request waits up
+to ``--submit-timeout`` seconds and is then refused with ``retry: true``, so
+a burst slows clients down instead of growing the daemon without limit.
+
+Reloads are graceful: they take effect between jobs, never during one. A
+reload is requested explicitly, by SIGHUP, or automatically when the font
+file in use or the ``--palette`` file changes on disk.
+
+Usage:
+    python dashboard_daemon.py --socket /tmp/social-writer-render.sock --palette colors.json
+"""
+
+import argparse
+import json
+import os
+import queue
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import Future
+
+from dashboard_batch import GeneratorPool, spec_options
+from dashboard_client import DEFAULT_SOCKET, read_message, send_message
+from dashboard_generator import ENCODER_PROFILES, DashboardGenerator, resolve_palette
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except (OSError, TypeError):
+        return None
+
+
+class RenderDaemon:
+    """A warmed generator fed from a bounded job queue by one render thread"""
+
+    def __init__(self, queue_size=64, submit_timeout=5.0, font_search_paths=None, palette_path=None,
+                 cache_dir=None, scale=1, indexed=False):
+        self.submit_timeout = submit_timeout
+        self.font_search_paths = font_search_paths
+        self.palette_path = palette_path
+        self.cache_dir = cache_dir
+        self.scale = scale
+        self.indexed = indexed
+        self.colors = {}
+        self.generation = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.started = time.time()
+        self._jobs = queue.Queue(maxsize=queue_size)
+        self._reload = threading.Event()
+        self._lock = threading.Lock()
+        self._generator, self._variants, self._watched = self._build_generator()
+        self._thread = threading.Thread(target=self._run, name='render', daemon=True)
+        self._thread.start()
+
+    def _load_palette(self):
+        if not self.palette_path:
+            return {}
+        with open(self.palette_path, encoding='utf-8') as f:
+            colors = json.load(f)
+        if not isinstance(colors, dict):
+            raise ValueError(f"{self.palette_path} must hold a JSON object of colors")
+        return colors
+
+    def _build_generator(self):
+        """A new warmed generator, a pool for specs with their own scale or colors, and the watched mtimes
+
+        The generator has every font size, the background and the sprites
+        already loaded.
+        """
+        with self._lock:
+            colors = dict(self._load_palette(), **self.colors)
+        generator = DashboardGenerator(font_search_paths=self.font_search_paths, verbose=False, seed=0,
+                                       cache_dir=self.cache_dir, indexed=self.indexed, scale=self.scale)
+        if colors:
+            generator.set_colors(**colors)
+        # One throwaway render loads and caches everything a real job needs
+        generator.render()
+        variants = GeneratorPool(colors=colors, font_search_paths=self.font_search_paths, cache_dir=self.cache_dir,
+                                 indexed=self.indexed)
+        watched = (_mtime(generator.font_registry.font_path), _mtime(self.palette_path))
+        self.generation += 1
+        return generator, variants, watched
+
+    def _watched_changed(self):
+        return (_mtime(self._generator.font_registry.font_path), _mtime(self.palette_path)) != self._watched
+
+    def submit(self, spec, encoder='png', output=None, job_id=None):
+        """Queue a render job and return (job id, Future)
+
+        Raises queue.Full on backpressure and ValueError for an unknown
+        encoder or a spec's unusable scale or colors.
+        """
+        if encoder not in ENCODER_PROFILES:
+            raise ValueError(f"Unknown encoder profile: {encoder}")
+        spec_options(spec, self.scale)
+        job_id = job_id or uuid.uuid4().hex
+        future = Future()
+        try:
+            self._jobs.put((job_id, spec, encoder, output, future), timeout=self.submit_timeout)
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            raise
+        return job_id, future
+
+    def reload(self, colors=None):
+        """Rebuild the generator before the next job, optionally with new palette colors
+
+        Raises ValueError, leaving ``self.colors`` untouched, when ``colors`` is
+        not a mapping of color strings Pillow can parse.
+        """
+        if colors:
+            if not isinstance(colors, dict) or not all(isinstance(value, str) for value in colors.values()):
+                raise ValueError("colors must be an object of color strings")
+            resolve_palette(colors)
+            with self._lock:
+                self.colors.update(colors)
+        self._reload.set()
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            job_id, spec, encoder, output, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            if self._reload.is_set() or self._watched_changed():
+                self._reload.clear()
+                try:
+                    previous = self._variants
+                    self._generator, self._variants, self._watched = self._build_generator()
+                    previous.close()
+                except Exception:
+                    # Keep serving with the previous generator until the next change
+                    traceback.print_exc()
+                    self._watched = (_mtime(self._generator.font_registry.font_path), _mtime(self.palette_path))
+            try:
+                scale, colors = spec_options(spec, self.scale)
+                if scale == self.scale and not colors:
+                    generator = self._generator
+                else:
+                    generator = self._variants.get(scale, colors)
+                # Seeded so the same spec always produces the same image
+                generator.seed = spec.get('seed', 0)
+                result = generator.generate_dashboard(output, data=spec, encoder=encoder)
+                future.set_result((result, dict(generator.last_encode)))
+                with self._lock:
+                    self.completed += 1
+            except Exception as e:
+                future.set_exception(e)
+                with self._lock:
+                    self.failed += 1
+
+    def status(self):
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'uptime': round(time.time() - self.started, 3),
+                'generation': self.generation,
+                'queued': self._jobs.qsize(),
+                'queue_size': self._jobs.maxsize,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'font_path': self._generator.font_registry.font_path,
+            }
+
+    def close(self):
+        """Let the queued jobs finish, then stop the render thread"""
+        self._jobs.put(None)
+        self._thread.join()
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """Answer newline-delimited JSON requests for ``server.service``, in order"""
+
+    def handle(self):
+        while True:
+            try:
+                message, _ = read_message(self.rfile)
+            except (ValueError, ConnectionError) as e:
+                send_message(self.wfile, {'ok': False, 'error': f'bad request: {e}'})
+                return
+            if message is None:
+                return
+            command = message.get('command', 'render')
+            handler = getattr(self, f'_command_{command}', None)
+            if handler is None:
+                send_message(self.wfile, {'ok': False, 'error': f'unknown command: {command}'})
+                continue
+            handler(message)
+
+    def _command_render(self, message):
+        spec = message.get('spec') or {}
+        if not isinstance(spec, dict):
+            return send_message(self.wfile, {'ok': False, 'id': message.get('id'), 'error': 'spec must be an object'})
+        output = message.get('output')
+        try:
+            job_id, future = self.server.service.submit(spec, message.get('encoder', 'png'), output,
+                                                       message.get('id'))
+        except queue.Full:
+            return send_message(self.wfile, {'ok': False, 'id': message.get('id'), 'error': 'queue full',
+                                             'retry': True})
+        except ValueError as e:
+            return send_message(self.wfile, {'ok': False, 'id': message.get('id'), 'error': str(e)})
+
+        try:
+            result, stats = future.result()
+        except Exception as e:
+            traceback.print_exc()
+            return send_message(self.wfile, {'ok': False, 'id': job_id, 'error': f'render failed: {e}'})
+        response = {'ok': True, 'id': job_id, 'encode': stats}
+        if output is not None:
+            send_message(self.wfile, dict(response, path=result))
+        else:
+            send_message(self.wfile, response, result)
+
+    def _command_status(self, message):
+        send_message(self.wfile, dict(self.server.service.status(), ok=True))
+
+    def _command_reload(self, message):
+        try:
+            self.server.service.reload(message.get('colors'))
+        except ValueError as e:
+            return send_message(self.wfile, {'ok': False, 'error': f'invalid colors: {e}'})
+        send_message(self.wfile, {'ok': True, 'reload': 'before next job'})
+
+    def _command_shutdown(self, message):
+        send_message(self.wfile, {'ok': True})
+        threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+
+class DaemonServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def _remove_stale_socket(path):
+    """Delete a socket file left by a daemon that is no longer running"""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise RuntimeError(f"a daemon is already listening on {path}")
+    finally:
+        probe.close()
+
+
+def make_server(socket_path=DEFAULT_SOCKET, daemon=None):
+    """Bind the Unix socket, owner-only, and attach ``daemon`` (a RenderDaemon)"""
+    _remove_stale_socket(socket_path)
+    old_umask = os.umask(0o177)
+    try:
+        server = DaemonServer(socket_path, DaemonRequestHandler)
+    finally:
+        os.umask(old_umask)
+    server.service = daemon or RenderDaemon()
+    return server
+
+
+def main(argv=None):
+    """Command line entry point for the render daemon"""
+    parser = argparse.ArgumentParser(description="Serve dashboard renders over a Unix socket")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help="socket path")
+    parser.add_argument('--queue-size', type=int, default=64, help="jobs waiting before clients are pushed back")
+    parser.add_argument('--submit-timeout', type=float, default=5.0,
+                        help="seconds a request waits for queue space before it is refused")
+    parser.add_argument('--palette', help="JSON file of colors, re-read when it changes")
+    parser.add_argument('--cache-dir', help="on-disk render cache directory")
+    parser.add_argument('--scale', type=int, default=1, help="pixels per layout unit")
+    parser.add_argument('--indexed', action='store_true', help="render onto the fixed indexed palette")
+    parser.add_argument('--font-path', action='append', dest='font_paths',
+                        help="directory to search for fonts (repeatable)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    daemon = RenderDaemon(queue_size=args.queue_size, submit_timeout=args.submit_timeout,
+                          font_search_paths=args.font_paths, palette_path=args.palette,
+                          cache_dir=args.cache_dir, scale=args.scale, indexed=args.indexed)
+    server = make_server(args.socket, daemon)
+    signal.signal(signal.SIGHUP, lambda *_: daemon.reload())
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+    print(f"Render daemon ready on {args.socket} in {time.perf_counter() - start:.2f} s", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        daemon.close()
+        try:
+            os.unlink(args.socket)
+        except FileNotFoundError:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
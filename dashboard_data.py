@@ -0,0 +1,310 @@
+"""
+Dashboard data model and streaming readers
+
+Compact ``__slots__`` records for the data drawn by ``DashboardGenerator``.
+``Keyword`` and ``Opportunity`` follow the ``searchQueries.queries`` and
+``opportunities`` shapes in ``convex/schema.ts``; the legacy dict shapes used by
+the built-in sample data are accepted as well. The readers yield records one at
+a time from JSON arrays or NDJSON so large exports are never fully loaded.
+"""
+
+import json
+import time
+from itertools import islice
+
+# Display names for the searchQueries category literals
+CATEGORY_LABELS = {
+    'industry': 'Industry Terms',
+    'values': 'Brand Values',
+    'products': 'Products',
+    'competitors': 'Competitors',
+}
+
+
+def _percent(value, fraction=True):
+    """Convert a score to an integer percentage clamped to 0-100
+
+    Which scale a value is on is decided by the field it came from, never by
+    its size: Convex scores (``searchQueries`` weights, ``finalScore``) are 0-1
+    fractions, so ``fraction=True``, while the legacy sample-data fields
+    (weights inside keyword categories, ``relevance``) are already 0-100. A
+    legacy ``relevance`` of 1 is therefore 1%, and a Convex weight serialized
+    as ``1`` is 100%.
+    """
+    value = float(value or 0)
+    if fraction:
+        value *= 100
+    return int(round(max(0.0, min(100.0, value))))
+
+
+def format_age(published_at, now=None):
+    """Format a millisecond timestamp as a relative age like '2 hours ago'"""
+    now = time.time() if now is None else now
+    seconds = max(0, int(now - published_at / 1000))
+    if seconds < 60:
+        return "just now"
+    for unit, length in (('day', 86400), ('hour', 3600), ('min', 60)):
+        if seconds >= length:
+            count = seconds // length
+            suffix = 's' if count != 1 and unit != 'min' else ''
+            return f"{count} {unit}{suffix} ago"
+
+
+class Record:
+    """Base class for slot records with dict-style construction"""
+    __slots__ = ()
+
+    @classmethod
+    def coerce(cls, value):
+        """Return ``value`` as an instance of this record type"""
+        if isinstance(value, cls):
+            return value
+        return cls.from_dict(value)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from a dict keyed by slot names, the inverse of ``to_dict``
+
+        Subclasses override this to also accept their Convex and legacy shapes.
+        """
+        return cls(**{name: data[name] for name in cls.__slots__ if name in data})
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Keyword(Record):
+    """A brand search term, as stored in ``searchQueries.queries``"""
+    __slots__ = ('term', 'weight', 'category', 'active')
+
+    def __init__(self, term, weight, category='industry', active=True):
+        self.term = term
+        self.weight = weight
+        self.category = category
+        self.active = active
+
+    @classmethod
+    def from_dict(cls, data, fraction=True):
+        """Build from a ``searchQueries`` entry (0-1 weight), or a legacy 0-100 one with ``fraction=False``"""
+        return cls(
+            term=data['term'],
+            weight=_percent(data.get('weight', 0), fraction),
+            category=data.get('category', 'industry'),
+            active=data.get('active', data.get('isActive', True)),
+        )
+
+
+class KeywordCategory(Record):
+    """A labelled group of keywords shown in the left sidebar"""
+    __slots__ = ('name', 'keywords')
+
+    def __init__(self, name, keywords):
+        self.name = name
+        self.keywords = keywords
+
+    @classmethod
+    def from_dict(cls, data):
+        # Keywords grouped in the legacy shape carry 0-100 weights
+        return cls(data['name'], [k if isinstance(k, Keyword) else Keyword.from_dict(k, fraction=False)
+                                  for k in data.get('keywords', [])])
+
+
+class Opportunity(Record):
+    """A ranked article opportunity, as stored in the ``opportunities`` table
+
+    ``final_score`` is on Convex's 0-1 scale; a legacy 0-100 ``relevance`` is
+    converted when read from a dict.
+    """
+    __slots__ = ('title', 'summary', 'source', 'url', 'published_at', 'final_score',
+                 'is_trending', 'is_dismissed', 'keywords', 'time')
+
+    def __init__(self, title, summary, source, url='', published_at=None, final_score=0,
+                 is_trending=False, is_dismissed=False, keywords=(), time=None):
+        self.title = title
+        self.summary = summary
+        self.source = source
+        self.url = url
+        self.published_at = published_at
+        self.final_score = final_score
+        self.is_trending = is_trending
+        self.is_dismissed = is_dismissed
+        self.keywords = list(keywords)
+        if time is None:
+            time = format_age(published_at) if published_at is not None else ''
+        self.time = time
+
+    @property
+    def relevance(self):
+        """Final score as a 0-100 percentage"""
+        return _percent(self.final_score, fraction=True)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            title=data['title'],
+            summary=data.get('summary', ''),
+            source=data.get('source', ''),
+            url=data.get('url', ''),
+            published_at=data.get('publishedAt'),
+            final_score=data['finalScore'] if 'finalScore' in data else (data.get('relevance') or 0) / 100,
+            is_trending=data.get('isTrending', data.get('trending', False)),
+            is_dismissed=data.get('isDismissed', False),
+            keywords=data.get('keywords', ()),
+            time=data.get('time'),
+        )
+
+
+class TrendingTopic(Record):
+    """A trending topic row in the right sidebar
+
+    ``series`` is an optional sequence (list or NumPy array) of mention counts
+    over time, plotted in the trending chart.
+    """
+    __slots__ = ('topic', 'mentions', 'change', 'series')
+
+    def __init__(self, topic, mentions, change, series=None):
+        self.topic = topic
+        self.mentions = mentions
+        self.change = change
+        self.series = series
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['topic'], int(data.get('mentions', 0)), data.get('change', '+0%'), data.get('series'))
+
+
+class Alert(Record):
+    """A breaking news alert in the right sidebar"""
+    __slots__ = ('title', 'time', 'urgency')
+
+    def __init__(self, title, time, urgency='low'):
+        self.title = title
+        self.time = time
+        self.urgency = urgency
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['title'], data.get('time', ''), data.get('urgency', 'low'))
+
+
+class DashboardData:
+    """Everything one dashboard renders; any section may be None to use sample data
+
+    ``opportunities``, ``trending`` and ``alerts`` may be lazy iterables. The
+    renderer only pulls as many records as fit on the canvas.
+    """
+    __slots__ = ('user', 'keywords', 'opportunities', 'trending', 'alerts')
+
+    def __init__(self, user=None, keywords=None, opportunities=None, trending=None, alerts=None):
+        self.user = user
+        self.keywords = keywords
+        self.opportunities = opportunities
+        self.trending = trending
+        self.alerts = alerts
+
+    @classmethod
+    def coerce(cls, value):
+        if value is None:
+            return cls()
+        if isinstance(value, cls):
+            return value
+        return cls(
+            user=value.get('user'),
+            keywords=value.get('keywords'),
+            opportunities=value.get('opportunities'),
+            trending=value.get('trending'),
+            alerts=value.get('alerts'),
+        )
+
+
+def group_keywords(items):
+    """Return KeywordCategory groups from legacy groups or flat searchQueries entries"""
+    groups = {}
+    for item in items:
+        if isinstance(item, KeywordCategory) or (isinstance(item, dict) and 'keywords' in item):
+            category = KeywordCategory.coerce(item)
+            groups.setdefault(category.name, KeywordCategory(category.name, [])).keywords.extend(category.keywords)
+            continue
+        keyword = Keyword.coerce(item)
+        name = CATEGORY_LABELS.get(keyword.category, keyword.category.title())
+        groups.setdefault(name, KeywordCategory(name, [])).keywords.append(keyword)
+    return list(groups.values())
+
+
+def iter_records(records, record_cls, limit=None, skip_dismissed=True):
+    """Lazily coerce an iterable of dicts or records, stopping after ``limit``"""
+    coerced = (record_cls.coerce(r) for r in records)
+    if skip_dismissed and record_cls is Opportunity:
+        coerced = (r for r in coerced if not r.is_dismissed)
+    return islice(coerced, limit) if limit is not None else coerced
+
+
+def iter_json(source, chunk_size=65536):
+    """Yield objects from an NDJSON file or a top-level JSON array, one at a time
+
+    ``source`` is a path or a text file object. Arrays are decoded element by
+    element from fixed-size chunks, so the whole document is never held in memory.
+    """
+    if isinstance(source, str):
+        with open(source, encoding='utf-8') as f:
+            yield from iter_json(f, chunk_size)
+        return
+
+    decoder = json.JSONDecoder()
+    buffer = source.read(chunk_size)
+    stripped = buffer.lstrip()
+    while not stripped and buffer:
+        buffer = source.read(chunk_size)
+        stripped = buffer.lstrip()
+
+    if not stripped.startswith('['):
+        # NDJSON: one document per line
+        pending = buffer
+        while True:
+            *lines, pending = pending.split('\n')
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            pending += chunk
+        if pending.strip():
+            yield json.loads(pending)
+        return
+
+    buffer = stripped[1:]
+    eof = False
+    while True:
+        buffer = buffer.lstrip().lstrip(',').lstrip()
+        if buffer.startswith(']'):
+            return
+        try:
+            value, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = source.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            continue
+        # A number at the end of the buffer may be cut short ("-0." decodes as -0); wait for more input
+        if buffer[end:end + 1] in ('', '.', 'e', 'E') and not eof and not isinstance(value, (dict, list, str)):
+            chunk = source.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            continue
+        yield value
+        buffer = buffer[end:]
+
+
+def load_opportunities(source, limit=None):
+    """Lazily read Opportunity records from a JSON/NDJSON export"""
+    return iter_records(iter_json(source), Opportunity, limit=limit)
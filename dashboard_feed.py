@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Social Writer Long Feed Renderer
+
+Renders the whole opportunity feed, not just the cards that fit the 1080px
+dashboard, as one tall image in the main content column's width. The image
+is drawn in horizontal strips and each strip is written straight into a PNG
+stream as soon as it is finished, so peak memory is about one strip plus the
+feed's records no matter how many cards there are.
+
+Every card that overlaps a strip is drawn into it, clipped at the strip's
+edges, so a card crossing a boundary, shadow included, is completed by the
+next strip and the seams are identical to drawing the whole image at once.
+
+Usage:
+    python dashboard_feed.py opportunities.ndjson --output feed.png
+    python dashboard_feed.py --synthetic 5000 --output feed.png --strip-height 1024
+"""
+
+import argparse
+import struct
+import sys
+import time
+import zlib
+
+from PIL import Image, ImageChops
+
+from dashboard_data import Opportunity, iter_json, iter_records
+from dashboard_fixtures import synthetic_spec
+from dashboard_generator import CARD_SHADOW_BLUR, CARD_SHADOW_OFFSET, OffsetDraw, DashboardGenerator
+from dashboard_sprites import shadow_reach
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# PNG "Up" row filter: each byte minus the byte above it
+PNG_FILTER_UP = b'\x02'
+
+# Feed geometry in dashboard units
+FEED_MARGIN = 20
+FEED_HEADER_HEIGHT = 60
+CARD_HEIGHT = 200
+CARD_PITCH = 220
+# Reach of the blurred card shadow beyond the card on every side
+CARD_OVERHANG = shadow_reach(CARD_SHADOW_OFFSET, CARD_SHADOW_BLUR)
+
+
+def png_chunk(kind, data):
+    """A PNG chunk: length, type, data and CRC"""
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+
+def up_filter(band, above=None):
+    """PNG scanlines of an RGB, L or P image with every row stored with the "Up" filter
+
+    ``above`` is the one-row image preceding ``band``, if any. The filter is
+    computed for the whole band at once with ``ImageChops.subtract_modulo``
+    against the band shifted down by a row; palette indexes are differenced
+    as plain bytes.
+    """
+    width, height = band.size
+    if band.mode == 'P':
+        band = Image.frombytes('L', band.size, band.tobytes())
+        if above is not None:
+            above = Image.frombytes('L', above.size, above.tobytes())
+    shifted = Image.new(band.mode, band.size)
+    if above is not None:
+        shifted.paste(above, (0, 0))
+    shifted.paste(band.crop((0, 0, width, height - 1)), (0, 1))
+    filtered = ImageChops.subtract_modulo(band, shifted).tobytes()
+    stride = len(filtered) // height
+    return b''.join(PNG_FILTER_UP + filtered[i:i + stride] for i in range(0, len(filtered), stride))
+
+
+class PngStreamWriter:
+    """Write an 8-bit RGB PNG to a binary file object one band of rows at a time
+
+    Rows are stored with the PNG "Up" filter (see ``up_filter``) and
+    compressed with one zlib stream across all bands.
+    """
+
+    def __init__(self, fileobj, width, height, level=6, chunk_size=256 * 1024):
+        self.fileobj = fileobj
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self.bytes_written = 0
+        self.chunk_size = chunk_size
+        self._compressor = zlib.compressobj(level)
+        self._pending = []
+        self._pending_size = 0
+        self._last_row = None
+        self._write(PNG_SIGNATURE)
+        self._chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+
+    def _write(self, data):
+        self.fileobj.write(data)
+        self.bytes_written += len(data)
+
+    def _chunk(self, kind, data):
+        self._write(png_chunk(kind, data))
+
+    def _compressed(self, data):
+        if data:
+            self._pending.append(data)
+            self._pending_size += len(data)
+        if self._pending_size >= self.chunk_size:
+            self._flush_idat()
+
+    def _flush_idat(self):
+        if self._pending:
+            self._chunk(b'IDAT', b''.join(self._pending))
+            self._pending, self._pending_size = [], 0
+
+    def write_rows(self, band):
+        """Append the rows of an RGB image as wide as the PNG"""
+        if band.size[0] != self.width:
+            raise ValueError(f"band is {band.size[0]}px wide, expected {self.width}")
+        if self.rows_written + band.size[1] > self.height:
+            raise ValueError("more rows than the PNG height")
+        band = band.convert('RGB')
+        width, height = band.size
+        self._compressed(self._compressor.compress(up_filter(band, self._last_row)))
+        self._last_row = band.crop((0, height - 1, width, height))
+        self.rows_written += height
+
+    def close(self):
+        """Finish the zlib stream and write the trailing chunks"""
+        if self.rows_written != self.height:
+            raise ValueError(f"wrote {self.rows_written} of {self.height} rows")
+        self._compressed(self._compressor.flush())
+        self._flush_idat()
+        self._chunk(b'IEND', b'')
+
+
+def feed_size(generator, count):
+    """(width, height) of a feed of ``count`` cards, in dashboard units"""
+    width = generator.width - 320 - 300
+    return width, FEED_HEADER_HEIGHT + count * CARD_PITCH
+
+
+def peak_rss_kib():
+    """Peak resident set size of this process so far, in KiB, or None where unknown"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB everywhere else
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def draw_feed_strip(generator, records, top, bottom, total):
+    """Render dashboard rows [top, bottom) of the feed"""
+    s = generator.scale
+    width, _ = feed_size(generator, len(records))
+    strip = Image.new('RGB', (width * s, (bottom - top) * s), generator.palette['gray_50'])
+    draw = OffsetDraw(strip, 0, top, s)
+
+    if top < FEED_HEADER_HEIGHT:
+        generator.draw_text(draw, FEED_MARGIN, 20, "Newsjacking Opportunities", generator.fonts['heading'],
+                            generator.palette['gray_800'])
+        label = f"{total:,} opportunities"
+        label_x = width - FEED_MARGIN - generator.text_width(label, generator.fonts['small'])
+        generator.draw_text(draw, label_x, 26, label, generator.fonts['small'], generator.palette['gray_500'])
+
+    # Cards reaching into the strip from either side are drawn again and clipped
+    first = max(0, (top - FEED_HEADER_HEIGHT - CARD_HEIGHT - CARD_OVERHANG) // CARD_PITCH)
+    last = min(len(records), (bottom + CARD_OVERHANG - FEED_HEADER_HEIGHT) // CARD_PITCH + 1)
+    for i in range(first, last):
+        generator.draw_opportunity_card(draw, FEED_MARGIN, FEED_HEADER_HEIGHT + i * CARD_PITCH,
+                                        width - 2 * FEED_MARGIN, records[i])
+    return strip
+
+
+def render_feed(generator, opportunities, output_path, strip_height=1024, rank=True, level=6):
+    """Render every opportunity into a tall PNG at ``output_path``, one strip at a time
+
+    ``strip_height`` is in dashboard units. With ``rank`` the cards are ordered
+    by relevance, highest first; dismissed opportunities are skipped. Returns
+    a dict with the image size, strip count, timings, file size and peak RSS.
+    """
+    start = time.perf_counter()
+    records = list(iter_records(opportunities, Opportunity))
+    if rank:
+        records.sort(key=lambda record: record.relevance, reverse=True)
+    width, height = feed_size(generator, len(records))
+    s = generator.scale
+
+    strips = 0
+    with open(output_path, 'wb') as f:
+        writer = PngStreamWriter(f, width * s, height * s, level=level)
+        for top in range(0, height, strip_height):
+            bottom = min(height, top + strip_height)
+            writer.write_rows(draw_feed_strip(generator, records, top, bottom, len(records)))
+            strips += 1
+        writer.close()
+
+    return {
+        'cards': len(records),
+        'width': width * s,
+        'height': height * s,
+        'strips': strips,
+        'strip_bytes': width * s * strip_height * s * 3,
+        'seconds': time.perf_counter() - start,
+        'bytes': writer.bytes_written,
+        'peak_rss_kib': peak_rss_kib(),
+    }
+
+
+def main(argv=None):
+    """Command line entry point for long feed rendering"""
+    parser = argparse.ArgumentParser(description="Render the full opportunity feed as one tall image")
+    parser.add_argument('source', nargs='?', help="JSON array or NDJSON file of opportunities")
+    parser.add_argument('--synthetic', type=int, metavar='COUNT', help="render COUNT synthetic opportunities instead")
+    parser.add_argument('--output', default="social-writer-feed.png")
+    parser.add_argument('--strip-height', type=int, default=1024, help="rows per strip, in layout units")
+    parser.add_argument('--no-rank', dest='rank', action='store_false', help="keep the input order")
+    parser.add_argument('--scale', type=int, default=1, help="pixels per layout unit")
+    parser.add_argument('--seed', type=int, default=42, help="seed for synthetic data")
+    parser.add_argument('--font-path', action='append', dest='font_paths',
+                        help="directory to search for fonts (repeatable)")
+    args = parser.parse_args(argv)
+
+    if args.synthetic is not None:
+        opportunities = synthetic_spec(args.synthetic, args.seed)['opportunities']
+    elif args.source:
+        opportunities = iter_json(args.source)
+    else:
+        parser.error("give a source file or --synthetic COUNT")
+
+    generator = DashboardGenerator(font_search_paths=args.font_paths, verbose=False, scale=args.scale)
+    stats = render_feed(generator, opportunities, args.output, strip_height=args.strip_height, rank=args.rank)
+    print(f"Feed written: {args.output} ({stats['cards']:,} cards, {stats['width']}x{stats['height']}, "
+          f"{stats['bytes']:,} bytes)")
+    print(f"- {stats['strips']} strips in {stats['seconds']:.2f} s")
+    if stats['peak_rss_kib'] is not None:
+        print(f"- peak RSS {stats['peak_rss_kib'] / 1024:.1f} MiB "
+              f"(one strip is {stats['strip_bytes'] / 1024 ** 2:.1f} MiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""
+Synthetic dashboard data shared by the benchmark, golden and feed tools and the tests
+
+Specs are generated from a seeded ``random.Random``, so the same ``count``
+and ``seed`` always produce the same records and therefore the same pixels.
+"""
+
+import random
+
+SOURCES = ('TechCrunch', 'Forbes', 'Wired', 'Bloomberg', 'Reuters')
+CATEGORIES = ('industry', 'values', 'products', 'competitors')
+URGENCIES = ('high', 'medium', 'low')
+
+
+def synthetic_spec(count, seed):
+    """Deterministic dashboard spec with ``count`` records in each section"""
+    rng = random.Random(seed)
+    now_ms = 1_700_000_000_000
+    return {
+        'user': {'name': 'Bench User', 'plan': 'Premium Plan'},
+        'keywords': [
+            {'term': f"Keyword {i}", 'weight': rng.uniform(0.1, 1.0),
+             'category': CATEGORIES[i % len(CATEGORIES)], 'active': rng.random() > 0.2}
+            for i in range(min(count, 12))
+        ],
+        'opportunities': [
+            {
+                'title': f"Opportunity {i}: {rng.choice(SOURCES)} reports on trend {rng.randint(1, 999)}",
+                'summary': "Synthetic summary text used to measure rendering cost...",
+                'source': rng.choice(SOURCES),
+                'time': f"{rng.randint(1, 23)} hours ago",
+                'publishedAt': now_ms - rng.randint(0, 86_400_000),
+                'finalScore': rng.random(),
+                'isTrending': rng.random() > 0.5,
+                'keywords': [f"Keyword {rng.randint(0, 11)}" for _ in range(rng.randint(1, 3))],
+            }
+            for i in range(count)
+        ],
+        'trending': [
+            {'topic': f"Topic {i}", 'mentions': rng.randint(100, 50000),
+             'change': f"{rng.choice('+-')}{rng.randint(1, 40)}%"}
+            for i in range(count)
+        ],
+        'alerts': [
+            {'title': f"Alert {i}", 'time': f"{rng.randint(1, 59)} min ago", 'urgency': rng.choice(URGENCIES)}
+            for i in range(count)
+        ],
+    }
@@ -6,15 +6,453 @@ This script generates a professional UI concept image for a newsjacking dashboar
 based on the Tavily feature documentation using Pillow (PIL).
 """
 
+import argparse
+import hashlib
+import io
+import json
+import math
 import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageColor
+from functools import lru_cache
+from PIL import Image, ImageDraw, ImageFont, ImageColor
 import os
 
+from dashboard_cache import DiskRenderCache
+from dashboard_data import (
+    Alert,
+    DashboardData,
+    Opportunity,
+    Record,
+    TrendingTopic,
+    group_keywords,
+    iter_records,
+)
+from dashboard_series import minmax_buckets, series_digest
+from dashboard_sprites import SpriteAtlas
+from dashboard_text import TextLayout
+from dashboard_trace import RenderProfiler
+
+# Dashboard sections in drawing order; later panels paint over earlier ones where they touch
+PANELS = ('header', 'sidebar_left', 'main_content', 'sidebar_right')
+
+# Font files tried in order; the first one found on the search path wins
+DEFAULT_FONT_NAMES = (
+    "Arial.ttf",
+    "arial.ttf",
+    "Helvetica.ttc",
+    "DejaVuSans.ttf",
+    "LiberationSans-Regular.ttf",
+)
+
+# Directories searched for font files, after any SOCIAL_WRITER_FONT_PATH entries
+DEFAULT_FONT_SEARCH_PATHS = (
+    "/Library/Fonts",
+    "/System/Library/Fonts",
+    "/System/Library/Fonts/Supplemental",
+    "C:\\Windows\\Fonts",
+    "/usr/share/fonts/truetype/msttcorefonts",
+    "/usr/share/fonts/truetype/dejavu",
+    "/usr/share/fonts/truetype/liberation",
+    "/usr/share/fonts/TTF",
+    os.path.expanduser("~/.fonts"),
+)
+
+
+# Sample data rendered when a section has no data of its own
+DEFAULT_USER = {'name': 'John Doe', 'plan': 'Premium Plan'}
+
+DEFAULT_KEYWORD_CATEGORIES = [
+    {
+        'name': 'Industry Terms',
+        'keywords': [
+            {'term': 'AI Technology', 'active': True, 'weight': 95},
+            {'term': 'Machine Learning', 'active': True, 'weight': 88},
+            {'term': 'Data Science', 'active': False, 'weight': 75}
+        ]
+    },
+    {
+        'name': 'Brand Values',
+        'keywords': [
+            {'term': 'Innovation', 'active': True, 'weight': 92},
+            {'term': 'Excellence', 'active': True, 'weight': 85},
+            {'term': 'Customer Focus', 'active': True, 'weight': 90}
+        ]
+    },
+    {
+        'name': 'Products',
+        'keywords': [
+            {'term': 'Analytics Platform', 'active': True, 'weight': 96},
+            {'term': 'AI Solutions', 'active': False, 'weight': 70},
+            {'term': 'Cloud Services', 'active': True, 'weight': 82}
+        ]
+    }
+]
+
+DEFAULT_OPPORTUNITIES = [
+    {
+        'title': 'OpenAI Launches GPT-5 with Revolutionary Reasoning',
+        'source': 'TechCrunch',
+        'time': '2 hours ago',
+        'relevance': 95,
+        'trending': True,
+        'keywords': ['AI Technology', 'Innovation'],
+        'summary': 'Major breakthrough in AI capabilities opens new content opportunities...'
+    },
+    {
+        'title': 'Machine Learning Transforming Healthcare Diagnostics',
+        'source': 'Forbes',
+        'time': '4 hours ago',
+        'relevance': 88,
+        'trending': True,
+        'keywords': ['Machine Learning', 'Innovation'],
+        'summary': 'AI-powered diagnostic tools achieving 95% accuracy in early detection...'
+    },
+    {
+        'title': 'Data Science Ethics: New Framework Proposed',
+        'source': 'Wired',
+        'time': '6 hours ago',
+        'relevance': 76,
+        'trending': False,
+        'keywords': ['Data Science'],
+        'summary': 'Industry leaders collaborate on comprehensive ethical guidelines...'
+    },
+    {
+        'title': 'Analytics Platform Market Reaches $50B',
+        'source': 'Bloomberg',
+        'time': '8 hours ago',
+        'relevance': 92,
+        'trending': True,
+        'keywords': ['Analytics Platform', 'Innovation'],
+        'summary': 'Explosive growth driven by AI integration and cloud adoption...'
+    }
+]
+
+DEFAULT_TRENDING = [
+    {'topic': 'AI Regulation', 'mentions': 15420, 'change': '+23%'},
+    {'topic': 'Cloud Security', 'mentions': 12350, 'change': '+15%'},
+    {'topic': 'Data Privacy', 'mentions': 9820, 'change': '+8%'},
+    {'topic': 'Tech Layoffs', 'mentions': 8450, 'change': '-5%'}
+]
+
+DEFAULT_ALERTS = [
+    {'title': 'Breaking: Major AI Company Announcement', 'time': '5 min ago', 'urgency': 'high'},
+    {'title': 'New Industry Report Released', 'time': '1 hour ago', 'urgency': 'medium'},
+    {'title': 'Market Update: Tech Stocks Surge', 'time': '2 hours ago', 'urgency': 'low'}
+]
+
+
+# Bump when a change alters rendered output, so on-disk cache entries are not reused
+RENDERER_VERSION = "5"
+
+# Drop shadow of opportunity cards, in dashboard units
+CARD_SHADOW_OFFSET = 3
+CARD_SHADOW_BLUR = 4
+
+# Widths of the thumbnail pyramid written next to the full-size image
+THUMBNAIL_WIDTHS = (960, 480, 240)
+
+# Pillow save() settings per output profile
+ENCODER_PROFILES = {
+    'png': {'format': 'PNG', 'extension': '.png', 'params': {'compress_level': 6}},
+    'png-fast': {'format': 'PNG', 'extension': '.png', 'params': {'compress_level': 1}},
+    'png-small': {'format': 'PNG', 'extension': '.png', 'params': {'compress_level': 9, 'optimize': True}},
+    'webp-lossless': {'format': 'WEBP', 'extension': '.webp', 'params': {'lossless': True, 'quality': 80, 'method': 4}},
+    'webp': {'format': 'WEBP', 'extension': '.webp', 'params': {'quality': 90, 'method': 4}},
+    'jpeg': {'format': 'JPEG', 'extension': '.jpg', 'params': {'quality': 90, 'optimize': True}},
+}
+
+
+def encoder_settings(profile):
+    """Return the ``ENCODER_PROFILES`` entry for ``profile``"""
+    try:
+        return ENCODER_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown encoder profile: {profile}") from None
+
+
+def encode_image(img, profile='png'):
+    """Encode ``img`` with an encoder profile and return (bytes, stats)
+
+    ``stats`` holds the profile name, output format, encode seconds and byte size.
+    """
+    settings = encoder_settings(profile)
+    if settings['format'] == 'JPEG' and img.mode not in ('RGB', 'L'):
+        img = img.convert('RGB')
+    buffer = io.BytesIO()
+    start = time.perf_counter()
+    img.save(buffer, settings['format'], **settings['params'])
+    elapsed = time.perf_counter() - start
+    data = buffer.getvalue()
+    return data, {'profile': profile, 'format': settings['format'], 'seconds': elapsed, 'bytes': len(data)}
+
+
+def compare_encoders(img, profiles=None):
+    """Encode ``img`` with each profile and return the stats, fastest first"""
+    stats = [encode_image(img, profile)[1] for profile in (profiles or ENCODER_PROFILES)]
+    return sorted(stats, key=lambda s: s['seconds'])
+
+
+def fit_count(start, step, extent, limit):
+    """Number of rows at ``start + i * step`` whose bottom edge stays above ``limit``"""
+    available = limit - extent - start - 1
+    return available // step + 1 if available >= 0 else 0
+
+
+def _json_default(value):
+    if isinstance(value, Record):
+        fields = value.to_dict()
+        if fields.get('series') is not None:
+            # Mention series may hold millions of samples; hash them as packed doubles
+            fields['series'] = {'series_digest': series_digest(fields['series'])}
+        return fields
+    if getattr(value, 'ndim', 0) and not value.dtype.hasobject:
+        # Other NumPy arrays, hashed from their buffer
+        return {'ndarray': [value.dtype.str, list(value.shape), hashlib.sha1(value.tobytes()).hexdigest()]}
+    if hasattr(value, 'tolist'):
+        # NumPy scalars
+        return value.tolist()
+    raise TypeError(f"Cannot hash {type(value).__name__}")
+
+
+def content_hash(*parts):
+    """Stable hex digest of JSON-serializable parts (records included)"""
+    payload = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=_json_default)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+@lru_cache(maxsize=8)
+def gradient_background(width, height, top_color, bottom_color):
+    """Vertical gradient from ``top_color`` to ``bottom_color``, built once per size and palette
+
+    Callers get the shared cached image and must copy it before drawing.
+    """
+    # 256-step ramp, flipped so the top color is fully opaque, stretched to the canvas
+    mask = Image.linear_gradient('L').transpose(Image.Transpose.FLIP_TOP_BOTTOM)
+    mask = mask.resize((1, height), Image.Resampling.BILINEAR).resize((width, height), Image.Resampling.NEAREST)
+    top = Image.new('RGB', (width, height), top_color)
+    bottom = Image.new('RGB', (width, height), bottom_color)
+    return Image.composite(top, bottom, mask)
+
+
+def resolve_palette(colors):
+    """Parse a name -> color string mapping into name -> RGB tuples"""
+    return {name: ImageColor.getrgb(value)[:3] for name, value in colors.items()}
+
+
+def indexed_palette(colors, gradient_steps=8):
+    """Fixed palette image for indexed output: the UI colors plus a background ramp
+
+    ``colors`` is a resolved palette; the ramp runs from gray_100 to gray_50 so
+    the background gradient survives as bands.
+    """
+    entries = list(dict.fromkeys(colors.values()))
+    top, bottom = colors['gray_100'], colors['gray_50']
+    for step in range(1, gradient_steps):
+        t = step / gradient_steps
+        entries.append(tuple(round(a + (b - a) * t) for a, b in zip(top, bottom)))
+    entries = list(dict.fromkeys(entries))
+    # Pad by repeating the last color so unused slots never win a nearest-color match
+    entries += [entries[-1]] * (256 - len(entries))
+    image = Image.new('P', (1, 1))
+    image.putpalette([channel for entry in entries for channel in entry])
+    return image
+
+
+@lru_cache(maxsize=8)
+def indexed_background(width, height, top_color, bottom_color, palette_colors):
+    """``gradient_background`` mapped onto a fixed palette, built once per size and palette"""
+    palette = indexed_palette(dict(palette_colors))
+    return gradient_background(width, height, top_color, bottom_color).quantize(
+        palette=palette, dither=Image.Dither.NONE)
+
+
+class OffsetDraw:
+    """ImageDraw wrapper mapping absolute dashboard coordinates onto a layer
+
+    Coordinates are shifted by ``(dx, dy)`` and multiplied by ``scale``. Boxes
+    keep ImageDraw's inclusive-edge meaning, points map pixel center to pixel
+    center, and stroke widths and corner radii scale with them, so a HiDPI
+    render has the same geometry at higher resolution. ``image`` is the layer
+    drawn on, for pasting sprites.
+    """
+
+    def __init__(self, image, dx=0, dy=0, scale=1):
+        self.image = image
+        self._draw = ImageDraw.Draw(image)
+        self.dx = dx
+        self.dy = dy
+        self.scale = scale
+
+    def point(self, x, y):
+        """Layer pixel position of a dashboard coordinate"""
+        return (x - self.dx) * self.scale, (y - self.dy) * self.scale
+
+    def _shift(self, xy):
+        if isinstance(xy[0], (tuple, list)):
+            return [(px - self.dx, py - self.dy) for px, py in xy]
+        return [v - (self.dx if i % 2 == 0 else self.dy) for i, v in enumerate(xy)]
+
+    def _box(self, xy):
+        x0, y0, x1, y1 = self._shift(xy)
+        s = self.scale
+        if s == 1:
+            return [x0, y0, x1, y1]
+        return [x0 * s, y0 * s, (x1 + 1) * s - 1, (y1 + 1) * s - 1]
+
+    def _points(self, xy):
+        s = self.scale
+        if not isinstance(xy[0], (tuple, list)):
+            xy = list(zip(xy[0::2], xy[1::2]))
+        points = self._shift(xy)
+        if s == 1:
+            return points
+        return [((px + 0.5) * s - 0.5, (py + 0.5) * s - 0.5) for px, py in points]
+
+    def _scaled(self, kwargs, *names):
+        if self.scale != 1:
+            for name in names:
+                if name in kwargs:
+                    kwargs[name] = kwargs[name] * self.scale
+        return kwargs
+
+    def rectangle(self, xy, **kwargs):
+        return self._draw.rectangle(self._box(xy), **self._scaled(kwargs, 'width'))
+
+    def rounded_rectangle(self, xy, **kwargs):
+        return self._draw.rounded_rectangle(self._box(xy), **self._scaled(kwargs, 'radius', 'width'))
+
+    def ellipse(self, xy, **kwargs):
+        return self._draw.ellipse(self._box(xy), **self._scaled(kwargs, 'width'))
+
+    def line(self, xy, **kwargs):
+        return self._draw.line(self._points(xy), **self._scaled(kwargs, 'width'))
+
+    def polygon(self, xy, **kwargs):
+        return self._draw.polygon(self._points(xy), **self._scaled(kwargs, 'width'))
+
+    def text(self, xy, *args, **kwargs):
+        return self._draw.text(self.point(*xy), *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._draw, name)
+
+
+def paste_sprite(draw, sprite, x, y):
+    """Stamp a ``SpriteAtlas`` sprite at dashboard coordinates onto the layer of an ``OffsetDraw``"""
+    image, mask, (dx, dy) = sprite
+    x, y = draw.point(x, y)
+    draw.image.paste(image, (int(round(x + dx)), int(round(y + dy))), mask)
+
+
+class FontRegistry:
+    """Resolve fonts once and cache font objects and text measurements"""
+
+    def __init__(self, font_names=None, search_paths=None, maxsize=32, metrics_maxsize=4096):
+        self.font_names = tuple(font_names or DEFAULT_FONT_NAMES)
+        if search_paths is None:
+            env_paths = os.environ.get("SOCIAL_WRITER_FONT_PATH", "")
+            search_paths = [p for p in env_paths.split(os.pathsep) if p] + list(DEFAULT_FONT_SEARCH_PATHS)
+        self.search_paths = tuple(search_paths)
+        self.maxsize = maxsize
+        self.metrics_maxsize = metrics_maxsize
+        self._fonts = OrderedDict()
+        self._metrics = OrderedDict()
+        # Panels may be drawn from several threads at once
+        self._lock = threading.RLock()
+        self._font_path = None
+        self._resolved = False
+        # Bumped by clear() so caches built on these fonts (see TextLayout) know to reset
+        self.generation = 0
+
+    @property
+    def font_path(self):
+        """Path of the TrueType font in use, or None when falling back to Pillow's default"""
+        if not self._resolved:
+            self._font_path = self._find_font()
+            self._resolved = True
+        return self._font_path
+
+    def _find_font(self):
+        for name in self.font_names:
+            if os.path.isabs(name) and os.path.isfile(name):
+                return name
+            for directory in self.search_paths:
+                candidate = os.path.join(directory, name)
+                if os.path.isfile(candidate):
+                    return candidate
+        return None
+
+    def get(self, size):
+        """Return the font for a pixel size, loading it at most once while cached"""
+        with self._lock:
+            font = self._fonts.get(size)
+            if font is not None:
+                self._fonts.move_to_end(size)
+                return font
+
+            font = self._load(size)
+            self._fonts[size] = font
+            if len(self._fonts) > self.maxsize:
+                self._fonts.popitem(last=False)
+            return font
+
+    def _load(self, size):
+        path = self.font_path
+        if path is not None:
+            try:
+                return ImageFont.truetype(path, size)
+            except OSError:
+                pass
+        try:
+            return ImageFont.load_default(size)
+        except TypeError:
+            # Pillow < 10.1 only ships the fixed-size bitmap font
+            return ImageFont.load_default()
+
+    def text_bbox(self, text, size):
+        """Return the (left, top, right, bottom) box of text drawn at the origin"""
+        key = (text, size)
+        with self._lock:
+            bbox = self._metrics.get(key)
+            if bbox is not None:
+                self._metrics.move_to_end(key)
+                return bbox
+
+            bbox = tuple(self.get(size).getbbox(text))
+            self._metrics[key] = bbox
+            if len(self._metrics) > self.metrics_maxsize:
+                self._metrics.popitem(last=False)
+            return bbox
+
+    def text_size(self, text, size):
+        """Return the (width, height) of text at the given size"""
+        left, top, right, bottom = self.text_bbox(text, size)
+        return right - left, bottom - top
+
+    def text_width(self, text, size):
+        """Return the width of text at the given size"""
+        return self.text_size(text, size)[0]
+
+    def clear(self):
+        """Drop cached fonts and measurements, e.g. after changing the search paths"""
+        with self._lock:
+            self._fonts.clear()
+            self._metrics.clear()
+            self._resolved = False
+            self.generation += 1
+
+
 class DashboardGenerator:
-    def __init__(self):
+    def __init__(self, font_search_paths=None, font_names=None, verbose=True, workers=1, seed=None,
+                 cache_dir=None, cache_max_bytes=512 * 1024 * 1024, indexed=False, scale=1):
+        # Layout size in dashboard units; the image is scale times larger
         self.width = 1920
         self.height = 1080
+        self.scale = scale
         self.colors = {
             'primary': '#2563eb',      # blue-600
             'primary_light': '#3b82f6', # blue-500
@@ -48,105 +486,144 @@ class DashboardGenerator:
             'tiny': 11
         }
 
+        # indexed=True renders straight onto a fixed-palette "P" image: smaller
+        # files and faster PNG encoding, at the cost of aliased text and edges
+        self.indexed = indexed
+        self.set_colors()
+
+        self.font_registry = FontRegistry(font_names=font_names, search_paths=font_search_paths)
+        self.text_layout = TextLayout(self.font_registry)
+        self.verbose = verbose
+        # Seed for the sample chart so renders are repeatable; None keeps it random
+        self.seed = seed
+        # Stats from the most recent generate_dashboard encode
+        self.last_encode = None
+        # Set by enable_profiling()
+        self.profiler = None
+
+        # Optional content-addressed cache of encoded dashboards
+        self.render_cache = DiskRenderCache(cache_dir, cache_max_bytes) if cache_dir else None
+
+        # workers > 1 draws the panels concurrently on a thread pool
+        self.workers = workers
+        self._executor = None
+
+        # Incremental rendering state used by update()
+        self.layer_cache_size = 16
+        self._layers = OrderedDict()
+        self._sections = {}
+        self._frame = None
+        self._frame_keys = {}
+        # (chrome_key(), image) from the most recent render_chrome()
+        self._chrome = None
+
+    def set_colors(self, **colors):
+        """Update ``self.colors`` and re-resolve the RGB palette used for drawing"""
+        self.colors.update(colors)
+        self.palette = resolve_palette(self.colors)
+        self.palette_image = indexed_palette(self.palette) if self.indexed else None
+        self.sprites = SpriteAtlas(indexed_palette=self.palette_image, scale=self.scale)
+
     def create_base_image(self):
         """Create the base dashboard image with gradient background"""
-        # Create gradient background
-        img = Image.new('RGB', (self.width, self.height), self.colors['gray_50'])
-        draw = ImageDraw.Draw(img)
-
-        # Add subtle gradient overlay
-        for i in range(50):
-            alpha = int(255 * (1 - i/50))
-            color = (*ImageColor.getrgb(self.colors['gray_100']), alpha)
-            gradient_y = i * 20
-            draw.rectangle([0, gradient_y, self.width, gradient_y + 20], fill=color)
-
-        return img, draw
-
-    def draw_header(self, img, draw):
+        # Subtle gray_100 to gray_50 fade, copied from the cached background
+        img = self._background().copy()
+        return img, OffsetDraw(img, scale=self.scale)
+
+    @property
+    def pixel_size(self):
+        """Size of the rendered image in pixels"""
+        return self.width * self.scale, self.height * self.scale
+
+    def _background(self):
+        width, height = self.pixel_size
+        if self.indexed:
+            return indexed_background(width, height, self.palette['gray_100'], self.palette['gray_50'],
+                                      tuple(self.palette.items()))
+        return gradient_background(width, height, self.palette['gray_100'], self.palette['gray_50'])
+
+    def draw_header(self, img, draw, user=None):
         """Draw the dashboard header"""
+        self.draw_header_chrome(img, draw)
+        self.draw_user_profile(draw, user)
+
+    def draw_header_chrome(self, img, draw):
+        """Draw the parts of the header that are the same for every user"""
         # Header background
-        draw.rectangle([0, 0, self.width, 80], fill=self.colors['white'])
-        draw.line([0, 80, self.width, 80], fill=self.colors['gray_200'], width=1)
+        draw.rectangle([0, 0, self.width, 80], fill=self.palette['white'])
+        draw.line([0, 80, self.width, 80], fill=self.palette['gray_200'], width=1)
 
         # Logo and title
         logo_x, logo_y = 30, 20
-        self.draw_pen_tool_icon(draw, logo_x, logo_y, self.colors['primary'])
+        self.draw_pen_tool_icon(draw, logo_x, logo_y, self.palette['primary'])
 
         # App title
         title_x = logo_x + 35
-        self.draw_text(draw, title_x, 15, "Social Writer", self.fonts['title'], self.colors['gray_800'])
-        self.draw_text(draw, title_x, 45, "AI-Powered Newsjacking Dashboard", self.fonts['body'], self.colors['gray_600'])
+        self.draw_text(draw, title_x, 15, "Social Writer", self.fonts['title'], self.palette['gray_800'])
+        self.draw_text(draw, title_x, 45, "AI-Powered Newsjacking Dashboard", self.fonts['body'], self.palette['gray_600'])
+
+        # Notification bell, left of the user profile
+        bell_x = self.width - 200 - 40
+        self.draw_icon(draw, bell_x, 25, 'bell', self.palette['gray_500'])
+        # Notification dot
+        self.draw_circle(draw, bell_x + 12, 18, 4, self.palette['danger'])
 
-        # User profile area
+    def draw_user_profile(self, draw, user=None):
+        """Draw the user's avatar initials, name and plan in the header"""
+        user = user or DEFAULT_USER
         profile_x = self.width - 200
         profile_y = 20
 
         # User avatar
-        self.draw_circle(draw, profile_x, profile_y, 20, self.colors['primary_light'])
-        self.draw_text(draw, profile_x, profile_y - 5, "JD", self.fonts['small'], self.colors['white'])
+        self.draw_circle(draw, profile_x, profile_y, 20, self.palette['primary_light'])
+        initials = ''.join(part[0] for part in user['name'].split()[:2]).upper()
+        self.draw_text(draw, profile_x, profile_y - 5, initials, self.fonts['small'], self.palette['white'])
 
         # User name
-        self.draw_text(draw, profile_x + 30, 20, "John Doe", self.fonts['body'], self.colors['gray_800'])
-        self.draw_text(draw, profile_x + 30, 40, "Premium Plan", self.fonts['small'], self.colors['success'])
-
-        # Notification bell
-        bell_x = profile_x - 40
-        self.draw_icon(draw, bell_x, profile_y + 5, 'bell', self.colors['gray_500'])
-        # Notification dot
-        self.draw_circle(draw, bell_x + 12, profile_y - 2, 4, self.colors['danger'])
+        self.draw_text(draw, profile_x + 30, 20, user['name'], self.fonts['body'], self.palette['gray_800'])
+        self.draw_text(draw, profile_x + 30, 40, user.get('plan', ''), self.fonts['small'], self.palette['success'])
 
-    def draw_sidebar_left(self, img, draw):
+    def draw_sidebar_left(self, img, draw, categories=None):
         """Draw the left sidebar with keyword management"""
+        self.draw_sidebar_left_chrome(img, draw)
+        self.draw_keyword_categories(draw, categories)
+
+    def draw_sidebar_left_chrome(self, img, draw):
+        """Draw the left sidebar frame, heading and button"""
         sidebar_width = 320
-        draw.rectangle([0, 80, sidebar_width, self.height], fill=self.colors['sidebar_bg'])
-        draw.line([sidebar_width, 80, sidebar_width, self.height], fill=self.colors['gray_200'], width=1)
+        draw.rectangle([0, 80, sidebar_width, self.height], fill=self.palette['sidebar_bg'])
+        draw.line([sidebar_width, 80, sidebar_width, self.height], fill=self.palette['gray_200'], width=1)
 
         # Sidebar header
         header_x = 20
-        self.draw_text(draw, header_x, 100, "Brand Keywords", self.fonts['heading'], self.colors['gray_800'])
-        self.draw_text(draw, header_x, 125, "Active keywords searched every 6 hours", self.fonts['small'], self.colors['gray_500'])
+        self.draw_text(draw, header_x, 100, "Brand Keywords", self.fonts['heading'], self.palette['gray_800'])
+        self.draw_text(draw, header_x, 125, "Active keywords searched every 6 hours", self.fonts['small'], self.palette['gray_500'])
 
         # Add keyword button
         button_y = 155
-        self.draw_button(draw, header_x, button_y, 280, 35, "Add Brand Guide", self.colors['primary'], self.colors['white'])
+        self.draw_button(draw, header_x, button_y, 280, 35, "Add Brand Guide", self.palette['primary'], self.palette['white'])
+
+    def draw_keyword_categories(self, draw, categories=None):
+        """Draw the keyword categories and their keyword cards below the sidebar heading"""
+        if categories is None:
+            categories = DEFAULT_KEYWORD_CATEGORIES
+        categories = group_keywords(categories)
+        header_x = 20
 
         # Keyword categories
         y_pos = 210
-        categories = [
-            {
-                'name': 'Industry Terms',
-                'keywords': [
-                    {'term': 'AI Technology', 'active': True, 'weight': 95},
-                    {'term': 'Machine Learning', 'active': True, 'weight': 88},
-                    {'term': 'Data Science', 'active': False, 'weight': 75}
-                ]
-            },
-            {
-                'name': 'Brand Values',
-                'keywords': [
-                    {'term': 'Innovation', 'active': True, 'weight': 92},
-                    {'term': 'Excellence', 'active': True, 'weight': 85},
-                    {'term': 'Customer Focus', 'active': True, 'weight': 90}
-                ]
-            },
-            {
-                'name': 'Products',
-                'keywords': [
-                    {'term': 'Analytics Platform', 'active': True, 'weight': 96},
-                    {'term': 'AI Solutions', 'active': False, 'weight': 70},
-                    {'term': 'Cloud Services', 'active': True, 'weight': 82}
-                ]
-            }
-        ]
-
         for category in categories:
+            if y_pos + 25 + 50 > self.height:
+                break
+
             # Category header
-            self.draw_text(draw, header_x, y_pos, category['name'], self.fonts['subheading'], self.colors['gray_700'])
+            self.draw_text(draw, header_x, y_pos, category.name, self.fonts['subheading'], self.palette['gray_700'])
             y_pos += 25
 
             # Keywords
-            for keyword in category['keywords']:
+            for keyword in category.keywords:
+                if y_pos + 50 > self.height:
+                    break
                 self.draw_keyword_card(draw, header_x, y_pos, keyword)
                 y_pos += 60
 
@@ -159,32 +636,29 @@ class DashboardGenerator:
 
         # Card background
         draw.rectangle([x, y, x + card_width, y + card_height],
-                      fill=self.colors['white'],
-                      outline=self.colors['gray_200'],
+                      fill=self.palette['white'],
+                      outline=self.palette['gray_200'],
                       width=1)
 
         # Toggle switch
         toggle_x = x + 15
         toggle_y = y + 15
         toggle_size = 20
-        toggle_color = self.colors['success'] if keyword['active'] else self.colors['gray_300']
-
-        # Toggle background
-        draw.rounded_rectangle([toggle_x, toggle_y, toggle_x + toggle_size * 2, toggle_y + toggle_size],
-                              radius=10, fill=toggle_color)
+        toggle_color = self.palette['success'] if keyword.active else self.palette['gray_300']
 
-        # Toggle circle
-        circle_x = toggle_x + (toggle_size * 1.5) if keyword['active'] else toggle_x + 5
-        self.draw_circle(draw, circle_x, toggle_y + toggle_size // 2, 8, self.colors['white'])
+        # Toggle background and circle, stamped from the sprite cache
+        toggle = self.sprites.toggle(keyword.active, toggle_size, toggle_color, self.palette['white'])
+        paste_sprite(draw, toggle, toggle_x, toggle_y)
 
-        # Keyword text
+        # Keyword text, kept clear of the weight bar
         text_x = toggle_x + 50
-        self.draw_text(draw, text_x, y + 8, keyword['term'], self.fonts['body'],
-                      self.colors['gray_800'] if keyword['active'] else self.colors['gray_400'])
+        term = self.truncate_text(keyword.term, self.fonts['body'], 180 - 50 - 15 - 10)
+        self.draw_text(draw, text_x, y + 8, term, self.fonts['body'],
+                      self.palette['gray_800'] if keyword.active else self.palette['gray_400'])
 
         # Weight indicator
         weight_x = text_x
-        self.draw_text(draw, weight_x, y + 28, f"Weight: {keyword['weight']}%", self.fonts['small'], self.colors['gray_500'])
+        self.draw_text(draw, weight_x, y + 28, f"Weight: {keyword.weight}%", self.fonts['small'], self.palette['gray_500'])
 
         # Weight bar
         bar_x = x + 180
@@ -193,90 +667,66 @@ class DashboardGenerator:
         bar_height = 8
 
         # Background bar
-        draw.rounded_rectangle([bar_x, bar_y, bar_x + bar_width, bar_y + bar_height],
-                              radius=4, fill=self.colors['gray_200'])
+        paste_sprite(draw, self.sprites.chip(bar_width, bar_height, 4, self.palette['gray_200']), bar_x, bar_y)
 
         # Filled bar
-        filled_width = int(bar_width * keyword['weight'] / 100)
+        filled_width = int(bar_width * keyword.weight / 100)
         if filled_width > 0:
-            bar_color = self.colors['success'] if keyword['weight'] >= 80 else self.colors['warning'] if keyword['weight'] >= 60 else self.colors['danger']
-            draw.rounded_rectangle([bar_x, bar_y, bar_x + filled_width, bar_y + bar_height],
-                                  radius=4, fill=bar_color)
+            bar_color = self.palette['success'] if keyword.weight >= 80 else self.palette['warning'] if keyword.weight >= 60 else self.palette['danger']
+            paste_sprite(draw, self.sprites.chip(filled_width, bar_height, 4, bar_color), bar_x, bar_y)
 
-    def draw_main_content(self, img, draw):
+    def draw_main_content(self, img, draw, opportunities=None):
         """Draw the main dashboard content with opportunities"""
+        self.draw_main_content_chrome(img, draw)
+        self.draw_opportunities(draw, opportunities)
+
+    def content_columns(self):
+        """Left edge and width of the main content column"""
         left_sidebar_width = 320
         right_sidebar_width = 300
-        content_start_x = left_sidebar_width + 20
-        content_width = self.width - left_sidebar_width - right_sidebar_width - 40
+        return left_sidebar_width + 20, self.width - left_sidebar_width - right_sidebar_width - 40
+
+    def draw_main_content_chrome(self, img, draw):
+        """Draw the main content heading and filter bar"""
+        content_start_x, content_width = self.content_columns()
 
         # Content header
-        self.draw_text(draw, content_start_x, 100, "Newsjacking Opportunities", self.fonts['heading'], self.colors['gray_800'])
+        self.draw_text(draw, content_start_x, 100, "Newsjacking Opportunities", self.fonts['heading'], self.palette['gray_800'])
 
         # Filter and sort options
         filter_y = 135
         self.draw_filter_bar(draw, content_start_x, filter_y, content_width)
 
-        # Opportunities grid
-        opportunities_y = 180
-        opportunities = [
-            {
-                'title': 'OpenAI Launches GPT-5 with Revolutionary Reasoning',
-                'source': 'TechCrunch',
-                'time': '2 hours ago',
-                'relevance': 95,
-                'trending': True,
-                'keywords': ['AI Technology', 'Innovation'],
-                'summary': 'Major breakthrough in AI capabilities opens new content opportunities...'
-            },
-            {
-                'title': 'Machine Learning Transforming Healthcare Diagnostics',
-                'source': 'Forbes',
-                'time': '4 hours ago',
-                'relevance': 88,
-                'trending': True,
-                'keywords': ['Machine Learning', 'Innovation'],
-                'summary': 'AI-powered diagnostic tools achieving 95% accuracy in early detection...'
-            },
-            {
-                'title': 'Data Science Ethics: New Framework Proposed',
-                'source': 'Wired',
-                'time': '6 hours ago',
-                'relevance': 76,
-                'trending': False,
-                'keywords': ['Data Science'],
-                'summary': 'Industry leaders collaborate on comprehensive ethical guidelines...'
-            },
-            {
-                'title': 'Analytics Platform Market Reaches $50B',
-                'source': 'Bloomberg',
-                'time': '8 hours ago',
-                'relevance': 92,
-                'trending': True,
-                'keywords': ['Analytics Platform', 'Innovation'],
-                'summary': 'Explosive growth driven by AI integration and cloud adoption...'
-            }
-        ]
+    def draw_opportunities(self, draw, opportunities=None):
+        """Draw the opportunity cards below the filter bar"""
+        if opportunities is None:
+            opportunities = DEFAULT_OPPORTUNITIES
+        content_start_x, content_width = self.content_columns()
 
+        # Opportunities grid; only the cards that fit are pulled from the input
+        opportunities_y = 180
         card_spacing = 20
-        for i, opportunity in enumerate(opportunities):
+        for i, opportunity in enumerate(self.visible_opportunities(opportunities)):
             card_y = opportunities_y + i * (200 + card_spacing)
-            if card_y + 200 < self.height - 100:  # Only draw cards that fit
-                self.draw_opportunity_card(draw, content_start_x, card_y, content_width, opportunity)
+            self.draw_opportunity_card(draw, content_start_x, card_y, content_width, opportunity)
+
+    def visible_opportunities(self, opportunities):
+        """Lazily take the opportunities whose cards fit in the main content area"""
+        return iter_records(opportunities, Opportunity, limit=fit_count(180, 220, 200, self.height - 100))
 
     def draw_filter_bar(self, draw, x, y, width):
         """Draw filter and sort bar"""
         # Search bar
         search_width = 300
         search_height = 35
-        draw.rounded_rectangle([x, y, x + search_width, y + search_height],
-                              radius=18, fill=self.colors['white'], outline=self.colors['gray_300'])
+        search_box = self.sprites.chip(search_width, search_height, 18, self.palette['white'], self.palette['gray_300'])
+        paste_sprite(draw, search_box, x, y)
 
         # Search icon
-        self.draw_icon(draw, x + 12, y + 8, 'search', self.colors['gray_400'])
+        self.draw_icon(draw, x + 12, y + 8, 'search', self.palette['gray_400'])
 
         # Search text
-        self.draw_text(draw, x + 35, y + 8, "Search opportunities...", self.fonts['body'], self.colors['gray_400'])
+        self.draw_text(draw, x + 35, y + 8, "Search opportunities...", self.fonts['body'], self.palette['gray_400'])
 
         # Filter buttons
         filter_x = x + search_width + 15
@@ -284,159 +734,221 @@ class DashboardGenerator:
         for i, filter_text in enumerate(filters):
             button_x = filter_x + i * 110
             is_active = i == 0
-            button_color = self.colors['primary'] if is_active else self.colors['white']
-            text_color = self.colors['white'] if is_active else self.colors['gray_600']
+            button_color = self.palette['primary'] if is_active else self.palette['white']
+            text_color = self.palette['white'] if is_active else self.palette['gray_600']
 
             self.draw_button(draw, button_x, y, 100, search_height, filter_text,
-                           button_color, text_color, border_color=self.colors['gray_300'])
+                           button_color, text_color, border_color=self.palette['gray_300'])
 
     def draw_opportunity_card(self, draw, x, y, width, opportunity):
         """Draw a news opportunity card"""
         card_height = 200
-
-        # Card shadow effect
-        shadow_offset = 3
-        shadow_color = (*ImageColor.getrgb(self.colors['gray_300']), 50)
-        draw.rounded_rectangle([x + shadow_offset, y + shadow_offset, x + width + shadow_offset, y + card_height + shadow_offset],
-                              radius=12, fill=shadow_color)
-
-        # Main card
-        draw.rounded_rectangle([x, y, x + width, y + card_height],
-                              radius=12, fill=self.colors['white'], outline=self.colors['gray_200'])
-
-        # Header section
         header_height = 60
-        draw.rounded_rectangle([x, y, x + width, y + header_height],
-                              radius=12, fill=self.colors['gray_50'])
 
-        # Source and time
-        self.draw_text(draw, x + 20, y + 15, opportunity['source'], self.fonts['body'], self.colors['gray_600'])
-        self.draw_text(draw, x + 20, y + 35, opportunity['time'], self.fonts['small'], self.colors['gray_500'])
-
-        # Trending indicator
-        if opportunity['trending']:
-            trending_x = x + width - 80
-            self.draw_icon(draw, trending_x, y + 20, 'trending-up', self.colors['success'])
-            self.draw_text(draw, trending_x + 20, y + 20, "Trending", self.fonts['small'], self.colors['success'])
+        # Card with its header section and a soft drop shadow, composited over the card's box only
+        if self.indexed:
+            shadow = (self.palette['gray_300'], 1.0, CARD_SHADOW_OFFSET, 0)
+        else:
+            shadow = (self.palette['gray_900'], 0.12, CARD_SHADOW_OFFSET, CARD_SHADOW_BLUR)
+        card = self.sprites.card(width, card_height, 12, self.palette['white'], self.palette['gray_200'],
+                                 header_height, self.palette['gray_50'], shadow)
+        paste_sprite(draw, card, x, y)
 
-        # Title
+        # Source and time
+        self.draw_text(draw, x + 20, y + 15, opportunity.source, self.fonts['body'], self.palette['gray_600'])
+        self.draw_text(draw, x + 20, y + 35, opportunity.time, self.fonts['small'], self.palette['gray_500'])
+
+        # Trending indicator on a translucent badge
+        if opportunity.is_trending:
+            badge_width = 20 + math.ceil(self.text_width("Trending", self.fonts['small'])) + 14
+            badge_x = x + width - 12 - badge_width
+            badge = self.sprites.chip(badge_width, 24, 12, self.palette['success'] + (28,))
+            paste_sprite(draw, badge, badge_x, y + 16)
+            trending_x = badge_x + 7
+            self.draw_icon(draw, trending_x, y + 20, 'trending-up', self.palette['success'])
+            self.draw_text(draw, trending_x + 20, y + 20, "Trending", self.fonts['small'], self.palette['success'])
+
+        # Title, on one line
+        text_width = width - 40
         title_y = y + 75
-        self.draw_text(draw, x + 20, title_y, opportunity['title'], self.fonts['subheading'], self.colors['gray_800'])
+        title = self.truncate_text(opportunity.title, self.fonts['subheading'], text_width)
+        self.draw_text(draw, x + 20, title_y, title, self.fonts['subheading'], self.palette['gray_800'])
 
-        # Summary
+        # Summary, wrapped onto at most two lines
         summary_y = title_y + 25
-        self.draw_text(draw, x + 20, summary_y, opportunity['summary'], self.fonts['body'], self.colors['gray_600'])
+        summary_lines = self.wrap_text(opportunity.summary, self.fonts['body'], text_width, max_lines=2)
+        for i, line in enumerate(summary_lines):
+            self.draw_text(draw, x + 20, summary_y + i * 17, line, self.fonts['body'], self.palette['gray_600'])
 
-        # Keywords
+        # Keywords, as many chips as fit on the row
         keywords_y = summary_y + 35
-        keyword_x = x + 20
-        for i, keyword in enumerate(opportunity['keywords']):
-            tag_x = keyword_x + i * 120
-            self.draw_tag(draw, tag_x, keywords_y, keyword, self.colors['primary_light'])
+        tag_x = x + 20
+        for keyword in opportunity.keywords:
+            tag_width = self.tag_width(keyword)
+            if tag_x + tag_width > x + 20 + text_width:
+                break
+            self.draw_tag(draw, tag_x, keywords_y, keyword, self.palette['primary_light'])
+            tag_x += tag_width + 8
 
         # Relevance score
         score_y = y + card_height - 50
         score_x = x + 20
-        self.draw_text(draw, score_x, score_y, "Relevance Score", self.fonts['small'], self.colors['gray_500'])
+        self.draw_text(draw, score_x, score_y, "Relevance Score", self.fonts['small'], self.palette['gray_500'])
 
         # Progress bar
         bar_y = score_y + 20
         bar_width = width - 200
-        self.draw_progress_bar(draw, score_x, bar_y, bar_width, opportunity['relevance'])
+        self.draw_progress_bar(draw, score_x, bar_y, bar_width, opportunity.relevance)
 
         # Generate button
         button_x = x + width - 160
         button_y = y + card_height - 45
-        self.draw_button(draw, button_x, button_y, 140, 35, "Generate Article", self.colors['primary'], self.colors['white'])
+        self.draw_button(draw, button_x, button_y, 140, 35, "Generate Article", self.palette['primary'], self.palette['white'])
 
-    def draw_sidebar_right(self, img, draw):
+    def draw_sidebar_right(self, img, draw, trending_items=None, alert_items=None):
         """Draw the right sidebar with trending topics and alerts"""
-        sidebar_width = 300
-        sidebar_x = self.width - sidebar_width
+        self.draw_sidebar_right_chrome(img, draw)
+        self.draw_trends_and_alerts(draw, trending_items, alert_items)
 
-        draw.rectangle([sidebar_x, 80, self.width, self.height], fill=self.colors['sidebar_bg'])
-        draw.line([sidebar_x, 80, sidebar_x, self.height], fill=self.colors['gray_200'], width=1)
-
-        sidebar_content_x = sidebar_x + 20
+    def draw_sidebar_right_chrome(self, img, draw):
+        """Draw the right sidebar frame and its "Trending Topics" heading"""
+        sidebar_x = self.width - 300
+        draw.rectangle([sidebar_x, 80, self.width, self.height], fill=self.palette['sidebar_bg'])
+        draw.line([sidebar_x, 80, sidebar_x, self.height], fill=self.palette['gray_200'], width=1)
 
         # Trending topics section
-        self.draw_text(draw, sidebar_content_x, 100, "Trending Topics", self.fonts['heading'], self.colors['gray_800'])
+        self.draw_text(draw, sidebar_x + 20, 100, "Trending Topics", self.fonts['heading'], self.palette['gray_800'])
+
+    def draw_trends_and_alerts(self, draw, trending_items=None, alert_items=None):
+        """Draw the trending chart and topics, then the alerts that fit below them"""
+        if trending_items is None:
+            trending_items = DEFAULT_TRENDING
+        if alert_items is None:
+            alert_items = DEFAULT_ALERTS
+        sidebar_width = 300
+        sidebar_content_x = self.width - sidebar_width + 20
 
         # Trending chart area
         chart_y = 135
         chart_height = 120
-        self.draw_mini_chart(draw, sidebar_content_x, chart_y, sidebar_width - 40, chart_height)
+        trending_items = self.visible_trending(trending_items)
+        series = [item.series for item in trending_items if item.series is not None and len(item.series)]
+        self.draw_mini_chart(draw, sidebar_content_x, chart_y, sidebar_width - 40, chart_height, series)
 
         # Trending items
         trending_y = chart_y + chart_height + 20
-        trending_items = [
-            {'topic': 'AI Regulation', 'mentions': 15420, 'change': '+23%'},
-            {'topic': 'Cloud Security', 'mentions': 12350, 'change': '+15%'},
-            {'topic': 'Data Privacy', 'mentions': 9820, 'change': '+8%'},
-            {'topic': 'Tech Layoffs', 'mentions': 8450, 'change': '-5%'}
-        ]
-
         for i, item in enumerate(trending_items):
             item_y = trending_y + i * 35
             self.draw_trending_item(draw, sidebar_content_x, item_y, item)
 
         # Breaking news alerts
         alerts_y = trending_y + len(trending_items) * 35 + 30
-        self.draw_text(draw, sidebar_content_x, alerts_y, "Breaking Alerts", self.fonts['heading'], self.colors['gray_800'])
+        self.draw_text(draw, sidebar_content_x, alerts_y, "Breaking Alerts", self.fonts['heading'], self.palette['gray_800'])
 
-        # Alert items
-        alert_items = [
-            {'title': 'Breaking: Major AI Company Announcement', 'time': '5 min ago', 'urgency': 'high'},
-            {'title': 'New Industry Report Released', 'time': '1 hour ago', 'urgency': 'medium'},
-            {'title': 'Market Update: Tech Stocks Surge', 'time': '2 hours ago', 'urgency': 'low'}
-        ]
-
-        for i, alert in enumerate(alert_items):
+        # Alert items that fit
+        for i, alert in enumerate(self.visible_alerts(alert_items, len(trending_items))):
             alert_y = alerts_y + 30 + i * 50
-            if alert_y + 45 < self.height - 20:  # Only draw if it fits
-                self.draw_alert_item(draw, sidebar_content_x, alert_y, alert)
+            self.draw_alert_item(draw, sidebar_content_x, alert_y, alert)
+
+    def visible_trending(self, trending_items):
+        """Take the trending topics that fit above the alerts section"""
+        return list(iter_records(trending_items, TrendingTopic, limit=fit_count(275, 35, 35, self.height - 100)))
+
+    def visible_alerts(self, alert_items, trending_count):
+        """Lazily take the alerts that fit below ``trending_count`` trending rows"""
+        alerts_y = 275 + trending_count * 35 + 30
+        return iter_records(alert_items, Alert, limit=fit_count(alerts_y + 30, 50, 45, self.height - 20))
 
-    def draw_mini_chart(self, draw, x, y, width, height):
-        """Draw a simple trending chart"""
+    def draw_mini_chart(self, draw, x, y, width, height, series=None):
+        """Draw the trending chart: mention ``series`` on a shared scale, or a sample line without data
+
+        Each series is reduced to a min/max pair per pixel column before it is
+        drawn, so the cost does not grow with the number of samples.
+        """
         # Chart background
-        draw.rectangle([x, y, x + width, y + height], fill=self.colors['white'], outline=self.colors['gray_200'])
+        draw.rectangle([x, y, x + width, y + height], fill=self.palette['white'], outline=self.palette['gray_200'])
+
+        if series:
+            self.draw_series(draw, x + 10, y + 15, width - 20, height - 30, series)
+            return
 
         # Simple line chart
+        rng = random.Random(self.seed) if self.seed is not None else random
         points = []
         for i in range(8):
             point_x = x + 10 + i * (width - 20) // 7
-            point_y = y + height - 20 - random.randint(10, height - 40)
+            point_y = y + height - 20 - rng.randint(10, height - 40)
             points.append((point_x, point_y))
 
         # Draw line
         if len(points) > 1:
-            draw.line(points, fill=self.colors['primary'], width=2)
+            self.draw_antialiased(draw, (x, y, x + width, y + height),
+                                  lambda aa: aa.line(points, fill=self.palette['primary'], width=2))
 
         # Draw points
         for point in points:
-            self.draw_circle(draw, point[0], point[1], 3, self.colors['primary'])
+            self.draw_circle(draw, point[0], point[1], 3, self.palette['primary'])
+
+    def draw_series(self, draw, x, y, width, height, series):
+        """Plot several series as sparklines sharing one value scale, each as a single polyline"""
+        columns = max(1, int(width * self.scale))
+        reduced = [minmax_buckets(values, columns) for values in series]
+        samples = [value for _, values in reduced for value in values]
+        low, high = min(samples), max(samples)
+        x_step = width / max(1, columns - 1)
+        y_step = height / (high - low) if high > low else 0
+        baseline = y + height if high > low else y + height / 2
+
+        colors = [self.palette[name] for name in ('primary', 'success', 'warning', 'danger', 'secondary')]
+        lines = []
+        for i, (positions, values) in enumerate(reduced):
+            points = [(x + p * x_step, baseline - (v - low) * y_step) for p, v in zip(positions, values)]
+            lines.append((points, colors[i % len(colors)]))
+
+        def paint(aa):
+            for points, color in lines:
+                if len(points) > 1:
+                    aa.line(points, fill=color, width=2)
+
+        # Lines may stroke a pixel past the plot area
+        self.draw_antialiased(draw, (x - 2, y - 2, x + width + 2, y + height + 2), paint)
+        for points, color in lines:
+            # Mark the latest value
+            self.draw_circle(draw, points[-1][0], points[-1][1], 3, color)
+
+    def draw_antialiased(self, draw, box, painter):
+        """Run ``painter`` on a supersampled ``ScaledDraw`` tile covering ``box`` and composite the tile there
+
+        Used for strokes with no sprite of their own, such as chart lines, so
+        anti-aliasing costs only the pixels of that box.
+        """
+        x0, y0, x1, y1 = (int(v) for v in box)
+        tile = self.sprites.rasterize((x0, y0), (x1 - x0 + 1, y1 - y0 + 1), painter)
+        paste_sprite(draw, self.sprites.stamp(tile), x0, y0)
 
     def draw_trending_item(self, draw, x, y, item):
         """Draw a single trending topic item"""
-        # Topic name
-        self.draw_text(draw, x, y, item['topic'], self.fonts['body'], self.colors['gray_800'])
+        # Topic name, kept clear of the mention count
+        mentions_x = x + 150
+        topic = self.truncate_text(item.topic, self.fonts['body'], mentions_x - x - 10)
+        self.draw_text(draw, x, y, topic, self.fonts['body'], self.palette['gray_800'])
 
         # Mentions and change
-        mentions_x = x + 150
-        change_color = self.colors['success'] if item['change'].startswith('+') else self.colors['danger']
-        self.draw_text(draw, mentions_x, y, f"{item['mentions']:,}", self.fonts['small'], self.colors['gray_600'])
-        self.draw_text(draw, mentions_x + 80, y, item['change'], self.fonts['small'], change_color)
+        change_color = self.palette['success'] if item.change.startswith('+') else self.palette['danger']
+        self.draw_text(draw, mentions_x, y, f"{item.mentions:,}", self.fonts['small'], self.palette['gray_600'])
+        self.draw_text(draw, mentions_x + 80, y, item.change, self.fonts['small'], change_color)
 
     def draw_alert_item(self, draw, x, y, alert):
         """Draw a breaking news alert item"""
         # Alert icon
-        icon_color = self.colors['danger'] if alert['urgency'] == 'high' else self.colors['warning'] if alert['urgency'] == 'medium' else self.colors['gray_400']
+        icon_color = self.palette['danger'] if alert.urgency == 'high' else self.palette['warning'] if alert.urgency == 'medium' else self.palette['gray_400']
         self.draw_icon(draw, x, y + 2, 'alert-triangle', icon_color)
 
         # Alert text
         text_x = x + 25
-        self.draw_text(draw, text_x, y, alert['title'], self.fonts['small'], self.colors['gray_800'])
-        self.draw_text(draw, text_x, y + 18, alert['time'], self.fonts['tiny'], self.colors['gray_500'])
+        title = self.truncate_text(alert.title, self.fonts['small'], self.width - 20 - text_x)
+        self.draw_text(draw, text_x, y, title, self.fonts['small'], self.palette['gray_800'])
+        self.draw_text(draw, text_x, y + 18, alert.time, self.fonts['tiny'], self.palette['gray_500'])
 
     def draw_progress_bar(self, draw, x, y, width, percentage):
         """Draw a progress bar"""
@@ -444,117 +956,431 @@ class DashboardGenerator:
         radius = 4
 
         # Background
-        draw.rounded_rectangle([x, y, x + width, y + height], radius=radius, fill=self.colors['gray_200'])
+        paste_sprite(draw, self.sprites.chip(width, height, radius, self.palette['gray_200']), x, y)
 
         # Filled portion
         filled_width = int(width * percentage / 100)
         if filled_width > 0:
-            color = self.colors['success'] if percentage >= 80 else self.colors['warning'] if percentage >= 60 else self.colors['danger']
-            draw.rounded_rectangle([x, y, x + filled_width, y + height], radius=radius, fill=color)
+            color = self.palette['success'] if percentage >= 80 else self.palette['warning'] if percentage >= 60 else self.palette['danger']
+            paste_sprite(draw, self.sprites.chip(filled_width, height, radius, color), x, y)
 
         # Percentage text
         text_x = x + width + 10
-        self.draw_text(draw, text_x, y - 2, f"{percentage}%", self.fonts['small'], self.colors['gray_600'])
+        self.draw_text(draw, text_x, y - 2, f"{percentage}%", self.fonts['small'], self.palette['gray_600'])
+
+    def tag_width(self, text):
+        """Width of the chip ``draw_tag`` draws for ``text``"""
+        return math.ceil(self.text_width(text, self.fonts['small'])) + 8 * 2
 
     def draw_tag(self, draw, x, y, text, bg_color):
-        """Draw a tag/chip"""
+        """Draw a tag/chip sized to its text"""
         padding = 8
-        text_width = len(text) * 8  # Approximate text width
-
-        draw.rounded_rectangle([x, y, x + text_width + padding * 2, y + 20], radius=10, fill=bg_color)
-        self.draw_text(draw, x + padding, y + 2, text, self.fonts['small'], self.colors['white'])
+        paste_sprite(draw, self.sprites.chip(self.tag_width(text), 20, 10, bg_color), x, y)
+        self.draw_text(draw, x + padding, y + 2, text, self.fonts['small'], self.palette['white'])
 
     def draw_button(self, draw, x, y, width, height, text, bg_color, text_color, border_color=None, radius=18):
         """Draw a button"""
-        if border_color:
-            draw.rounded_rectangle([x, y, x + width, y + height], radius=radius,
-                                  fill=bg_color, outline=border_color)
-        else:
-            draw.rounded_rectangle([x, y, x + width, y + height], radius=radius, fill=bg_color)
+        paste_sprite(draw, self.sprites.chip(width, height, radius, bg_color, border_color), x, y)
 
-        # Center text
-        text_bbox = draw.textbbox((0, 0), text, font=None)
-        text_width = text_bbox[2] - text_bbox[0]
-        text_height = text_bbox[3] - text_bbox[1]
+        # Center text using the same font it is drawn with, measured in dashboard units
+        left, top, right, bottom = self.font_registry.text_bbox(text, self.fonts['body'] * self.scale)
+        if self.scale != 1:
+            left, top, right, bottom = (v / self.scale for v in (left, top, right, bottom))
+        text_width = right - left
+        text_height = bottom - top
 
-        text_x = x + (width - text_width) // 2
-        text_y = y + (height - text_height) // 2
+        text_x = x + (width - text_width) // 2 - left
+        text_y = y + (height - text_height) // 2 - top
 
         self.draw_text(draw, text_x, text_y, text, self.fonts['body'], text_color)
 
-    def draw_text(self, draw, x, y, text, size, color):
-        """Draw text with fallback handling"""
-        try:
-            font = ImageFont.truetype("Arial.ttf", size)
-        except:
-            try:
-                font = ImageFont.load_default()
-            except:
-                # Fallback to basic text
-                draw.text((x, y), text, fill=color)
-                return
+    def text_width(self, text, size):
+        """Advance width of text at a font size, in dashboard units"""
+        return self.text_layout.width(text, size * self.scale) / self.scale
+
+    def truncate_text(self, text, size, max_width):
+        """``text`` shortened with an ellipsis to fit ``max_width`` dashboard units"""
+        return self.text_layout.truncate(text, size * self.scale, max_width * self.scale)
+
+    def wrap_text(self, text, size, max_width, max_lines=None):
+        """``text`` word-wrapped into lines that fit ``max_width`` dashboard units"""
+        return self.text_layout.wrap(text, size * self.scale, max_width * self.scale, max_lines)
 
-        draw.text((x, y), text, font=font, fill=color)
+    def draw_text(self, draw, x, y, text, size, color):
+        """Draw text using the cached font for the given size"""
+        draw.text((x, y), text, font=self.font_registry.get(size * self.scale), fill=color)
 
     def draw_circle(self, draw, x, y, radius, color):
-        """Draw a circle"""
-        draw.ellipse([x - radius, y - radius, x + radius, y + radius], fill=color)
+        """Draw a circle, stamped from the sprite cache"""
+        paste_sprite(draw, self.sprites.disc(radius, color), x, y)
 
     def draw_pen_tool_icon(self, draw, x, y, color):
         """Draw a pen tool icon"""
         size = 24
-        # Simple pen icon
-        draw.polygon([(x, y), (x + size, y + size//2), (x + size//2, y + size)], fill=color)
+        paste_sprite(draw, self.sprites.pen_tool(size, color), x, y)
 
     def draw_icon(self, draw, x, y, icon_type, color):
-        """Draw a simple icon placeholder"""
+        """Draw a simple icon placeholder, stamped from the sprite cache"""
         size = 16  # Default icon size
-        # Create simple geometric shapes as icon placeholders
-        if icon_type == 'bell':
-            # Simple bell icon
-            draw.ellipse([x, y, x + size, y + size], fill=color)
-            draw.rectangle([x + size//3, y + size, x + 2*size//3, y + size + size//3], fill=color)
-        elif icon_type == 'search':
-            # Simple search icon
-            draw.ellipse([x, y, x + size, y + size], fill=color)
-            draw.line([(x + size - size//4, y + size - size//4), (x + size, y + size)], fill=color, width=2)
-        elif icon_type == 'trending-up':
-            # Simple trending up icon
-            draw.line([(x, y + size), (x + size//2, y + size//2)], fill=color, width=2)
-            draw.line([(x + size//2, y + size//2), (x + size, y)], fill=color, width=2)
-            draw.line([(x + size - size//4, y + size//4), (x + size, y)], fill=color, width=2)
-        elif icon_type == 'alert-triangle':
-            # Simple triangle alert icon
-            draw.polygon([(x + size//2, y), (x, y + size), (x + size, y + size)], fill=color)
+        paste_sprite(draw, self.sprites.icon(icon_type, size, color), x, y)
+
+    def generate_dashboard(self, output_path="social-writer-dashboard.png", data=None, encoder='png'):
+        """Generate the complete dashboard
+
+        ``data`` is an optional ``DashboardData`` or a dict spec with ``user``,
+        ``keywords``, ``opportunities``, ``trending`` and ``alerts`` entries;
+        missing entries fall back to the built-in sample data. Sections may
+        be lazy iterables (see ``dashboard_data.iter_json``) and are only
+        consumed as far as the canvas has room.
+
+        ``encoder`` names an entry in ``ENCODER_PROFILES``. ``output_path`` may
+        be a path or a writable file object, in which case it is returned, or
+        None to return the encoded bytes. Encode time and size are kept in
+        ``self.last_encode``; its ``cached`` flag is set when the image came
+        from the on-disk render cache (see ``cache_dir``).
+        """
+        extension = encoder_settings(encoder)['extension']
+        encoded = None
+        if self.render_cache is not None:
+            # Hash what will actually be drawn, which also materializes lazy inputs
+            sections = self.prepare_sections(data)
+            key = self.cache_key(sections, encoder)
+            encoded = self.render_cache.get(key, extension)
+            if encoded is not None:
+                self.last_encode = {'profile': encoder, 'format': ENCODER_PROFILES[encoder]['format'],
+                                    'seconds': 0.0, 'bytes': len(encoded), 'cached': True}
+            else:
+                data = self.sections_to_data(sections)
+
+        if encoded is None:
+            img = self.render(data)
+
+            # Encode in memory so the time and size are measured the same way for every target
+            encoded, stats = self.encode(img, encoder)
+            self.last_encode = dict(stats, cached=False)
+            if self.render_cache is not None:
+                self.render_cache.put(key, extension, encoded)
+
+        if output_path is None:
+            return encoded
+        if hasattr(output_path, 'write'):
+            output_path.write(encoded)
         else:
-            # Default square placeholder
-            draw.rectangle([x, y, x + size, y + size], fill=color)
-
-    def generate_dashboard(self, output_path="social-writer-dashboard.png"):
-        """Generate the complete dashboard"""
-        img, draw = self.create_base_image()
-
-        # Draw all components
-        self.draw_header(img, draw)
-        self.draw_sidebar_left(img, draw)
-        self.draw_main_content(img, draw)
-        self.draw_sidebar_right(img, draw)
-
-        # Add some final polish
-        img = img.filter(ImageFilter.SMOOTH)
+            with open(output_path, 'wb') as f:
+                f.write(encoded)
 
-        # Save the image
-        img.save(output_path, "PNG", quality=95)
-        print(f"Dashboard generated successfully: {output_path}")
+        if self.verbose:
+            how = "from cache" if self.last_encode['cached'] else f"encoded in {self.last_encode['seconds'] * 1000:.1f} ms"
+            print(f"Dashboard generated successfully: {output_path} ({self.last_encode['bytes']:,} bytes, {how})")
 
         return output_path
 
-def main():
+    def render(self, data=None):
+        """Render the complete dashboard and return the image without saving it
+
+        With ``workers > 1`` each panel is drawn into its own layer on a thread
+        pool and pasted into the frame; the result is pixel-identical to the
+        serial path. Shapes are anti-aliased where they are drawn (see
+        ``dashboard_sprites``), so there is no whole-frame filter pass.
+        """
+        if self.workers > 1:
+            inputs = self.prepare_sections(data)
+            img, draw = self.create_base_image()
+            layers = self.render_layers(inputs)
+            for panel in PANELS:
+                img.paste(layers[panel], self.panel_pixels(panel)[:2])
+        else:
+            data = DashboardData.coerce(data)
+            img, draw = self.create_base_image()
+
+            # Draw all components
+            self.draw_header(img, draw, data.user)
+            self.draw_sidebar_left(img, draw, data.keywords)
+            self.draw_main_content(img, draw, data.opportunities)
+            self.draw_sidebar_right(img, draw, data.trending, data.alerts)
+
+        return img
+
+    def draw_chrome(self, img, draw):
+        """Draw what every dashboard shares: panel frames, headings, static labels and the filter bar"""
+        self.draw_header_chrome(img, draw)
+        self.draw_sidebar_left_chrome(img, draw)
+        self.draw_main_content_chrome(img, draw)
+        self.draw_sidebar_right_chrome(img, draw)
+
+    def draw_content(self, img, draw, data=None):
+        """Draw the per-user parts of the dashboard over ``draw_chrome`` output"""
+        data = DashboardData.coerce(data)
+        self.draw_user_profile(draw, data.user)
+        self.draw_keyword_categories(draw, data.keywords)
+        self.draw_opportunities(draw, data.opportunities)
+        self.draw_trends_and_alerts(draw, data.trending, data.alerts)
+
+    def chrome_key(self):
+        """Stable hash of everything that determines ``render_chrome`` output"""
+        return content_hash(RENDERER_VERSION, self.width, self.height, self.scale, self.colors, self.indexed,
+                            self.fonts, self.font_registry.font_path)
+
+    def render_chrome(self):
+        """Render the background and the shared chrome, cached until the palette changes
+
+        The returned image is shared; copy it before drawing on it.
+        """
+        key = self.chrome_key()
+        if self._chrome is None or self._chrome[0] != key:
+            img, draw = self.create_base_image()
+            self.draw_chrome(img, draw)
+            self._chrome = (key, img)
+        return self._chrome[1]
+
+    def render_content(self, data=None, chrome=None):
+        """Draw one user's content over the shared chrome and return the image
+
+        ``chrome`` is a ``render_chrome`` image to draw on in place, such as one
+        read back from shared memory; by default a copy of ``render_chrome()``
+        is used. Content never draws under the chrome, so the result matches
+        ``render``.
+        """
+        img = self.render_chrome().copy() if chrome is None else chrome
+        self.draw_content(img, OffsetDraw(img, scale=self.scale), data)
+        return img
+
+    def render_pyramid(self, data=None, widths=THUMBNAIL_WIDTHS):
+        """Render once and return ``{width: image}`` for the full image and each thumbnail width
+
+        Each level is downsampled from the next larger one rather than from the
+        full frame: ``Image.reduce`` halves while the image is at least twice
+        the target width and a Lanczos resize covers any remainder. Render with
+        ``scale=2`` or more for sharper thumbnails.
+        """
+        img = self.render(data)
+        if img.mode == 'P':
+            img = img.convert('RGB')
+        levels = {img.width: img}
+        for width in sorted(widths, reverse=True):
+            if width >= img.width:
+                continue
+            while img.width >= width * 2 and img.width % 2 == 0 and img.height % 2 == 0:
+                img = img.reduce(2)
+            if img.width != width:
+                img = img.resize((width, max(1, round(img.height * width / img.width))), Image.Resampling.LANCZOS)
+            levels[width] = img
+        return levels
+
+    def generate_thumbnails(self, output_prefix="social-writer-dashboard", data=None, encoder='png',
+                            widths=THUMBNAIL_WIDTHS):
+        """Write the full image as ``<prefix><ext>`` and each thumbnail as ``<prefix>-<width>w<ext>``
+
+        Everything comes from one render. Returns the written paths keyed by width.
+        """
+        extension = encoder_settings(encoder)['extension']
+        paths = {}
+        for width, img in self.render_pyramid(data, widths).items():
+            encoded, _ = self.encode(img, encoder)
+            suffix = '' if width == self.pixel_size[0] else f"-{width}w"
+            paths[width] = f"{output_prefix}{suffix}{extension}"
+            with open(paths[width], 'wb') as f:
+                f.write(encoded)
+            if self.verbose:
+                print(f"Image generated: {paths[width]} ({img.width}x{img.height}, {len(encoded):,} bytes)")
+        return paths
+
+    def encode(self, img, encoder='png'):
+        """Encode a rendered image with an encoder profile; see ``encode_image``"""
+        return encode_image(img, encoder)
+
+    def enable_profiling(self):
+        """Start timing every drawing primitive and render stage; returns the RenderProfiler"""
+        if self.profiler is None:
+            self.profiler = RenderProfiler().attach(self)
+        return self.profiler
+
+    def disable_profiling(self):
+        """Stop timing and return the profiler with the events collected so far"""
+        profiler, self.profiler = self.profiler, None
+        if profiler is not None:
+            profiler.detach()
+        return profiler
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                thread_name_prefix='dashboard-panel')
+        return self._executor
+
+    def render_layers(self, inputs, panels=PANELS):
+        """Render the given panels into layers, concurrently when ``workers > 1``"""
+        if self.workers <= 1 or len(panels) <= 1:
+            return {panel: self.render_panel(panel, inputs[panel]) for panel in panels}
+        futures = {panel: self._pool().submit(self.render_panel, panel, inputs[panel]) for panel in panels}
+        return {panel: future.result() for panel, future in futures.items()}
+
+    def close(self):
+        """Shut down the panel thread pool, if one was started"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def panel_box(self, panel):
+        """Pixel box (left, top, right, bottom) a panel paints in the full frame"""
+        return {
+            'header': (0, 0, self.width, 81),
+            'sidebar_left': (0, 80, 321, self.height),
+            'main_content': (321, 81, self.width - 300, self.height),
+            'sidebar_right': (self.width - 300, 80, self.width, self.height),
+        }[panel]
+
+    def prepare_sections(self, data=None):
+        """Resolve defaults and materialize the visible records of each section
+
+        Returns a dict keyed by panel name holding that panel's inputs, so it
+        can be hashed and rendered more than once even if the input was lazy.
+        """
+        data = DashboardData.coerce(data)
+        keywords = DEFAULT_KEYWORD_CATEGORIES if data.keywords is None else data.keywords
+        opportunities = DEFAULT_OPPORTUNITIES if data.opportunities is None else data.opportunities
+        trending = self.visible_trending(DEFAULT_TRENDING if data.trending is None else data.trending)
+        alerts = DEFAULT_ALERTS if data.alerts is None else data.alerts
+        user = data.user or DEFAULT_USER
+        if not isinstance(user, dict) or not isinstance(user.get('name'), str):
+            raise TypeError("user must be an object with a name")
+        return {
+            'header': (user,),
+            'sidebar_left': (group_keywords(keywords),),
+            'main_content': (list(self.visible_opportunities(opportunities)),),
+            'sidebar_right': (trending, list(self.visible_alerts(alerts, len(trending)))),
+        }
+
+    def panel_pixels(self, panel):
+        """``panel_box`` in image pixels"""
+        return tuple(v * self.scale for v in self.panel_box(panel))
+
+    def sections_to_data(self, sections):
+        """Turn ``prepare_sections`` output back into renderable DashboardData"""
+        return DashboardData(
+            user=sections['header'][0],
+            keywords=sections['sidebar_left'][0],
+            opportunities=sections['main_content'][0],
+            trending=sections['sidebar_right'][0],
+            alerts=sections['sidebar_right'][1],
+        )
+
+    def cache_key(self, sections, encoder='png'):
+        """Stable hash of everything that determines the encoded output"""
+        return content_hash(RENDERER_VERSION, self.width, self.height, self.scale, self.colors, self.indexed, self.fonts,
+                            self.font_registry.font_path, self.seed, encoder, ENCODER_PROFILES[encoder],
+                            sections)
+
+    def render_panel(self, panel, inputs, base=None):
+        """Render one panel into its own layer image covering ``panel_pixels(panel)``"""
+        box = self.panel_box(panel)
+        if base is None:
+            base = self._background()
+        layer = base.crop(self.panel_pixels(panel))
+        draw = OffsetDraw(layer, box[0], box[1], self.scale)
+        getattr(self, f"draw_{panel}")(layer, draw, *inputs)
+        return layer
+
+    def _panel_key(self, panel, inputs):
+        # Only the trending chart in the right sidebar draws from the seed
+        seed = self.seed if panel == 'sidebar_right' else None
+        return content_hash(panel, self.width, self.height, self.scale, self.colors, self.indexed, self.fonts,
+                            seed, inputs)
+
+    def _cached_layers(self, keys, inputs):
+        layers = {}
+        for panel in PANELS:
+            layer = self._layers.get(keys[panel])
+            if layer is not None:
+                self._layers.move_to_end(keys[panel])
+                layers[panel] = layer
+
+        missing = [panel for panel in PANELS if panel not in layers]
+        for panel, layer in self.render_layers(inputs, missing).items():
+            self._layers[keys[panel]] = layer
+            layers[panel] = layer
+        while len(self._layers) > self.layer_cache_size:
+            self._layers.popitem(last=False)
+        return layers
+
+    def update(self, **sections):
+        """Re-render only the panels whose inputs changed and return the new image
+
+        Accepts the same sections as a dashboard spec (``user``, ``keywords``,
+        ``opportunities``, ``trending``, ``alerts``). Sections not passed keep
+        their previous value. Unchanged panels are reused from the layer cache,
+        so the result matches a full ``generate_dashboard`` render.
+        """
+        unknown = set(sections) - set(DashboardData.__slots__)
+        if unknown:
+            raise TypeError(f"Unknown dashboard sections: {', '.join(sorted(unknown))}")
+        self._sections.update(sections)
+
+        inputs = self.prepare_sections(self._sections)
+        # Keep the materialized records so lazy inputs can be rendered again later
+        self._sections['user'] = inputs['header'][0]
+        self._sections['keywords'] = inputs['sidebar_left'][0]
+        self._sections['opportunities'] = inputs['main_content'][0]
+        self._sections['trending'] = inputs['sidebar_right'][0]
+        self._sections['alerts'] = inputs['sidebar_right'][1]
+
+        keys = {panel: self._panel_key(panel, inputs[panel]) for panel in PANELS}
+        dirty = [panel for panel in PANELS if self._frame_keys.get(panel) != keys[panel]]
+        if not dirty and self._frame is not None:
+            return self._frame.copy()
+
+        if self._frame is None:
+            self._frame, _ = self.create_base_image()
+        layers = self._cached_layers(keys, inputs)
+
+        # Panels overlap on their border lines, so paste all of them in order
+        for panel in PANELS:
+            self._frame.paste(layers[panel], self.panel_pixels(panel)[:2])
+
+        self._frame_keys = keys
+        return self._frame.copy()
+
+
+def main(argv=None):
     """Main function to run the dashboard generator"""
+    parser = argparse.ArgumentParser(description="Generate the Social Writer dashboard concept image")
+    parser.add_argument('--output', default=None, help="output file (default: social-writer-dashboard + profile extension)")
+    parser.add_argument('--encoder', default='png', choices=sorted(ENCODER_PROFILES), help="encoder profile")
+    parser.add_argument('--compare-encoders', action='store_true',
+                        help="print encode time and size for every encoder profile")
+    parser.add_argument('--indexed', action='store_true',
+                        help="render onto a fixed-palette indexed image for smaller, faster PNGs")
+    parser.add_argument('--profile', metavar='TRACE_JSON',
+                        help="time drawing primitives, print a summary and write a Chrome trace here")
+    parser.add_argument('--scale', type=int, default=1, help="pixels per layout unit, e.g. 2 for HiDPI output")
+    parser.add_argument('--thumbnails', action='store_true',
+                        help=f"also write {', '.join(map(str, THUMBNAIL_WIDTHS))}px wide thumbnails from the same render")
+    args = parser.parse_args(argv)
+
     print("Generating Social Writer Newsjacking Dashboard...")
 
-    generator = DashboardGenerator()
-    output_file = generator.generate_dashboard()
+    generator = DashboardGenerator(indexed=args.indexed, scale=args.scale)
+    if args.profile:
+        generator.enable_profiling()
+    output_path = args.output or "social-writer-dashboard" + ENCODER_PROFILES[args.encoder]['extension']
+    if args.thumbnails:
+        # One render feeds the full image and every thumbnail
+        prefix, _ = os.path.splitext(output_path)
+        paths = generator.generate_thumbnails(prefix, encoder=args.encoder)
+        output_file = paths[max(paths)]
+    else:
+        output_file = generator.generate_dashboard(output_path, encoder=args.encoder)
+
+    if args.profile:
+        profiler = generator.disable_profiling()
+        profiler.write_chrome_trace(args.profile)
+        print(f"\nRender profile (Chrome trace written to {args.profile}):")
+        print(profiler.format_summary())
+
+    if args.compare_encoders:
+        print("\nEncoder profiles:")
+        for stats in compare_encoders(generator.render()):
+            print(f"- {stats['profile']:<14} {stats['seconds'] * 1000:8.1f} ms {stats['bytes']:>10,} bytes")
 
     print(f"\nDashboard UI concept created: {output_file}")
     print("\nFeatures included:")
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Social Writer Dashboard Golden-Image Checks
+
+Renders a fixed set of seeded cases through DashboardGenerator and compares
+each with a stored golden PNG, so a renderer change can be shown not to
+alter the output. The comparison is vectorized with NumPy: a per-pixel
+perceptual distance (the YIQ color delta used by pixelmatch) is thresholded
+and a case fails when more than a tolerated fraction of its pixels differ.
+Failing cases get the actual image and a heatmap of the differences written
+next to the report.
+
+Every case renders in its own worker process, so alongside the pixels the
+report records render time and the process's peak memory, and flags cases
+that became much slower than when their golden was stored.
+
+Usage:
+    python dashboard_golden.py --update          # store new goldens
+    python dashboard_golden.py --workers 4       # check against them
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - required only by this tool
+    np = None
+
+from dashboard_feed import peak_rss_kib
+from dashboard_fixtures import synthetic_spec
+from dashboard_generator import DashboardGenerator
+
+# Largest possible YIQ delta between two colors
+MAX_YIQ_DELTA = 35215.0
+
+
+def _long_text_spec():
+    spec = synthetic_spec(4, 11)
+    spec['opportunities'][0]['title'] = "A deliberately long opportunity title " * 6
+    spec['opportunities'][0]['summary'] = "Summary words that need wrapping onto more than one line. " * 8
+    spec['opportunities'][0]['keywords'] = [f"Keyword {i}" for i in range(20)]
+    spec['alerts'][0]['title'] = "A breaking alert title far too long for the sidebar column"
+    return spec
+
+
+def _series_spec():
+    rng = random.Random(3)
+    spec = synthetic_spec(4, 3)
+    for i, topic in enumerate(spec['trending'][:3]):
+        level, series = 100.0 * (i + 1), []
+        for _ in range(20000):
+            level = max(0.0, level + rng.gauss(0, 4))
+            series.append(round(level, 2))
+        topic['series'] = series
+    return spec
+
+
+# name: (DashboardGenerator keyword arguments, spec factory or None for the sample data)
+CASES = {
+    'sample': ({'seed': 7}, None),
+    'sample-threaded': ({'seed': 7, 'workers': 3}, None),
+    'synthetic-4': ({'seed': 1}, lambda: synthetic_spec(4, 1)),
+    'synthetic-100': ({'seed': 2}, lambda: synthetic_spec(100, 2)),
+    'indexed': ({'seed': 7, 'indexed': True}, None),
+    'hidpi': ({'seed': 7, 'scale': 2}, None),
+    'long-text': ({'seed': 11}, _long_text_spec),
+    'series': ({'seed': 3}, _series_spec),
+}
+
+
+def render_case(name, repeat=3):
+    """Render a case in this process; returns (RGB image, metrics)"""
+    options, factory = CASES[name]
+    generator = DashboardGenerator(verbose=False, **options)
+    spec = factory() if factory else None
+    try:
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            img = generator.render(spec)
+            samples.append(time.perf_counter() - start)
+        tracemalloc.start()
+        generator.render(spec)
+        _, heap_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        generator.close()
+    return img.convert('RGB'), {
+        'render_ms': round(min(samples) * 1000, 3),
+        'peak_heap_kib': round(heap_peak / 1024, 1),
+        'peak_rss_kib': peak_rss_kib(),
+    }
+
+
+def perceptual_delta(expected, actual):
+    """Per-pixel YIQ color distance between two RGB arrays, scaled to [0, 1]"""
+    diff = expected.astype(np.float32) - actual.astype(np.float32)
+    r, g, b = diff[..., 0], diff[..., 1], diff[..., 2]
+    y = r * 0.29889531 + g * 0.58662247 + b * 0.11448223
+    i = r * 0.59597799 - g * 0.27417610 - b * 0.32180189
+    q = r * 0.21147017 - g * 0.52261711 + b * 0.31114694
+    return np.sqrt((0.5053 * y * y + 0.299 * i * i + 0.1957 * q * q) / MAX_YIQ_DELTA)
+
+
+def compare_images(expected, actual, threshold=0.1):
+    """Diff statistics and the per-pixel delta array for two RGB images"""
+    if expected.size != actual.size:
+        return {'size_mismatch': [expected.size, actual.size]}, None
+    expected_pixels = np.asarray(expected)
+    actual_pixels = np.asarray(actual)
+    delta = perceptual_delta(expected_pixels, actual_pixels)
+    differing = int(np.count_nonzero(delta > threshold))
+    return {
+        'differing_pixels': differing,
+        'differing_ratio': differing / delta.size,
+        'max_delta': round(float(delta.max()), 4),
+        'max_channel_diff': int(np.abs(expected_pixels.astype(np.int16) - actual_pixels).max()),
+    }, delta
+
+
+def heatmap(expected, delta, threshold=0.1):
+    """The golden image dimmed to gray, with differences painted from yellow (small) to red (large)"""
+    base = np.asarray(expected.convert('L'), dtype=np.float32) * 0.3 + 178
+    out = np.repeat(base[..., None], 3, axis=2)
+    changed = delta > threshold
+    strength = np.clip(delta / max(float(delta.max()), 1e-6), 0, 1)
+    out[changed] = np.stack([np.full(strength.shape, 255.0), 230 * (1 - strength), np.zeros(strength.shape)],
+                            axis=-1)[changed]
+    return Image.fromarray(out.astype(np.uint8), 'RGB')
+
+
+def check_case(name, golden_dir, out_dir, update=False, threshold=0.1, max_ratio=0.0, repeat=3):
+    """Render one case and compare it with (or store it as) its golden; runs in a worker"""
+    img, metrics = render_case(name, repeat)
+    golden_path = os.path.join(golden_dir, f"{name}.png")
+    result = dict(metrics, name=name)
+    if update:
+        img.save(golden_path)
+        result['status'] = 'updated'
+        return result
+    if not os.path.exists(golden_path):
+        result['status'] = 'missing'
+        return result
+
+    with Image.open(golden_path) as golden:
+        expected = golden.convert('RGB')
+    stats, delta = compare_images(expected, img, threshold)
+    result.update(stats)
+    failed = delta is None or stats['differing_ratio'] > max_ratio
+    result['status'] = 'fail' if failed else 'pass'
+    if failed:
+        img.save(os.path.join(out_dir, f"{name}.actual.png"))
+        if delta is not None:
+            heatmap(expected, delta, threshold).save(os.path.join(out_dir, f"{name}.diff.png"))
+    return result
+
+
+def run_checks(names, golden_dir, out_dir, update=False, workers=None, threshold=0.1, max_ratio=0.0,
+               repeat=3, slowdown=1.5):
+    """Check every named case in parallel and return the report"""
+    os.makedirs(golden_dir, exist_ok=True)
+    os.makedirs(out_dir, exist_ok=True)
+    metrics_path = os.path.join(golden_dir, 'metrics.json')
+    baseline = {}
+    if os.path.exists(metrics_path):
+        with open(metrics_path, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    # A fresh process per case so its peak RSS is its own
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        futures = [pool.submit(check_case, name, golden_dir, out_dir, update, threshold, max_ratio, repeat)
+                   for name in names]
+        results = [future.result() for future in futures]
+
+    for result in results:
+        previous = baseline.get(result['name'])
+        if previous and not update:
+            result['render_ratio'] = round(result['render_ms'] / max(previous['render_ms'], 1e-3), 3)
+            result['slower'] = result['render_ratio'] > slowdown
+
+    if update:
+        baseline.update({result['name']: {key: result[key] for key in ('render_ms', 'peak_rss_kib', 'peak_heap_kib')}
+                         for result in results})
+        with open(metrics_path, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    report = {'threshold': threshold, 'max_ratio': max_ratio, 'cases': results}
+    with open(os.path.join(out_dir, 'report.json'), 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write('\n')
+    return report
+
+
+def main(argv=None):
+    """Command line entry point for the golden-image checks"""
+    parser = argparse.ArgumentParser(description="Compare renders with stored golden images")
+    parser.add_argument('--golden-dir', default='golden', help="directory of golden PNGs and metrics.json")
+    parser.add_argument('--out-dir', default='golden-report', help="report, actual images and heatmaps go here")
+    parser.add_argument('--update', action='store_true', help="store the current renders as the goldens")
+    parser.add_argument('--case', action='append', dest='cases', choices=sorted(CASES),
+                        help="case to run (repeatable, default: all)")
+    parser.add_argument('--workers', type=int, default=None, help="parallel cases (default: CPU count)")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="per-pixel perceptual distance (0-1) above which a pixel counts as different")
+    parser.add_argument('--max-diff-ratio', type=float, default=0.0,
+                        help="fraction of differing pixels tolerated before a case fails")
+    parser.add_argument('--repeat', type=int, default=3, help="timed renders per case; the fastest is kept")
+    parser.add_argument('--slowdown', type=float, default=1.5,
+                        help="flag cases whose render time grew by more than this factor")
+    args = parser.parse_args(argv)
+    if np is None:
+        parser.error("the golden-image checks need NumPy")
+
+    report = run_checks(args.cases or list(CASES), args.golden_dir, args.out_dir, update=args.update,
+                        workers=args.workers, threshold=args.threshold, max_ratio=args.max_diff_ratio,
+                        repeat=args.repeat, slowdown=args.slowdown)
+
+    failed = False
+    print(f"{'case':<18} {'status':<8} {'differing':>10} {'render ms':>10} {'vs golden':>10} {'peak RSS MiB':>13}")
+    for result in report['cases']:
+        ratio = f"{result['render_ratio']:.2f}x" if 'render_ratio' in result else '-'
+        if result.get('slower'):
+            ratio += ' !'
+        differing = result.get('differing_pixels', '-')
+        rss = f"{result['peak_rss_kib'] / 1024:.1f}" if result['peak_rss_kib'] is not None else '-'
+        print(f"{result['name']:<18} {result['status']:<8} {differing:>10} {result['render_ms']:>10.1f} "
+              f"{ratio:>10} {rss:>13}")
+        failed = failed or result['status'] in ('fail', 'missing')
+    print(f"\nReport written to {os.path.join(args.out_dir, 'report.json')}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Peak-preserving downsampling of time series for the dashboard sparkline
+
+A mention series may hold hundreds of thousands of samples but the chart is
+only a couple of hundred pixels wide. ``minmax_buckets`` splits a series into
+one bucket per pixel column and keeps each bucket's minimum and maximum, in
+the order they are approached from the previous bucket, so spikes survive
+and the polyline drawn from the result looks the same as one drawn through
+every sample. With NumPy installed the reduction is vectorized
+(``np.minimum.reduceat``); without it a pure Python loop gives the same
+result more slowly. Either way the chart draws at most two points per column,
+so drawing cost does not depend on the series length.
+
+Cache keys identify a series by ``series_digest``, a hash of its samples as
+packed doubles, instead of spelling every sample out as JSON.
+"""
+
+import hashlib
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+
+def minmax_buckets(values, buckets):
+    """Downsample ``values`` to at most two (position, value) points per bucket
+
+    Positions are bucket indexes in ``[0, buckets)``. Series with no more than
+    ``2 * buckets`` samples are returned as they are, with positions spread
+    over the same range. Returns two lists: positions and values.
+    """
+    count = len(values)
+    if count == 0 or buckets < 1:
+        return [], []
+    if count <= 2 * buckets:
+        step = (buckets - 1) / max(1, count - 1)
+        return [i * step for i in range(count)], [float(v) for v in values]
+    if np is not None:
+        return _minmax_numpy(values, buckets)
+    return _minmax_python(values, buckets)
+
+
+def series_digest(values):
+    """Hex digest of a series' samples as float64
+
+    A list and a NumPy array holding the same numbers hash the same, as they
+    plot the same. Arrays are hashed straight from their buffer.
+    """
+    if np is not None:
+        samples = np.ascontiguousarray(values, dtype=np.float64)
+    else:
+        samples = array('d', values)
+    return hashlib.sha1(samples).hexdigest()
+
+
+def _bucket_edges(count, buckets):
+    return [count * i // buckets for i in range(buckets + 1)]
+
+
+def _minmax_numpy(values, buckets):
+    values = np.asarray(values, dtype=np.float64)
+    starts = (np.arange(buckets) * len(values)) // buckets
+    lows = np.minimum.reduceat(values, starts)
+    highs = np.maximum.reduceat(values, starts)
+    # Start each column at the extreme nearer the column's first sample
+    firsts = values[starts]
+    low_first = firsts - lows <= highs - firsts
+    pairs = np.empty((buckets, 2))
+    pairs[:, 0] = np.where(low_first, lows, highs)
+    pairs[:, 1] = np.where(low_first, highs, lows)
+    positions = np.repeat(np.arange(buckets, dtype=np.float64), 2)
+    return positions.tolist(), pairs.ravel().tolist()
+
+
+def _minmax_python(values, buckets):
+    edges = _bucket_edges(len(values), buckets)
+    positions, points = [], []
+    for column in range(buckets):
+        bucket = values[edges[column]:edges[column + 1]]
+        low, high = float(min(bucket)), float(max(bucket))
+        first = float(bucket[0])
+        positions += [column, column]
+        points += [low, high] if first - low <= high - first else [high, low]
+    return positions, points
+
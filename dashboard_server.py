@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Social Writer Dashboard Render Server
+
+A stdlib HTTP server that keeps warmed DashboardGenerator workers alive and
+returns rendered dashboards, instead of starting a new interpreter per image.
+
+Endpoints:
+    POST /render[?encoder=png]        body is a dashboard spec (JSON)
+    GET  /render/<spec_id>[?encoder=png]
+                                      a spec loaded with --specs, or one
+                                      previously POSTed (its X-Spec-Id)
+    GET  /health                      cache and queue statistics
+
+A spec may carry ``scale``, ``colors`` and ``seed``, read as
+``dashboard_batch`` reads them.
+
+Specs are resolved to the records the dashboard will show before anything
+is rendered, with relative times such as "2 hours ago" worked out from the
+current clock. Identical resolved dashboards are served from an in-memory
+LRU keyed by their content hash, which is also the response ETag, so
+clients can revalidate with If-None-Match and get a fresh image once the
+clock moves a card's age on. Renders run on a bounded process pool. At most
+``--max-pending`` requests wait for a render at once; beyond that a request
+is refused with 503 and Retry-After, as the render daemon refuses jobs when
+its queue is full, instead of holding a server thread and its spec.
+
+Usage:
+    python dashboard_server.py --port 8765 --workers 4 --specs specs.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from dashboard_batch import GeneratorPool, _init_worker, _worker_generator, read_specs, spec_options
+from dashboard_generator import ENCODER_PROFILES, content_hash
+
+CONTENT_TYPES = {'PNG': 'image/png', 'WEBP': 'image/webp', 'JPEG': 'image/jpeg'}
+
+# Upper bound on a POSTed spec body
+MAX_SPEC_BYTES = 16 * 1024 * 1024
+
+# Seconds a refused client is told to wait before retrying
+RETRY_AFTER = 1
+
+class SpecError(ValueError):
+    """A spec whose sections cannot be read as dashboard records"""
+
+
+class ServiceBusy(RuntimeError):
+    """Too many requests are already waiting for renders"""
+
+
+def _render_bytes(sections, options, encoder):
+    """Render resolved sections (see ``RenderService.prepare``) to encoded bytes in a worker process"""
+    scale, colors, seed = options
+    generator = _worker_generator(scale, colors)
+    # Seeded so the same sections always produce the same bytes, and the same ETag
+    generator.seed = seed
+    return generator.generate_dashboard(None, data=generator.sections_to_data(sections), encoder=encoder)
+
+
+class RenderCache:
+    """Thread-safe LRU of encoded images bounded by entry count and total bytes"""
+
+    def __init__(self, max_entries=256, max_bytes=256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = value
+            self._size += len(value)
+            while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._size, 'hits': self.hits, 'misses': self.misses}
+
+
+class RenderService:
+    """Render specs on a bounded process pool with response caching and single-flight
+
+    ``max_pending`` bounds the requests waiting for a render (default eight
+    per worker); cache hits are never refused.
+    """
+
+    def __init__(self, workers=None, font_search_paths=None, cache=None, specs=None, max_posted_specs=1024,
+                 max_pending=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 8
+        self.cache = cache or RenderCache()
+        self.specs = dict(specs or {})
+        self.max_posted_specs = max_posted_specs
+        self._posted = OrderedDict()
+        # Resolves specs and hashes them here, with the same fonts the workers use
+        self._generators = GeneratorPool(font_search_paths=font_search_paths)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(font_search_paths,))
+        self._inflight = {}
+        self._waiting = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def spec_id(spec):
+        return content_hash(spec)
+
+    def remember(self, spec):
+        """Store a POSTed spec for later GET requests and return its id"""
+        spec_id = self.spec_id(spec)
+        with self._lock:
+            self._posted[spec_id] = spec
+            self._posted.move_to_end(spec_id)
+            while len(self._posted) > self.max_posted_specs:
+                self._posted.popitem(last=False)
+        return spec_id
+
+    def lookup(self, spec_id):
+        """Return a spec loaded at startup or remembered from a POST, or None"""
+        spec = self.specs.get(spec_id)
+        if spec is None:
+            with self._lock:
+                spec = self._posted.get(spec_id)
+        return spec
+
+    def prepare(self, spec, encoder='png'):
+        """Resolve a spec into (etag, sections, options) without rendering it
+
+        ``options`` are the spec's scale, colors and seed. The ETag hashes the
+        resolved sections with them, so it changes when the image would: with
+        the renderer version, the fonts and palette, and the clock behind each
+        card's relative age. Raises ValueError for an unknown encoder and
+        SpecError for a malformed spec.
+        """
+        if encoder not in ENCODER_PROFILES:
+            raise ValueError(f"Unknown encoder profile: {encoder}")
+        try:
+            scale, colors = spec_options(spec)
+            generator = self._generators.get(scale, colors)
+            sections = generator.prepare_sections(spec)
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise SpecError(f"invalid spec: {e!r}") from None
+        options = (scale, colors, spec.get('seed', 0))
+        return f'"{content_hash(generator.cache_key(sections, encoder), options)}"', sections, options
+
+    def etag(self, spec, encoder='png'):
+        """The response ETag for a spec, known before anything is rendered"""
+        return self.prepare(spec, encoder)[0]
+
+    def render(self, spec, encoder='png', prepared=None):
+        """Return (etag, image bytes), rendering at most once per distinct resolved spec
+
+        ``prepared`` is this spec's ``prepare`` result, if already known.
+        Raises ValueError for an unknown encoder or a malformed spec, and
+        ServiceBusy when ``max_pending`` requests are already waiting.
+        """
+        etag, sections, options = prepared or self.prepare(spec, encoder)
+        image = self.cache.get(etag)
+        if image is not None:
+            return etag, image
+
+        with self._lock:
+            if self._waiting >= self.max_pending:
+                raise ServiceBusy(f"{self._waiting} renders pending")
+            self._waiting += 1
+        try:
+            return etag, self._render(etag, sections, options, encoder)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def _render(self, etag, sections, options, encoder):
+        with self._lock:
+            future = self._inflight.get(etag)
+            owner = future is None
+            if owner:
+                future = self._executor.submit(_render_bytes, sections, options, encoder)
+                self._inflight[etag] = future
+        try:
+            image = future.result()
+        finally:
+            if owner:
+                with self._lock:
+                    self._inflight.pop(etag, None)
+        if owner:
+            self.cache.put(etag, image)
+        return image
+
+    def stats(self):
+        with self._lock:
+            inflight = len(self._inflight)
+            waiting = self._waiting
+            posted = len(self._posted)
+        return {'workers': self.workers, 'inflight': inflight, 'waiting': waiting, 'max_pending': self.max_pending,
+                'specs': len(self.specs) + posted, 'cache': self.cache.stats()}
+
+    def close(self):
+        self._executor.shutdown()
+        self._generators.close()
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end for a RenderService, set as ``server.service``"""
+
+    server_version = "SocialWriterRender/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/health':
+            return self._send_json(HTTPStatus.OK, self.server.service.stats())
+        if url.path.startswith('/render/'):
+            spec = self.server.service.lookup(url.path[len('/render/'):])
+            if spec is None:
+                return self._send_json(HTTPStatus.NOT_FOUND, {'error': 'unknown spec id'})
+            return self._render(spec, url)
+        self._send_json(HTTPStatus.NOT_FOUND, {'error': 'not found'})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != '/render':
+            return self._send_json(HTTPStatus.NOT_FOUND, {'error': 'not found'})
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            return self._send_json(HTTPStatus.BAD_REQUEST, {'error': 'invalid Content-Length'})
+        if length > MAX_SPEC_BYTES:
+            return self._send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': 'spec too large'})
+        try:
+            spec = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError as e:
+            # Malformed JSON and bodies that are not UTF-8/16/32 text
+            return self._send_json(HTTPStatus.BAD_REQUEST, {'error': f'invalid JSON: {e}'})
+        if not isinstance(spec, dict):
+            return self._send_json(HTTPStatus.BAD_REQUEST, {'error': 'spec must be a JSON object'})
+        self._render(spec, url, spec_id=self.server.service.remember(spec))
+
+    def _render(self, spec, url, spec_id=None):
+        encoder = parse_qs(url.query).get('encoder', ['png'])[0]
+        try:
+            prepared = self.server.service.prepare(spec, encoder)
+        except ValueError as e:
+            return self._send_json(HTTPStatus.BAD_REQUEST, {'error': str(e)})
+
+        etag = prepared[0]
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if spec_id:
+            headers['X-Spec-Id'] = spec_id
+        # Revalidation needs no render: the ETag is known from the resolved spec
+        if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+            return self._send(HTTPStatus.NOT_MODIFIED, b'', None, headers)
+
+        try:
+            etag, image = self.server.service.render(spec, encoder, prepared)
+        except ValueError as e:
+            return self._send_json(HTTPStatus.BAD_REQUEST, {'error': str(e)})
+        except ServiceBusy as e:
+            return self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {'error': f'busy: {e}', 'retry': True},
+                                   {'Retry-After': str(RETRY_AFTER)})
+        except Exception as e:
+            self.log_error("render failed: %r", e)
+            return self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': 'render failed'})
+        content_type = CONTENT_TYPES[ENCODER_PROFILES[encoder]['format']]
+        self._send(HTTPStatus.OK, image, content_type, headers)
+
+    def _send_json(self, status, payload, headers=None):
+        self._send(status, json.dumps(payload).encode('utf-8'), 'application/json', headers)
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        if content_type:
+            self.send_header('Content-Type', content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+
+def make_server(host='127.0.0.1', port=8765, service=None):
+    """Create the HTTP server bound to ``service`` (a RenderService)"""
+    server = ThreadingHTTPServer((host, port), RenderRequestHandler)
+    server.daemon_threads = True
+    server.service = service or RenderService()
+    return server
+
+
+def main(argv=None):
+    """Command line entry point for the render server"""
+    parser = argparse.ArgumentParser(description="Serve rendered dashboards over HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=None, help="render processes (default: CPU count)")
+    parser.add_argument('--specs', help="JSONL file of specs served by id at GET /render/<id>")
+    parser.add_argument('--max-pending', type=int, default=None,
+                        help="requests waiting for renders before more are refused with 503 (default: 8 per worker)")
+    parser.add_argument('--cache-entries', type=int, default=256, help="cached responses kept in memory")
+    parser.add_argument('--cache-mb', type=int, default=256, help="memory budget for cached responses")
+    parser.add_argument('--font-path', action='append', dest='font_paths',
+                        help="directory to search for fonts (repeatable)")
+    args = parser.parse_args(argv)
+
+    specs = {}
+    if args.specs:
+        specs = {job_id: spec for job_id, spec, error in read_specs(args.specs) if not error}
+
+    service = RenderService(workers=args.workers, font_search_paths=args.font_paths, specs=specs,
+                            max_pending=args.max_pending,
+                            cache=RenderCache(args.cache_entries, args.cache_mb * 1024 * 1024))
+    server = make_server(args.host, args.port, service)
+    print(f"Serving dashboards on http://{args.host}:{args.port} with {service.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
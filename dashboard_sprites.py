@@ -0,0 +1,245 @@
+"""
+Pre-rasterized sprites for repeated dashboard elements
+
+Icons, the pen tool logo, keyword toggles, chips, buttons, bars, dots and whole
+card backgrounds are drawn once per distinct (shape, size, color) at
+``SUPERSAMPLE`` times their size, reduced with a box filter for anti-aliased
+edges and cached as RGBA images. Card sprites carry a real soft shadow,
+blurred and alpha-composited under the card once; only a narrow card is
+supersampled and its uniform middle column stretched to the full width, so
+the supersampled canvas does not grow with the card. Drawing one more of any of
+them is then a single masked ``Image.paste`` over its own bounding box, which
+is the only anti-aliasing the dashboard needs. For indexed output the sprites
+are mapped onto the fixed palette once, with a hard-edged mask. An atlas built
+with ``scale`` rasterizes at that many pixels per dashboard unit for HiDPI
+renders.
+"""
+
+import threading
+from collections import OrderedDict
+
+from PIL import Image, ImageDraw, ImageFilter
+
+SUPERSAMPLE = 4
+
+
+def widen(image, x, extra):
+    """``image`` made ``extra`` pixels wider by repeating its column ``x``"""
+    width, height = image.size
+    wide = Image.new(image.mode, (width + extra, height))
+    wide.paste(image.crop((0, 0, x, height)), (0, 0))
+    wide.paste(image.crop((x, 0, x + 1, height)).resize((extra, height), Image.Resampling.NEAREST), (x, 0))
+    wide.paste(image.crop((x, 0, width, height)), (x + extra, 0))
+    return wide
+
+
+def shadow_reach(offset, blur):
+    """How far a card sprite's shadow can reach beyond the card on any side"""
+    return 2 * blur + offset
+
+
+class ScaledDraw:
+    """Draw pixel-space shapes onto a canvas ``scale`` times larger
+
+    Boxes are inclusive pixel boxes as ImageDraw takes them; points are pixel
+    centers. ``origin`` is the pixel position of the canvas's top-left corner.
+    """
+
+    def __init__(self, draw, scale, origin=(0, 0)):
+        self._draw = draw
+        self.scale = scale
+        self.ox, self.oy = origin
+
+    def _box(self, xy):
+        x0, y0, x1, y1 = xy
+        s = self.scale
+        return [(x0 - self.ox) * s, (y0 - self.oy) * s,
+                (x1 - self.ox + 1) * s - 1, (y1 - self.oy + 1) * s - 1]
+
+    def _points(self, xy):
+        s = self.scale
+        return [((px - self.ox + 0.5) * s - 0.5, (py - self.oy + 0.5) * s - 0.5) for px, py in xy]
+
+    def rectangle(self, xy, fill):
+        self._draw.rectangle(self._box(xy), fill=fill)
+
+    def rounded_rectangle(self, xy, radius, fill, outline=None, width=1):
+        self._draw.rounded_rectangle(self._box(xy), radius=radius * self.scale, fill=fill, outline=outline,
+                                     width=width * self.scale)
+
+    def ellipse(self, xy, fill):
+        self._draw.ellipse(self._box(xy), fill=fill)
+
+    def polygon(self, xy, fill):
+        self._draw.polygon(self._points(xy), fill=fill)
+
+    def line(self, xy, fill, width=1):
+        self._draw.line(self._points(xy), fill=fill, width=width * self.scale)
+
+
+def paint_icon(draw, icon_type, size, color):
+    """Simple geometric placeholder icons, drawn at the origin"""
+    if icon_type == 'bell':
+        draw.ellipse([0, 0, size, size], fill=color)
+        draw.rectangle([size//3, size, 2*size//3, size + size//3], fill=color)
+    elif icon_type == 'search':
+        draw.ellipse([0, 0, size, size], fill=color)
+        draw.line([(size - size//4, size - size//4), (size, size)], fill=color, width=2)
+    elif icon_type == 'trending-up':
+        draw.line([(0, size), (size//2, size//2)], fill=color, width=2)
+        draw.line([(size//2, size//2), (size, 0)], fill=color, width=2)
+        draw.line([(size - size//4, size//4), (size, 0)], fill=color, width=2)
+    elif icon_type == 'alert-triangle':
+        draw.polygon([(size//2, 0), (0, size), (size, size)], fill=color)
+    else:
+        draw.rectangle([0, 0, size, size], fill=color)
+
+
+class SpriteAtlas:
+    """Bounded LRU of rasterized sprites, safe to share between render threads
+
+    Each getter returns ``(image, mask, (dx, dy))``: the image and paste mask,
+    and the offset of its top-left corner from the element's drawing position.
+    With ``indexed_palette`` (a "P" image) the image is quantized to that
+    palette and the mask is the thresholded alpha; otherwise the image is RGBA
+    and is its own mask. Sizes and offsets are in dashboard units on the way in
+    and in pixels on the way out, ``scale`` pixels per unit.
+    """
+
+    def __init__(self, maxsize=512, supersample=SUPERSAMPLE, indexed_palette=None, scale=1):
+        self.maxsize = maxsize
+        self.supersample = supersample
+        self.scale = scale
+        self.indexed_palette = indexed_palette
+        self._sprites = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, key):
+        with self._lock:
+            sprite = self._sprites.get(key)
+            if sprite is not None:
+                self._sprites.move_to_end(key)
+            return sprite
+
+    def _store(self, key, sprite):
+        with self._lock:
+            self._sprites[key] = sprite
+            if len(self._sprites) > self.maxsize:
+                self._sprites.popitem(last=False)
+        return sprite
+
+    def rasterize(self, origin, size, painter):
+        """Run ``painter`` on a supersampled ``ScaledDraw`` and return the reduced RGBA image
+
+        ``origin`` and ``size`` are in dashboard units; the image is ``scale``
+        pixels per unit.
+        """
+        s = self.supersample * self.scale
+        canvas = Image.new('RGBA', (size[0] * s, size[1] * s), (0, 0, 0, 0))
+        painter(ScaledDraw(ImageDraw.Draw(canvas), s, origin))
+        return canvas.resize((size[0] * self.scale, size[1] * self.scale), Image.Resampling.BOX)
+
+    def stamp(self, image, origin=(0, 0)):
+        """Turn an RGBA image into an uncached sprite; ``origin`` is in dashboard units"""
+        origin = (origin[0] * self.scale, origin[1] * self.scale)
+        if self.indexed_palette is not None:
+            mask = image.getchannel('A').point(lambda a: 255 if a >= 128 else 0)
+            image = image.convert('RGB').quantize(palette=self.indexed_palette, dither=Image.Dither.NONE)
+            return image, mask, origin
+        return image, image, origin
+
+    def _get(self, key, origin, size, painter):
+        sprite = self._cached(key)
+        if sprite is None:
+            sprite = self._store(key, self.stamp(self.rasterize(origin, size, painter), origin))
+        return sprite
+
+    def icon(self, icon_type, size, color):
+        """An icon from ``paint_icon``; two pixels of padding cover the stroke widths"""
+        pad = 2
+        extent = size + size//3 + 2 * pad + 1
+        return self._get(('icon', icon_type, size, color), (-pad, -pad), (extent, extent),
+                         lambda draw: paint_icon(draw, icon_type, size, color))
+
+    def pen_tool(self, size, color):
+        """The app logo: a pen nib triangle"""
+        return self._get(('pen', size, color), (0, 0), (size + 1, size + 1),
+                         lambda draw: draw.polygon([(0, 0), (size, size//2), (size//2, size)], fill=color))
+
+    def chip(self, width, height, radius, color, outline=None):
+        """A filled rounded rectangle covering the inclusive box [0, 0, width, height]
+
+        Chips are tags, buttons, the search box and progress bars.
+        """
+        return self._get(('chip', width, height, radius, color, outline), (0, 0), (width + 1, height + 1),
+                         lambda draw: draw.rounded_rectangle([0, 0, width, height], radius=radius, fill=color,
+                                                             outline=outline))
+
+    def disc(self, radius, color):
+        """A filled circle centered on the drawing position"""
+        return self._get(('disc', radius, color), (-radius, -radius), (2 * radius + 1, 2 * radius + 1),
+                         lambda draw: draw.ellipse([-radius, -radius, radius, radius], fill=color))
+
+    def card(self, width, height, radius, fill, outline, header_height, header_fill, shadow):
+        """An opportunity card background: body, header band and drop shadow
+
+        ``shadow`` is ``(color, opacity, offset, blur)``. The shadow is a
+        blurred copy of the card's shape, tinted and alpha-composited under the
+        body so it really shows the background through it. Indexed output has
+        no partial transparency, so there it is a flat ``color`` outline of the
+        card shifted by ``offset`` instead.
+        """
+        key = ('card', width, height, radius, fill, outline, header_height, header_fill, shadow)
+        sprite = self._cached(key)
+        if sprite is not None:
+            return sprite
+
+        _, _, offset, blur = shadow
+        pad = shadow_reach(offset, blur)
+        # Away from the corners and the blur around them every column of a card is
+        # the same, so only a narrow card is supersampled and its middle column is
+        # repeated out to the full width
+        core = radius + pad + 4 * blur + 1
+        narrow = min(width, 2 * core)
+        body = self._card_body(narrow, height, radius, fill, outline, header_height, header_fill, shadow)
+        if narrow < width:
+            body = widen(body, (pad + core) * self.scale, (width - narrow) * self.scale)
+        return self._store(key, self.stamp(body, (-pad, -pad)))
+
+    def _card_body(self, width, height, radius, fill, outline, header_height, header_fill, shadow):
+        """The RGBA image of a card sprite, drawn in full"""
+        color, opacity, offset, blur = shadow
+        pad = shadow_reach(offset, blur)
+        origin, size = (-pad, -pad), (width + 1 + 2 * pad, height + 1 + 2 * pad)
+        hard_shadow = self.indexed_palette is not None
+
+        def paint(draw):
+            if hard_shadow:
+                draw.rounded_rectangle([offset, offset, width + offset, height + offset], radius=radius, fill=color)
+            draw.rounded_rectangle([0, 0, width, height], radius=radius, fill=fill, outline=outline)
+            draw.rounded_rectangle([0, 0, width, header_height], radius=radius, fill=header_fill)
+
+        body = self.rasterize(origin, size, paint)
+        if not hard_shadow:
+            # The blur hides aliasing, so the silhouette needs no supersampling
+            silhouette = Image.new('L', body.size, 0)
+            ScaledDraw(ImageDraw.Draw(silhouette), self.scale, origin).rounded_rectangle(
+                [0, offset, width, height + offset], radius=radius, fill=255)
+            alpha = silhouette.filter(ImageFilter.GaussianBlur(blur * self.scale))
+            shadow_tile = Image.new('RGBA', body.size, color)
+            shadow_tile.putalpha(alpha.point(lambda a: round(a * opacity)))
+            body = Image.alpha_composite(shadow_tile, body)
+        return body
+
+    def toggle(self, active, size, track_color, knob_color):
+        """A keyword on/off switch: a 2:1 track with an 8px knob at either end"""
+        knob_x = size * 1.5 if active else 5
+        knob_y = size // 2
+        left = min(0, int(knob_x) - 8)
+
+        def paint(draw):
+            draw.rounded_rectangle([0, 0, size * 2, size], radius=size // 2, fill=track_color)
+            draw.ellipse([knob_x - 8, knob_y - 8, knob_x + 8, knob_y + 8], fill=knob_color)
+
+        return self._get(('toggle', active, size, track_color, knob_color), (left, 0),
+                         (size * 2 + 1 - left, size + 1), paint)
@@ -0,0 +1,153 @@
+"""
+Cached text measurement and line layout for the dashboard renderer
+
+Widths come from per-font tables of glyph advances: each character is
+measured once per font size with ``getlength`` and a string's width is the sum
+of its advances, so measuring, wrapping and truncating thousands of strings
+never goes back to FreeType for a full ``textbbox``. Kerning pairs are not
+applied, which makes widths at most a pixel or two wider than the rendered
+text for typical UI strings. Finished layouts are memoized because the same
+titles, tags and labels recur from render to render; both caches are dropped
+when the ``FontRegistry`` is cleared.
+"""
+
+import threading
+from collections import OrderedDict
+
+ELLIPSIS = "..."
+
+# Characters measured up front when a font's advance table is first built
+PRELOADED_CHARS = ''.join(chr(c) for c in range(32, 127))
+
+
+class TextLayout:
+    """Measure, wrap and truncate text for the fonts of a ``FontRegistry``
+
+    Sizes are font pixel sizes and widths are pixels. Safe to share between
+    render threads.
+    """
+
+    def __init__(self, font_registry, maxsize=4096):
+        self.font_registry = font_registry
+        self.maxsize = maxsize
+        self._advances = {}
+        self._layouts = OrderedDict()
+        self._lock = threading.Lock()
+        # FontRegistry.generation the caches were built with
+        self._generation = font_registry.generation
+
+    def _check_fonts(self):
+        if self._generation != self.font_registry.generation:
+            self.clear()
+
+    def _table(self, size):
+        self._check_fonts()
+        table = self._advances.get(size)
+        if table is None:
+            font = self.font_registry.get(size)
+            table = {char: font.getlength(char) for char in PRELOADED_CHARS}
+            with self._lock:
+                table = self._advances.setdefault(size, table)
+        return table
+
+    def width(self, text, size):
+        """Advance width of ``text``, in pixels"""
+        table = self._table(size)
+        try:
+            return sum(table[char] for char in text)
+        except KeyError:
+            pass
+        font = self.font_registry.get(size)
+        missing = {char: font.getlength(char) for char in set(text) if char not in table}
+        with self._lock:
+            table.update(missing)
+        return sum(table[char] for char in text)
+
+    def _memoized(self, key, layout):
+        self._check_fonts()
+        with self._lock:
+            lines = self._layouts.get(key)
+            if lines is not None:
+                self._layouts.move_to_end(key)
+                return lines
+        lines = layout()
+        with self._lock:
+            self._layouts[key] = lines
+            if len(self._layouts) > self.maxsize:
+                self._layouts.popitem(last=False)
+        return lines
+
+    def truncate(self, text, size, max_width, ellipsis=ELLIPSIS):
+        """``text`` cut short with ``ellipsis`` so that it fits in ``max_width``
+
+        When not even ``ellipsis`` fits, as much of it as fits is returned,
+        possibly an empty string.
+        """
+        return self._memoized(('truncate', text, size, max_width, ellipsis),
+                              lambda: self._truncate(text, size, max_width, ellipsis))
+
+    def _truncate(self, text, size, max_width, ellipsis):
+        if self.width(text, size) <= max_width:
+            return text
+        ellipsis_width = self.width(ellipsis, size)
+        if ellipsis_width > max_width:
+            return ellipsis[:self._fitting(ellipsis, size, max_width)]
+        return text[:self._fitting(text, size, max_width - ellipsis_width)].rstrip() + ellipsis
+
+    def _fitting(self, text, size, max_width):
+        """Length of the longest prefix of ``text`` no wider than ``max_width``"""
+        table = self._table(size)
+        used = 0
+        for end, char in enumerate(text):
+            used += table[char]
+            if used > max_width:
+                return end
+        return len(text)
+
+    def wrap(self, text, size, max_width, max_lines=None, ellipsis=ELLIPSIS):
+        """Split ``text`` into lines that fit ``max_width``, breaking between words
+
+        Words wider than a whole line are broken between characters. With
+        ``max_lines`` the last kept line ends in ``ellipsis`` if text was cut.
+        Returns a tuple of lines.
+        """
+        return self._memoized(('wrap', text, size, max_width, max_lines, ellipsis),
+                              lambda: self._wrap(text, size, max_width, max_lines, ellipsis))
+
+    def _wrap(self, text, size, max_width, max_lines, ellipsis):
+        space = self.width(' ', size)
+        # separators[i] rejoins lines[i] and lines[i + 1]: a space, or nothing inside a broken word
+        lines, separators = [], []
+        line, line_width = [], 0
+        for word in text.split():
+            word_width = self.width(word, size)
+            if line and line_width + space + word_width <= max_width:
+                line.append(word)
+                line_width += space + word_width
+                continue
+            if line:
+                lines.append(' '.join(line))
+                separators.append(' ')
+            while word_width > max_width and len(word) > 1:
+                head = word[:max(1, self._fitting(word, size, max_width))]
+                lines.append(head)
+                separators.append('')
+                word = word[len(head):]
+                word_width = self.width(word, size)
+            line, line_width = [word], word_width
+
+        if line:
+            lines.append(' '.join(line))
+        if max_lines is not None and len(lines) > max_lines:
+            last = lines[max_lines - 1]
+            for separator, rest in zip(separators[max_lines - 1:], lines[max_lines:]):
+                last += separator + rest
+            lines = lines[:max_lines - 1] + [self._truncate(last, size, max_width, ellipsis)]
+        return tuple(lines)
+
+    def clear(self):
+        """Drop advance tables and memoized layouts, e.g. after the fonts changed"""
+        with self._lock:
+            self._advances.clear()
+            self._layouts.clear()
+            self._generation = self.font_registry.generation
@@ -0,0 +1,177 @@
+"""
+Render instrumentation for DashboardGenerator
+
+``RenderProfiler`` counts and times the generator's drawing primitives and
+render stages, grouping each call under the section (header, sidebars, main
+content, background, encoding) it ran in. Results export as a
+Chrome trace-event JSON (load it in chrome://tracing or Perfetto) or a flat
+summary table.
+
+Attaching replaces the instrumented methods on one generator instance with
+timing wrappers; detaching removes them again, so an uninstrumented generator
+pays nothing.
+"""
+
+import json
+import os
+import threading
+import time
+
+# Generator methods that open a section; primitive calls are grouped under them
+SECTIONS = {
+    'create_base_image': 'background',
+    'draw_header': 'header',
+    'draw_sidebar_left': 'sidebar_left',
+    'draw_main_content': 'main_content',
+    'draw_sidebar_right': 'sidebar_right',
+    'encode': 'encode',
+}
+
+# Generator methods timed as primitives within a section
+PRIMITIVES = (
+    'draw_keyword_card',
+    'draw_filter_bar',
+    'draw_opportunity_card',
+    'draw_mini_chart',
+    'draw_series',
+    'draw_antialiased',
+    'draw_trending_item',
+    'draw_alert_item',
+    'draw_progress_bar',
+    'draw_tag',
+    'draw_button',
+    'draw_text',
+    'draw_circle',
+    'draw_pen_tool_icon',
+    'draw_icon',
+)
+
+# FontRegistry methods, to tell font loading and text measurement apart from drawing
+FONT_PRIMITIVES = {
+    '_load': 'font_load',
+    'text_bbox': 'text_measure',
+}
+
+# TextLayout methods, to see how much of the text cost is wrapping and truncation
+LAYOUT_PRIMITIVES = {
+    'wrap': 'text_wrap',
+    'truncate': 'text_truncate',
+}
+
+
+class RenderProfiler:
+    """Collect call counts and timings from an instrumented DashboardGenerator"""
+
+    def __init__(self):
+        self.events = []
+        self._origin = time.perf_counter()
+        self._local = threading.local()
+        self._patched = []
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _wrap(self, func, name, section=None):
+        events = self.events
+        stack_for_thread = self._stack
+
+        def wrapper(*args, **kwargs):
+            stack = stack_for_thread()
+            current = section or (stack[-1] if stack else 'other')
+            stack.append(current)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end = time.perf_counter()
+                stack.pop()
+                events.append((name, current, start, end - start, threading.get_ident()))
+
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def _patch(self, obj, attr, name, section=None):
+        setattr(obj, attr, self._wrap(getattr(obj, attr), name, section))
+        self._patched.append((obj, attr))
+
+    def attach(self, generator):
+        """Instrument a generator instance, its font registry and its text layout"""
+        if self._patched:
+            raise RuntimeError("RenderProfiler is already attached")
+        for method, section in SECTIONS.items():
+            self._patch(generator, method, method, section)
+        for method in PRIMITIVES:
+            self._patch(generator, method, method)
+        for method, name in FONT_PRIMITIVES.items():
+            self._patch(generator.font_registry, method, name)
+        for method, name in LAYOUT_PRIMITIVES.items():
+            self._patch(generator.text_layout, method, name)
+        return self
+
+    def detach(self):
+        """Remove the timing wrappers, restoring the original methods"""
+        for obj, attr in reversed(self._patched):
+            delattr(obj, attr)
+        self._patched = []
+
+    def reset(self):
+        """Discard the collected events"""
+        self.events.clear()
+        self._origin = time.perf_counter()
+
+    def summary(self):
+        """Per (section, name) call counts and inclusive times, slowest total first"""
+        totals = {}
+        for name, section, _, duration, _ in self.events:
+            entry = totals.setdefault((section, name), [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += duration
+            entry[2] = max(entry[2], duration)
+        rows = [
+            {
+                'section': section,
+                'name': name,
+                'count': count,
+                'total_ms': total * 1000,
+                'mean_us': total / count * 1e6,
+                'max_us': longest * 1e6,
+            }
+            for (section, name), (count, total, longest) in totals.items()
+        ]
+        return sorted(rows, key=lambda row: row['total_ms'], reverse=True)
+
+    def format_summary(self):
+        """Render ``summary()`` as a fixed-width text table"""
+        lines = [f"{'section':<14} {'name':<22} {'count':>7} {'total ms':>10} {'mean us':>10} {'max us':>10}"]
+        for row in self.summary():
+            lines.append(f"{row['section']:<14} {row['name']:<22} {row['count']:>7} "
+                         f"{row['total_ms']:>10.2f} {row['mean_us']:>10.1f} {row['max_us']:>10.1f}")
+        return '\n'.join(lines)
+
+    def chrome_trace(self):
+        """Events in Chrome trace-event format, as a JSON-serializable dict"""
+        pid = os.getpid()
+        return {
+            'displayTimeUnit': 'ms',
+            'traceEvents': [
+                {
+                    'name': name,
+                    'cat': section,
+                    'ph': 'X',
+                    'ts': (start - self._origin) * 1e6,
+                    'dur': duration * 1e6,
+                    'pid': pid,
+                    'tid': tid,
+                }
+                for name, section, start, duration, tid in self.events
+            ],
+        }
+
+    def write_chrome_trace(self, path):
+        """Write ``chrome_trace()`` to ``path``"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f)
+        return path
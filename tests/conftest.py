@@ -0,0 +1,13 @@
+import os
+import sys
+
+from PIL import ImageChops
+
+# The dashboard modules live at the repository root rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def assert_same_image(a, b):
+    """Assert two images have the same size and RGB pixels, whatever their modes"""
+    assert a.size == b.size
+    assert ImageChops.difference(a.convert('RGB'), b.convert('RGB')).getbbox() is None
@@ -0,0 +1,77 @@
+import os
+
+import pytest
+from PIL import Image, ImageChops, ImageSequence
+
+from dashboard_animation import export_animation, main, render_frames
+from dashboard_generator import DEFAULT_ALERTS, DashboardGenerator, indexed_palette
+
+SNAPSHOTS = [
+    {'seed': 1},
+    {'seed': 2},
+    {'seed': 2},
+    {'seed': 2, 'alerts': DEFAULT_ALERTS[:1]},
+]
+
+
+def read_frames(path):
+    frames, durations = [], []
+    with Image.open(path) as im:
+        # One forward pass: Pillow loses the palette of indexed APNG frames when seeking back
+        for frame in ImageSequence.Iterator(im):
+            frames.append(frame.convert('RGB'))
+            durations.append(int(frame.info['duration']))
+    return frames, durations
+
+
+def expected_frames(gif=False, **options):
+    generator = DashboardGenerator(verbose=False, seed=0, **options)
+    frames = [frame.copy() for frame in render_frames(generator, SNAPSHOTS)]
+    if gif:
+        palette = generator.palette_image or indexed_palette(generator.palette)
+        frames = [f if f.mode == 'P' else f.quantize(palette=palette, dither=Image.Dither.NONE) for f in frames]
+    return [frame.convert('RGB') for frame in frames]
+
+
+@pytest.mark.parametrize('fmt', ['apng', 'gif'])
+@pytest.mark.parametrize('indexed', [False, True])
+def test_streamed_frames_round_trip(tmp_path, fmt, indexed):
+    path = str(tmp_path / f"preview.{fmt}")
+    generator = DashboardGenerator(verbose=False, seed=0, indexed=indexed)
+    stats = export_animation(generator, iter(SNAPSHOTS), path, fmt, duration=40)
+    assert stats['frames'] == 4 and stats['stored_frames'] == 3
+
+    frames, durations = read_frames(path)
+    expected = expected_frames(gif=fmt == 'gif', indexed=indexed)
+    # The unchanged third frame is merged into the second
+    del expected[2]
+    assert durations == [40, 80, 40]
+    assert len(frames) == len(expected)
+    for got, want in zip(frames, expected):
+        assert ImageChops.difference(got, want).getbbox() is None
+
+
+def test_frames_are_written_while_rendering(tmp_path):
+    path = str(tmp_path / 'preview.gif')
+    sizes = []
+
+    def snapshots():
+        for i in range(4):
+            yield {'seed': i}
+            sizes.append(os.path.getsize(path))
+
+    export_animation(DashboardGenerator(verbose=False), snapshots(), path, 'gif')
+    # The first frame is on disk once the second, different frame has been rendered
+    assert sizes[1] > 10000
+
+
+def test_no_snapshots(tmp_path, capsys):
+    with pytest.raises(ValueError):
+        export_animation(DashboardGenerator(verbose=False), [], str(tmp_path / 'a.png'))
+
+    specs = tmp_path / 'empty.jsonl'
+    specs.write_text('')
+    output = tmp_path / 'out.png'
+    assert main(['--specs', str(specs), '--output', str(output)]) == 1
+    assert 'No snapshots' in capsys.readouterr().err
+    assert not output.exists()
@@ -0,0 +1,155 @@
+import json
+import os
+
+import pytest
+from PIL import Image
+
+import dashboard_batch
+from conftest import assert_same_image
+from dashboard_batch import (MAX_SPEC_SCALE, GeneratorPool, SharedChrome, main, render_batch, render_tenants,
+                             spec_options)
+from dashboard_generator import DashboardGenerator
+
+SPECS = [
+    {'id': 'plain', 'user': {'name': 'Ada', 'plan': 'Free Plan'}},
+    {'id': 'branded', 'colors': {'primary': '#0a7f5a'}, 'seed': 3},
+    {'id': 'hidpi', 'scale': 2, 'alerts': []},
+]
+
+
+def expected_image(spec):
+    generator = DashboardGenerator(verbose=False, seed=spec.get('seed', 0), scale=spec.get('scale', 1))
+    if spec.get('colors'):
+        generator.set_colors(**spec['colors'])
+    return generator.render(spec)
+
+
+def shm_segments():
+    return set(os.listdir('/dev/shm')) if os.path.isdir('/dev/shm') else set()
+
+
+@pytest.fixture
+def spec_file(tmp_path):
+    path = tmp_path / 'specs.jsonl'
+    lines = [json.dumps(spec) for spec in SPECS] + ['{not json', '[1, 2]',
+                                                     json.dumps({'id': 'bad-color', 'colors': {'primary': 'nope'}})]
+    path.write_text('\n'.join(lines) + '\n')
+    return path
+
+
+def test_batch_applies_seed_colors_and_scale(spec_file, tmp_path):
+    result = render_batch(str(spec_file), str(tmp_path / 'out'), workers=1)
+    assert sorted(result['rendered']) == ['branded', 'hidpi', 'plain']
+    assert sorted(result['failures']) == ['bad-color', 'line-4', 'line-5']
+    for spec in SPECS:
+        with Image.open(result['rendered'][spec['id']]) as image:
+            assert_same_image(image, expected_image(spec))
+
+
+def test_tenants_match_batch(spec_file, tmp_path):
+    before = shm_segments()
+    batch = render_batch(str(spec_file), str(tmp_path / 'batch'), workers=1)
+    specs = SPECS + [{'id': 'bad-color', 'colors': {'primary': 'nope'}}]
+    tenants = render_tenants(iter(specs), str(tmp_path / 'tenants'), workers=2)
+    assert sorted(tenants['rendered']) == sorted(batch['rendered'])
+    assert list(tenants['failures']) == ['bad-color']
+    assert tenants['chrome_layers'] == 3
+    for job_id, path in tenants['rendered'].items():
+        with Image.open(path) as tenant, Image.open(batch['rendered'][job_id]) as single:
+            assert_same_image(tenant, single)
+    assert shm_segments() <= before
+
+
+def test_tenants_stream_their_specs(tmp_path):
+    out_dir = tmp_path / 'out'
+    written_before_last = []
+
+    def specs():
+        for index in range(6):
+            if index == 5:
+                written_before_last.append(len(os.listdir(out_dir)))
+            yield {'id': f"user-{index}", 'user': {'name': f"User {index}", 'plan': 'Free Plan'}}
+
+    result = render_tenants(specs(), str(out_dir), workers=1, max_pending=2, encoder='png-fast')
+    assert len(result['rendered']) == 6
+    # Jobs were rendered while later specs were still unread
+    assert written_before_last[0] >= 3
+
+
+def test_shared_chrome_refuses_cache_dir(spec_file, tmp_path):
+    with pytest.raises(SystemExit) as exit_info:
+        main([str(spec_file), '--shared-chrome', '--cache-dir', str(tmp_path / 'cache')])
+    assert exit_info.value.code == 2
+
+
+def test_shared_chrome_cli_reports_read_failures(spec_file, tmp_path, capsys):
+    assert main([str(spec_file), '--shared-chrome', '--out-dir', str(tmp_path / 'out'), '--workers', '1']) == 1
+    err = capsys.readouterr().err
+    assert 'FAILED line-4' in err and 'FAILED line-5' in err and 'FAILED bad-color' in err
+    assert sorted(os.listdir(tmp_path / 'out')) == ['branded.png', 'hidpi.png', 'plain.png']
+
+
+def test_generator_pool_drops_least_recently_used():
+    pool = GeneratorPool(maxsize=2, colors={'primary': '#111111'})
+    first = pool.get()
+    assert first.colors['primary'] == '#111111'
+    second = pool.get(colors={'primary': '#222222'})
+    assert pool.get() is first
+    pool.get(scale=2)
+    assert pool.get() is first
+    assert pool.get(colors={'primary': '#222222'}) is not second
+    with pytest.raises(ValueError):
+        pool.get(colors={'primary': 'nope'})
+    pool.close()
+
+
+def test_shared_chrome_unlinks_unreferenced_layers():
+    before = shm_segments()
+    with SharedChrome() as chrome:
+        key = chrome.publish()
+        assert chrome.publish() == key
+        name = chrome.layers[key]['name'].lstrip('/')
+        chrome.release(key)
+        assert key in chrome.layers
+        chrome.release(key)
+        assert chrome.layers == {}
+        assert chrome.published == 1 and chrome.peak_nbytes > 0
+        assert name not in shm_segments()
+        assert chrome.publish() == key
+        assert chrome.published == 2
+    assert shm_segments() <= before
+
+
+def test_workers_keep_few_layers_mapped(monkeypatch):
+    monkeypatch.setattr(dashboard_batch, 'MAX_ATTACHED_LAYERS', 2)
+    with SharedChrome() as chrome:
+        keys = [chrome.publish(colors={'primary': color}) for color in ('#111111', '#222222', '#333333')]
+        try:
+            for key in keys:
+                dashboard_batch._attach_layer(chrome.layers[key])
+            assert list(dashboard_batch._tenant_layers) == [chrome.layers[key]['name'] for key in keys[1:]]
+        finally:
+            dashboard_batch._close_tenant_layers()
+
+
+def test_tenants_hold_only_layers_in_flight(tmp_path):
+    specs = ({'id': f"brand-{index}", 'colors': {'primary': f"#0000{index:02x}"}} for index in range(4))
+    result = render_tenants(specs, str(tmp_path / 'out'), workers=1, max_pending=1, encoder='png-fast')
+    assert len(result['rendered']) == 4
+    assert result['chrome_layers'] == 4
+    assert result['chrome_bytes'] == 1920 * 1080 * 3
+
+
+@pytest.mark.parametrize('spec, message', [
+    ({'scale': 0}, 'scale'), ({'scale': 2.0}, 'scale'), ({'scale': MAX_SPEC_SCALE + 1}, 'scale'),
+    ({'colors': 'blue'}, 'colors'), ({'colors': {'primary': 5}}, 'colors'), ({'colors': {'primary': 'nope'}}, 'colors'),
+])
+def test_spec_options_rejects_unusable_values(spec, message):
+    with pytest.raises(ValueError, match=message):
+        spec_options(spec)
+
+
+def test_spec_options_defaults():
+    assert spec_options({}) == (1, {})
+    assert spec_options({}, default_scale=2) == (2, {})
+    assert spec_options({'scale': 3, 'colors': {'primary': '#fff'}}) == (3, {'primary': '#fff'})
@@ -0,0 +1,81 @@
+import os
+
+from dashboard_cache import DiskRenderCache
+from dashboard_generator import DashboardGenerator
+
+
+def disk_bytes(directory):
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, files in os.walk(directory) for name in files)
+
+
+def test_get_returns_bytes_and_counts_misses(tmp_path):
+    cache = DiskRenderCache(str(tmp_path))
+    assert cache.get('ab12', '.png') is None
+    cache.put('ab12', '.png', b'image')
+    assert cache.get('ab12', '.png') == b'image'
+    assert (cache.hits, cache.misses, cache.writes) == (1, 1, 1)
+
+
+def test_evicted_entry_is_a_miss(tmp_path):
+    cache = DiskRenderCache(str(tmp_path))
+    os.unlink(cache.put('ab12', '.png', b'image'))
+    assert cache.get('ab12', '.png') is None
+
+
+def test_overwrite_is_not_counted_twice(tmp_path):
+    cache = DiskRenderCache(str(tmp_path), max_bytes=1000)
+    cache.put('k0', '.png', b'x' * 100)
+    for _ in range(50):
+        cache.put('k1', '.png', b'x' * 400)
+    assert cache._size == 500 == disk_bytes(tmp_path)
+    assert cache.evictions == 0
+
+
+def test_eviction_trims_least_recently_used_to_low_water(tmp_path):
+    cache = DiskRenderCache(str(tmp_path), max_bytes=1000, low_water=0.5)
+    for i in range(10):
+        path = cache.put(f"k{i}", '.png', b'x' * 100)
+        os.utime(path, (i, i))
+    # Reading k0 makes it the most recently used
+    assert cache.get('k0', '.png') is not None
+    cache.put('k10', '.png', b'x' * 100)
+    kept = sorted(name for _, _, files in os.walk(tmp_path) for name in files)
+    assert disk_bytes(tmp_path) == 500
+    assert kept == ['k0.png', 'k10.png', 'k7.png', 'k8.png', 'k9.png']
+
+
+def test_eviction_does_not_run_on_every_write(tmp_path, monkeypatch):
+    cache = DiskRenderCache(str(tmp_path), max_bytes=10000)
+    walks = []
+    entries = cache._entries
+    monkeypatch.setattr(cache, '_entries', lambda: walks.append(1) or entries())
+    for i in range(200):
+        cache.put(f"k{i:03d}", '.png', b'x' * 100)
+    assert disk_bytes(tmp_path) <= 10000
+    # The size is re-read about once per 10% of the budget written, not per write
+    assert len(walks) <= 30
+
+
+def test_concurrent_writers_stay_near_budget(tmp_path):
+    budget = 10000
+    caches = [DiskRenderCache(str(tmp_path), max_bytes=budget) for _ in range(4)]
+    peak = 0
+    for i in range(400):
+        caches[i % 4].put(f"k{i:03d}", '.png', b'x' * 100)
+        peak = max(peak, disk_bytes(tmp_path))
+    # Each writer adds at most the budget's headroom before it re-reads the real size
+    assert peak <= budget + 4 * (budget - caches[0].low_water_bytes)
+    assert disk_bytes(tmp_path) <= budget + 4 * 1000
+
+
+def test_generator_falls_back_to_rendering_when_cached_file_vanishes(tmp_path):
+    generator = DashboardGenerator(verbose=False, seed=1, cache_dir=str(tmp_path))
+    first = generator.generate_dashboard(None)
+    assert generator.generate_dashboard(None) == first
+    assert generator.last_encode['cached']
+    for root, _, files in os.walk(tmp_path):
+        for name in files:
+            os.unlink(os.path.join(root, name))
+    assert generator.generate_dashboard(None) == first
+    assert not generator.last_encode['cached']
@@ -0,0 +1,119 @@
+import io
+import json
+import socket
+import threading
+
+import pytest
+from PIL import Image
+
+from conftest import assert_same_image
+from dashboard_client import MAX_MESSAGE_BYTES, DaemonError, RenderClient, read_message, send_message
+from dashboard_daemon import RenderDaemon, make_server
+from dashboard_generator import DashboardGenerator
+
+
+@pytest.fixture(scope='module')
+def daemon(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('daemon') / 'render.sock')
+    service = RenderDaemon(queue_size=4, submit_timeout=1.0)
+    server = make_server(path, service)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield path, service
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def raw_exchange(path, payload):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(30)
+        conn.connect(path)
+        conn.sendall(payload)
+        conn.shutdown(socket.SHUT_WR)
+        return read_message(conn.makefile('rb'))[0]
+
+
+def test_message_round_trip():
+    stream = io.BytesIO()
+    send_message(stream, {'ok': True}, b'\x00image')
+    send_message(stream, {'command': 'status'})
+    stream.seek(0)
+    assert read_message(stream) == ({'ok': True, 'size': 6}, b'\x00image')
+    assert read_message(stream) == ({'command': 'status'}, None)
+    assert read_message(stream) == (None, None)
+
+
+@pytest.mark.parametrize('size', [-1, 1.5, '4', True, MAX_MESSAGE_BYTES + 1])
+def test_read_message_rejects_bad_sizes(size):
+    stream = io.BytesIO(json.dumps({'size': size}).encode() + b'\nabcd')
+    with pytest.raises(ValueError):
+        read_message(stream)
+
+
+def test_read_message_rejects_short_data():
+    with pytest.raises(ConnectionError):
+        read_message(io.BytesIO(b'{"size": 10}\nabc'))
+
+
+def test_render_and_status(daemon):
+    path, _ = daemon
+    with RenderClient(path) as client:
+        data = client.render({'seed': 1})
+        assert Image.open(io.BytesIO(data)).size == (1920, 1080)
+        assert client.render({'seed': 1}) == data
+        assert client.status()['completed'] >= 2
+
+
+@pytest.mark.parametrize('payload', [b'not json\n', b'[1, 2]\n', b'\xff\xfe\n', b'{"size": -5}\n'])
+def test_bad_requests_are_answered(daemon, payload):
+    response = raw_exchange(daemon[0], payload)
+    assert response['ok'] is False
+    assert response['error'].startswith('bad request')
+
+
+def test_unknown_command_and_bad_spec(daemon):
+    with RenderClient(daemon[0]) as client:
+        with pytest.raises(DaemonError, match='unknown command'):
+            client.request({'command': 'explode'})
+        with pytest.raises(DaemonError, match='spec must be an object'):
+            client.request({'command': 'render', 'spec': [1]})
+        with pytest.raises(DaemonError, match='Unknown encoder'):
+            client.render({}, encoder='tiff')
+        # The connection is still usable after refused requests
+        assert client.status()['ok'] is True
+
+
+@pytest.mark.parametrize('colors', [{'primary': 'not-a-color'}, {'primary': 7}, ['#fff']])
+def test_reload_refuses_invalid_colors(daemon, colors):
+    path, service = daemon
+    before = dict(service.colors)
+    with RenderClient(path) as client:
+        with pytest.raises(DaemonError, match='invalid colors'):
+            client.request({'command': 'reload', 'colors': colors})
+        assert service.colors == before
+        assert client.render({}, encoder='png-fast')
+
+
+def test_reload_applies_valid_colors(daemon):
+    path, service = daemon
+    with RenderClient(path) as client:
+        generation = client.status()['generation']
+        assert client.reload({'primary': '#123456'})['ok'] is True
+        client.render({}, encoder='png-fast')
+        assert client.status()['generation'] == generation + 1
+    assert service.colors['primary'] == '#123456'
+
+
+def test_spec_colors_and_scale_are_applied(daemon):
+    spec = {'colors': {'primary': '#0a7f5a'}, 'seed': 4}
+    with RenderClient(daemon[0]) as client:
+        data = client.render(spec)
+        with pytest.raises(DaemonError, match='colors'):
+            client.render({'colors': {'primary': 'nope'}})
+        with pytest.raises(DaemonError, match='scale'):
+            client.render({'scale': 0})
+        assert Image.open(io.BytesIO(client.render({'scale': 2}, encoder='png-fast'))).size == (3840, 2160)
+    generator = DashboardGenerator(verbose=False, seed=4)
+    generator.set_colors(**dict(daemon[1].colors, primary='#0a7f5a'))
+    assert_same_image(Image.open(io.BytesIO(data)), generator.render(spec))
@@ -0,0 +1,97 @@
+import io
+import json
+
+import pytest
+
+from dashboard_data import (Alert, DashboardData, Keyword, KeywordCategory, Opportunity, Record, group_keywords,
+                            iter_json, iter_records)
+
+
+def test_convex_scores_are_fractions():
+    assert Opportunity.from_dict({'title': 't', 'finalScore': 0.87}).relevance == 87
+    # A Convex score of 1.0 arrives as the JSON integer 1
+    assert Opportunity.from_dict({'title': 't', 'finalScore': 1}).relevance == 100
+    assert Keyword.from_dict({'term': 'k', 'weight': 1}).weight == 100
+    assert Keyword.from_dict({'term': 'k', 'weight': 0.5}).weight == 50
+
+
+def test_legacy_scores_are_percentages():
+    assert Opportunity.from_dict({'title': 't', 'relevance': 1}).relevance == 1
+    assert Opportunity.from_dict({'title': 't', 'relevance': 95}).relevance == 95
+    category = KeywordCategory.from_dict({'name': 'Products', 'keywords': [{'term': 'k', 'weight': 1}]})
+    assert category.keywords[0].weight == 1
+
+
+def test_scores_are_clamped():
+    assert Opportunity.from_dict({'title': 't', 'finalScore': 1.7}).relevance == 100
+    assert Opportunity.from_dict({'title': 't', 'relevance': -5}).relevance == 0
+
+
+class Point(Record):
+    __slots__ = ('x', 'y')
+
+    def __init__(self, x, y=0):
+        self.x = x
+        self.y = y
+
+
+def test_record_from_dict_inverts_to_dict():
+    point = Point(1, 2)
+    assert Point.from_dict(point.to_dict()) == point
+    assert Point.from_dict({'x': 3, 'ignored': True}) == Point(3)
+    assert Point.coerce(point) is point
+    alert = Alert('Breaking', '5 min ago', 'high')
+    assert Alert.coerce(alert.to_dict()) == alert
+
+
+def test_group_keywords_accepts_flat_and_grouped_entries():
+    groups = group_keywords([
+        {'term': 'a', 'weight': 0.5, 'category': 'products'},
+        {'name': 'Products', 'keywords': [{'term': 'b', 'weight': 40}]},
+        {'term': 'c', 'weight': 0.1, 'category': 'values'},
+    ])
+    assert [(g.name, [k.term for k in g.keywords]) for g in groups] == [('Products', ['a', 'b']),
+                                                                        ('Brand Values', ['c'])]
+
+
+def test_iter_records_skips_dismissed_and_stops_at_limit():
+    items = [{'title': str(i), 'isDismissed': i % 2 == 0} for i in range(10)]
+    assert [r.title for r in iter_records(items, Opportunity, limit=3)] == ['1', '3', '5']
+
+
+ITEMS = [{'n': i, 'title': 'x' * (i % 7), 'nested': [i, {'v': i / 3}]} for i in range(40)] + [12345, -0.5, "s]"]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64, 65536])
+def test_iter_json_array_across_chunk_boundaries(chunk_size):
+    text = ' \n [ ' + ' , '.join(json.dumps(item) for item in ITEMS) + ' ]\n'
+    assert list(iter_json(io.StringIO(text), chunk_size)) == ITEMS
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 65536])
+def test_iter_json_ndjson_across_chunk_boundaries(chunk_size):
+    text = '\n'.join(json.dumps(item) for item in ITEMS) + '\n\n'
+    assert list(iter_json(io.StringIO(text), chunk_size)) == ITEMS
+
+
+def test_iter_json_number_at_buffer_end_is_not_truncated():
+    # The first chunk ends inside 123456
+    assert list(iter_json(io.StringIO('[1, 123456]'), 8)) == [1, 123456]
+
+
+def test_iter_json_truncated_array_raises():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json(io.StringIO('[{"a": 1}, {"b": '), 4))
+
+
+def test_iter_json_reads_lazily():
+    stream = io.StringIO('[' + ','.join(['{"a": 1}'] * 1000) + ']')
+    first = next(iter_json(stream, 16))
+    assert first == {'a': 1}
+    assert stream.tell() < 100
+
+
+def test_dashboard_data_coerce():
+    assert DashboardData.coerce(None).opportunities is None
+    data = DashboardData.coerce({'alerts': [], 'unknown': 1})
+    assert data.alerts == [] and data.user is None
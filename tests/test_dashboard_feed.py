@@ -0,0 +1,56 @@
+import io
+
+import pytest
+from PIL import Image, ImageChops
+
+from conftest import assert_same_image
+from dashboard_feed import PngStreamWriter, draw_feed_strip, feed_size, render_feed
+from dashboard_data import Opportunity, iter_records
+from dashboard_fixtures import synthetic_spec
+from dashboard_generator import DashboardGenerator
+
+
+@pytest.fixture(scope='module')
+def generator():
+    generator = DashboardGenerator(verbose=False, seed=3)
+    yield generator
+    generator.close()
+
+
+def test_png_stream_round_trip():
+    image = Image.effect_noise((37, 29), 64).convert('RGB')
+    buffer = io.BytesIO()
+    writer = PngStreamWriter(buffer, 37, 29, chunk_size=64)
+    for top, bottom in ((0, 5), (5, 6), (6, 20), (20, 29)):
+        writer.write_rows(image.crop((0, top, 37, bottom)))
+    writer.close()
+    assert writer.bytes_written == len(buffer.getvalue())
+    decoded = Image.open(io.BytesIO(buffer.getvalue()))
+    assert decoded.mode == 'RGB'
+    assert ImageChops.difference(decoded, image).getbbox() is None
+
+
+def test_png_stream_checks_rows():
+    writer = PngStreamWriter(io.BytesIO(), 10, 4)
+    with pytest.raises(ValueError):
+        writer.write_rows(Image.new('RGB', (9, 2)))
+    writer.write_rows(Image.new('RGB', (10, 2)))
+    with pytest.raises(ValueError):
+        writer.write_rows(Image.new('RGB', (10, 3)))
+    with pytest.raises(ValueError):
+        writer.close()
+
+
+@pytest.mark.parametrize('strip_height', [7, 97, 230])
+def test_strip_seams_match_one_strip(generator, tmp_path, strip_height):
+    opportunities = synthetic_spec(5, 8)['opportunities']
+    records = list(iter_records(opportunities, Opportunity))
+    records.sort(key=lambda record: record.relevance, reverse=True)
+    _, height = feed_size(generator, len(records))
+    whole = draw_feed_strip(generator, records, 0, height, len(records))
+
+    output = tmp_path / 'feed.png'
+    stats = render_feed(generator, opportunities, output, strip_height=strip_height)
+    assert stats['strips'] == -(-height // strip_height)
+    with Image.open(output) as feed:
+        assert_same_image(feed, whole)
@@ -0,0 +1,99 @@
+import os
+
+from dashboard_generator import FontRegistry
+
+
+def touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b'')
+    return str(path)
+
+
+def count_loads(registry, monkeypatch):
+    loaded = []
+    load = registry._load
+
+    def counting(size):
+        loaded.append(size)
+        return load(size)
+
+    monkeypatch.setattr(registry, '_load', counting)
+    return loaded
+
+
+def test_fonts_load_once_per_size(monkeypatch):
+    registry = FontRegistry()
+    loaded = count_loads(registry, monkeypatch)
+    font = registry.get(14)
+    assert registry.get(14) is font
+    registry.get(20)
+    registry.text_size("Hello", 14)
+    registry.text_width("Hello", 20)
+    assert loaded == [14, 20]
+
+
+def test_font_cache_is_bounded_lru(monkeypatch):
+    registry = FontRegistry(maxsize=2)
+    loaded = count_loads(registry, monkeypatch)
+    registry.get(10)
+    registry.get(11)
+    registry.get(10)
+    # 11 is the least recently used and makes room for 12
+    registry.get(12)
+    assert list(registry._fonts) == [10, 12]
+    registry.get(10)
+    registry.get(11)
+    assert loaded == [10, 11, 12, 11]
+
+
+def test_metrics_cache_is_bounded():
+    registry = FontRegistry(metrics_maxsize=3)
+    for word in ("one", "two", "three", "four"):
+        registry.text_bbox(word, 14)
+    assert [text for text, _ in registry._metrics] == ["two", "three", "four"]
+
+
+def test_search_paths_resolve_in_order(tmp_path):
+    first, second = tmp_path / 'first', tmp_path / 'second'
+    touch(first / 'B.ttf')
+    later = touch(second / 'A.ttf')
+    registry = FontRegistry(font_names=['A.ttf', 'B.ttf'], search_paths=[str(first), str(second)])
+    # Font names take priority over directories
+    assert registry.font_path == later
+    # The path is resolved once, until clear()
+    earlier = touch(first / 'A.ttf')
+    assert registry.font_path == later
+    registry.clear()
+    assert registry.font_path == earlier
+
+
+def test_absolute_font_name(tmp_path):
+    path = touch(tmp_path / 'Custom.ttf')
+    assert FontRegistry(font_names=[path], search_paths=[]).font_path == path
+
+
+def test_environment_search_paths_come_first(tmp_path, monkeypatch):
+    extra, missing = tmp_path / 'extra', tmp_path / 'missing'
+    path = touch(extra / 'DejaVuSans.ttf')
+    monkeypatch.setenv('SOCIAL_WRITER_FONT_PATH', os.pathsep.join([str(missing), '', str(extra)]))
+    registry = FontRegistry()
+    assert registry.search_paths[:2] == (str(missing), str(extra))
+    assert registry.font_path == path
+    # Explicit search paths ignore the environment
+    assert FontRegistry(search_paths=[str(missing)]).font_path is None
+
+
+def test_missing_font_falls_back_to_default(tmp_path):
+    registry = FontRegistry(font_names=['Missing.ttf'], search_paths=[str(tmp_path)])
+    assert registry.font_path is None
+    font = registry.get(14)
+    assert font.getbbox("Hello")[2] > 0
+    assert registry.text_width("Hello", 14) > 0
+
+
+def test_unreadable_font_falls_back_to_default(tmp_path):
+    registry = FontRegistry(font_names=['Broken.ttf'], search_paths=[str(tmp_path)])
+    touch(tmp_path / 'Broken.ttf')
+    assert registry.font_path is not None
+    assert registry.text_width("Hello", 14) > 0
+
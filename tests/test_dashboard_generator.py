@@ -0,0 +1,172 @@
+import io
+
+import pytest
+from PIL import Image, ImageChops, ImageStat
+
+from conftest import assert_same_image
+from dashboard_fixtures import synthetic_spec
+from dashboard_generator import (DEFAULT_ALERTS, ENCODER_PROFILES, PANELS, DashboardGenerator, compare_encoders,
+                                 encode_image)
+
+
+@pytest.fixture
+def generator():
+    generator = DashboardGenerator(verbose=False, seed=7)
+    yield generator
+    generator.close()
+
+
+def count_panel_renders(generator, monkeypatch):
+    rendered = []
+    render_panel = generator.render_panel
+
+    def counting(panel, inputs, base=None):
+        rendered.append(panel)
+        return render_panel(panel, inputs, base)
+
+    monkeypatch.setattr(generator, 'render_panel', counting)
+    return rendered
+
+
+def test_update_matches_full_render(generator):
+    assert_same_image(generator.update(), generator.render())
+
+
+def test_update_redraws_only_changed_panels(generator, monkeypatch):
+    rendered = count_panel_renders(generator, monkeypatch)
+    generator.update()
+    assert rendered == list(PANELS)
+
+    rendered.clear()
+    generator.update()
+    assert rendered == []
+
+    rendered.clear()
+    alerts = [{'title': 'Only alert', 'time': 'now', 'urgency': 'high'}]
+    frame = generator.update(alerts=alerts)
+    assert rendered == ['sidebar_right']
+    assert_same_image(frame, generator.render({'alerts': alerts}))
+
+    # Switching back is served from the layer cache
+    rendered.clear()
+    generator.update(alerts=DEFAULT_ALERTS)
+    assert rendered == []
+
+
+def test_update_keeps_lazy_sections_for_later_updates(generator):
+    opportunities = ({'title': f"Story {i}", 'finalScore': 0.5} for i in range(3))
+    keywords = ({'term': f"Term {i}", 'weight': 0.5, 'category': 'industry', 'active': True} for i in range(4))
+    first = generator.update(opportunities=opportunities, keywords=keywords)
+    # The generators are exhausted; the materialized records are reused
+    second = generator.update(alerts=DEFAULT_ALERTS)
+    assert_same_image(first, second)
+    third = generator.update(user={'name': 'Ada', 'plan': 'Free Plan'})
+    assert_same_image(third.crop((0, 81, 1920, 1080)), first.crop((0, 81, 1920, 1080)))
+    assert_same_image(generator.update(alerts=[]).crop((0, 0, 1620, 1080)), third.crop((0, 0, 1620, 1080)))
+
+
+def test_update_rejects_unknown_sections(generator):
+    with pytest.raises(TypeError):
+        generator.update(colours={})
+
+
+@pytest.mark.parametrize('options', [{}, {'indexed': True}, {'scale': 2}])
+def test_threaded_render_matches_serial(options):
+    spec = synthetic_spec(20, 5)
+    serial = DashboardGenerator(verbose=False, seed=3, **options)
+    threaded = DashboardGenerator(verbose=False, seed=3, workers=3, **options)
+    try:
+        assert_same_image(serial.render(spec), threaded.render(spec))
+        assert_same_image(serial.render(), threaded.render())
+    finally:
+        threaded.close()
+
+
+@pytest.mark.parametrize('profile', sorted(ENCODER_PROFILES))
+def test_encode_image_profiles(profile):
+    img = Image.new('RGBA', (64, 32), (20, 120, 200, 255))
+    data, stats = encode_image(img, profile)
+    settings = ENCODER_PROFILES[profile]
+    decoded = Image.open(io.BytesIO(data))
+    assert decoded.format == settings['format']
+    assert decoded.size == img.size
+    assert stats['profile'] == profile
+    assert stats['format'] == settings['format']
+    assert stats['bytes'] == len(data)
+    assert stats['seconds'] >= 0
+
+
+def test_encode_image_rejects_unknown_profile():
+    with pytest.raises(ValueError, match='Unknown encoder profile'):
+        encode_image(Image.new('RGB', (8, 8)), 'tiff')
+
+
+def test_compare_encoders_fastest_first():
+    img = Image.new('RGB', (64, 32), (200, 40, 40))
+    stats = compare_encoders(img)
+    assert sorted(s['profile'] for s in stats) == sorted(ENCODER_PROFILES)
+    assert [s['seconds'] for s in stats] == sorted(s['seconds'] for s in stats)
+    assert [s['profile'] for s in compare_encoders(img, ['png-fast'])] == ['png-fast']
+
+
+def test_generate_dashboard_outputs(generator, tmp_path):
+    data = generator.generate_dashboard(None, encoder='png-fast')
+    assert isinstance(data, bytes)
+    assert generator.last_encode['bytes'] == len(data)
+    assert generator.last_encode['cached'] is False
+    assert_same_image(Image.open(io.BytesIO(data)), generator.render())
+
+    stream = io.BytesIO()
+    assert generator.generate_dashboard(stream, encoder='png-fast') is stream
+    assert stream.getvalue() == data
+
+    path = tmp_path / 'dashboard.png'
+    assert generator.generate_dashboard(str(path), encoder='png-fast') == str(path)
+    assert path.read_bytes() == data
+
+    with pytest.raises(ValueError, match='Unknown encoder profile'):
+        generator.generate_dashboard(None, encoder='tiff')
+
+
+def test_generate_dashboard_jpeg_from_indexed_frames():
+    generator = DashboardGenerator(verbose=False, seed=7, indexed=True)
+    assert generator.render().mode == 'P'
+    img = Image.open(io.BytesIO(generator.generate_dashboard(None, encoder='jpeg')))
+    assert img.format == 'JPEG'
+    assert img.mode == 'RGB'
+    assert img.size == generator.pixel_size
+
+
+def test_render_pyramid_levels(generator):
+    levels = generator.render_pyramid(widths=(240, 960, 480, 4000))
+    assert sorted(levels) == [240, 480, 960, 1920]
+    for width, img in levels.items():
+        assert img.width == width
+        assert img.height == round(1080 * width / 1920)
+        assert img.mode == 'RGB'
+    odd = generator.render_pyramid(widths=(700,))[700]
+    assert odd.size == (700, round(1080 * 700 / 1920))
+
+
+def test_generate_thumbnails_writes_each_level(generator, tmp_path):
+    prefix = str(tmp_path / 'board')
+    paths = generator.generate_thumbnails(prefix, encoder='webp', widths=(480, 240))
+    assert paths == {1920: prefix + '.webp', 480: prefix + '-480w.webp', 240: prefix + '-240w.webp'}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['board-240w.webp', 'board-480w.webp', 'board.webp']
+    for width, path in paths.items():
+        with Image.open(path) as img:
+            assert img.format == 'WEBP'
+            assert img.width == width
+
+
+def test_scale_two_downsamples_to_scale_one():
+    spec = synthetic_spec(10, 2)
+    single = DashboardGenerator(verbose=False, seed=3).render(spec).convert('RGB')
+    double = DashboardGenerator(verbose=False, seed=3, scale=2).render(spec).convert('RGB')
+    assert double.size == (3840, 2160)
+    difference = ImageChops.difference(double.reduce(2), single).convert('L')
+    # Glyph and shape edges land on different subpixels, but layout and colors agree:
+    # a different spec at the same size scores about 3.7 and 2.9% here
+    histogram = difference.histogram()
+    assert ImageStat.Stat(difference).mean[0] < 2.5
+    assert sum(histogram[64:]) / sum(histogram) < 0.02
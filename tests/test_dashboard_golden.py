@@ -0,0 +1,94 @@
+import pytest
+from PIL import Image
+
+from dashboard_golden import check_case, compare_images, heatmap, perceptual_delta
+
+np = pytest.importorskip('numpy')
+
+
+def image(pixels):
+    return Image.fromarray(np.array(pixels, dtype=np.uint8), 'RGB')
+
+
+@pytest.fixture
+def expected():
+    return image(np.full((4, 5, 3), 128))
+
+
+def test_perceptual_delta_range():
+    black, white = np.zeros((1, 1, 3)), np.full((1, 1, 3), 255)
+    assert 0.95 < perceptual_delta(black, white)[0, 0] <= 1
+    assert perceptual_delta(white, white)[0, 0] == 0
+    corners = np.array([[[r, g, b] for r in (0, 255) for g in (0, 255) for b in (0, 255)]])
+    for corner in corners[0]:
+        assert perceptual_delta(corners, np.broadcast_to(corner, corners.shape)).max() <= 1
+    # Green moves luma the most, blue the least
+    green, blue = np.array([[[0, 255, 0]]]), np.array([[[0, 0, 255]]])
+    assert perceptual_delta(black, green)[0, 0] > perceptual_delta(black, blue)[0, 0]
+
+
+def test_identical_images(expected):
+    stats, delta = compare_images(expected, expected.copy())
+    assert stats == {'differing_pixels': 0, 'differing_ratio': 0.0, 'max_delta': 0.0, 'max_channel_diff': 0}
+    assert delta.shape == (4, 5)
+
+
+def test_size_mismatch(expected):
+    stats, delta = compare_images(expected, expected.resize((5, 5)))
+    assert stats == {'size_mismatch': [(5, 4), (5, 5)]}
+    assert delta is None
+
+
+def test_differences_above_threshold_are_counted(expected):
+    pixels = np.array(expected)
+    pixels[0, 0] = (255, 0, 0)
+    # Off by one: visible in the channel diff but below any sensible threshold
+    pixels[3, 4] = (129, 128, 128)
+    stats, delta = compare_images(expected, image(pixels))
+    assert stats['differing_pixels'] == 1
+    assert stats['differing_ratio'] == 1 / 20
+    assert stats['max_channel_diff'] == 128
+    assert stats['max_delta'] == round(float(delta[0, 0]), 4)
+    assert 0 < delta[3, 4] < 0.01
+    assert compare_images(expected, image(pixels), threshold=0.0)[0]['differing_pixels'] == 2
+    assert compare_images(expected, image(pixels), threshold=1.0)[0]['differing_pixels'] == 0
+
+
+def test_heatmap_paints_differences(expected):
+    delta = np.zeros((4, 5), dtype=np.float32)
+    delta[0, 0], delta[1, 1], delta[2, 2] = 0.8, 0.4, 0.05
+    out = heatmap(expected, delta)
+    assert out.mode == 'RGB' and out.size == expected.size
+    # Unchanged pixels are the golden dimmed towards light gray
+    gray = int(128 * 0.3 + 178)
+    assert out.getpixel((4, 3)) == (gray, gray, gray)
+    assert out.getpixel((2, 2)) == (gray, gray, gray)
+    # The largest difference is red, smaller ones shade towards yellow
+    assert out.getpixel((0, 0)) == (255, 0, 0)
+    assert out.getpixel((1, 1)) == (255, 115, 0)
+
+
+def test_check_case_stores_and_compares_goldens(tmp_path):
+    golden_dir, out_dir = tmp_path / 'golden', tmp_path / 'report'
+    golden_dir.mkdir()
+    out_dir.mkdir()
+    assert check_case('synthetic-4', str(golden_dir), str(out_dir), repeat=1)['status'] == 'missing'
+    assert check_case('synthetic-4', str(golden_dir), str(out_dir), update=True, repeat=1)['status'] == 'updated'
+
+    result = check_case('synthetic-4', str(golden_dir), str(out_dir), repeat=1)
+    assert result['status'] == 'pass'
+    assert result['differing_pixels'] == 0
+    assert result['render_ms'] > 0
+    assert list(out_dir.iterdir()) == []
+
+    golden_path = golden_dir / 'synthetic-4.png'
+    with Image.open(golden_path) as golden:
+        tampered = golden.convert('RGB')
+    tampered.paste((255, 0, 255), (100, 100, 140, 120))
+    tampered.save(golden_path)
+    result = check_case('synthetic-4', str(golden_dir), str(out_dir), repeat=1)
+    assert result['status'] == 'fail'
+    assert result['differing_pixels'] >= 40 * 20 // 2
+    assert sorted(p.name for p in out_dir.iterdir()) == ['synthetic-4.actual.png', 'synthetic-4.diff.png']
+    # A small tolerance is not enough for a whole block
+    assert check_case('synthetic-4', str(golden_dir), str(out_dir), max_ratio=1e-4, repeat=1)['status'] == 'fail'
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+import dashboard_series
+from dashboard_data import TrendingTopic
+from dashboard_generator import content_hash
+from dashboard_series import _minmax_python, minmax_buckets, series_digest
+
+np = pytest.importorskip('numpy')
+
+
+def test_short_series_are_kept():
+    assert minmax_buckets([], 10) == ([], [])
+    assert minmax_buckets([1, 2, 3], 0) == ([], [])
+    assert minmax_buckets([5], 10) == ([0.0], [5.0])
+    positions, values = minmax_buckets([1, 4, 2], 5)
+    assert positions == [0.0, 2.0, 4.0]
+    assert values == [1.0, 4.0, 2.0]
+
+
+def test_buckets_keep_spikes_in_order():
+    values = [0] * 100
+    values[10], values[60] = 50, -50
+    positions, points = minmax_buckets(values, 4)
+    assert positions == [0, 0, 1, 1, 2, 2, 3, 3]
+    assert points[:2] == [0.0, 50.0]
+    assert points[4:6] == [0.0, -50.0]
+    assert max(points) == 50 and min(points) == -50
+
+
+@pytest.mark.parametrize('count, buckets', [(21, 10), (1000, 7), (12345, 200), (400, 199)])
+def test_numpy_matches_python(count, buckets):
+    rng = random.Random(count)
+    values = [rng.randint(-1000, 1000) for _ in range(count)]
+    positions, points = minmax_buckets(np.array(values), buckets)
+    assert (positions, points) == tuple(map(list, _minmax_python(values, buckets)))
+
+
+def test_python_fallback(monkeypatch):
+    values = list(range(100, 0, -1))
+    expected = minmax_buckets(values, 10)
+    monkeypatch.setattr(dashboard_series, 'np', None)
+    assert minmax_buckets(values, 10) == expected
+    assert series_digest(values) == series_digest(np.array(values))
+
+
+def test_digest_ignores_container_type():
+    values = list(range(1000))
+    assert series_digest(values) == series_digest(np.arange(1000)) == series_digest(tuple(values))
+    assert series_digest(values) != series_digest(values[:-1] + [0])
+
+
+def test_content_hash_tracks_series_samples():
+    series = np.arange(100_000)
+    key = content_hash([TrendingTopic('AI', 5, '+1%', series)])
+    assert key == content_hash([TrendingTopic('AI', 5, '+1%', series.tolist())])
+    changed = series.copy()
+    changed[50_000] += 1
+    assert key != content_hash([TrendingTopic('AI', 5, '+1%', changed)])
+    assert key != content_hash([TrendingTopic('AI', 5, '+1%', None)])
+
+
+def test_content_hash_of_other_arrays():
+    assert content_hash(np.arange(6).reshape(2, 3)) != content_hash(np.arange(6).reshape(3, 2))
+    assert content_hash(np.arange(6)) != content_hash(np.arange(6, dtype=np.int8))
+    assert content_hash(np.float32(2)) == content_hash(2.0)
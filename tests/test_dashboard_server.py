@@ -0,0 +1,189 @@
+import http.client
+import io
+import json
+import socket
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+from PIL import Image
+
+import dashboard_data
+import dashboard_generator
+from conftest import assert_same_image
+from dashboard_generator import DashboardGenerator
+from dashboard_server import RenderCache, RenderService, make_server
+
+
+@pytest.fixture(scope='module')
+def server():
+    service = RenderService(workers=1)
+    server = make_server('127.0.0.1', 0, service)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def request(server, method, path, body=None, headers=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=60)
+    try:
+        connection.request(method, path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        connection.close()
+
+
+def raw_request(server, data):
+    """Send raw bytes and return the status line, so malformed headers reach the handler as sent"""
+    with socket.create_connection(server.server_address, timeout=10) as sock:
+        sock.sendall(data)
+        return sock.makefile('rb').readline().decode('latin-1')
+
+
+def test_post_renders_and_caches(server):
+    spec = json.dumps({'seed': 1, 'alerts': []}).encode()
+    status, headers, body = request(server, 'POST', '/render', spec)
+    assert status == 200
+    assert headers['Content-Type'] == 'image/png' and body.startswith(b'\x89PNG')
+    hits = server.service.cache.stats()['hits']
+
+    status, again, body_again = request(server, 'GET', f"/render/{headers['X-Spec-Id']}")
+    assert status == 200 and again['ETag'] == headers['ETag'] and body_again == body
+    assert server.service.cache.stats()['hits'] == hits + 1
+
+
+def test_if_none_match_is_answered_without_rendering(server, monkeypatch):
+    spec = {'seed': 99, 'alerts': [{'title': 'never rendered', 'time': 'now'}]}
+    etag = server.service.etag(spec)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("a revalidation must not render")
+
+    monkeypatch.setattr(server.service, 'render', fail)
+    status, headers, body = request(server, 'POST', '/render', json.dumps(spec), {'If-None-Match': etag})
+    assert status == 304 and headers['ETag'] == etag and body == b''
+
+
+def test_etag_depends_on_renderer_version(server, monkeypatch):
+    before = server.service.etag({}, 'png')
+    monkeypatch.setattr(dashboard_generator, 'RENDERER_VERSION', 'next')
+    assert server.service.etag({}, 'png') != before
+
+
+def test_etag_follows_the_clock(server, monkeypatch):
+    now = time.time()
+    spec = {'opportunities': [{'title': 'Fresh story', 'source': 'Wired', 'publishedAt': (now - 2 * 3600) * 1000,
+                               'finalScore': 0.9}]}
+    monkeypatch.setattr(dashboard_data.time, 'time', lambda: now)
+    status, headers, body = request(server, 'POST', '/render', json.dumps(spec))
+    assert status == 200
+
+    # Five hours on the card reads "7 hours ago", so the old image is stale
+    monkeypatch.setattr(dashboard_data.time, 'time', lambda: now + 5 * 3600)
+    status, later, later_body = request(server, 'POST', '/render', json.dumps(spec),
+                                        {'If-None-Match': headers['ETag']})
+    assert status == 200
+    assert later['ETag'] != headers['ETag'] and later_body != body
+
+
+@pytest.mark.parametrize('body', [b'{"a": ', b'\xff\xfe\xfa', b'[]'])
+def test_bad_bodies_are_400(server, body):
+    status, _, payload = request(server, 'POST', '/render', body)
+    assert status == 400
+    assert 'error' in json.loads(payload)
+
+
+@pytest.mark.parametrize('length', ['abc', '-1'])
+def test_bad_content_length_is_400(server, length):
+    status_line = raw_request(server, f"POST /render HTTP/1.1\r\nHost: x\r\nContent-Length: {length}\r\n\r\n".encode())
+    assert ' 400 ' in status_line
+
+
+def test_oversized_spec_is_413(server):
+    status_line = raw_request(server, b"POST /render HTTP/1.1\r\nHost: x\r\nContent-Length: 999999999\r\n\r\n")
+    assert ' 413 ' in status_line
+
+
+@pytest.mark.parametrize('spec', [
+    {'opportunities': [{'summary': 'no title'}]},
+    {'trending': [{'topic': 'AI', 'mentions': 'many'}]},
+    {'keywords': 5},
+    {'user': 'just a string'},
+])
+def test_malformed_spec_is_400(server, spec):
+    status, _, payload = request(server, 'POST', '/render', json.dumps(spec))
+    assert status == 400
+    assert 'invalid spec' in json.loads(payload)['error']
+
+
+def test_unknown_encoder_and_paths(server):
+    assert request(server, 'POST', '/render?encoder=tiff', b'{}')[0] == 400
+    assert request(server, 'GET', '/render/missing')[0] == 404
+    assert request(server, 'GET', '/nowhere')[0] == 404
+    status, _, body = request(server, 'GET', '/health')
+    assert status == 200 and 'cache' in json.loads(body)
+
+
+def test_render_cache_bounds():
+    cache = RenderCache(max_entries=2, max_bytes=10)
+    cache.put('a', b'1234')
+    cache.put('b', b'1234')
+    cache.put('a', b'12345')
+    assert cache.stats()['bytes'] == 9
+    cache.put('c', b'1234')
+    assert cache.get('b') is None and cache.get('a') == b'12345' and cache.get('c') == b'1234'
+
+
+def test_spec_scale_and_colors_are_applied(server):
+    spec = {'colors': {'primary': '#0a7f5a'}, 'seed': 2, 'alerts': []}
+    status, headers, body = request(server, 'POST', '/render', json.dumps(spec))
+    assert status == 200
+    generator = DashboardGenerator(verbose=False, seed=2)
+    generator.set_colors(primary='#0a7f5a')
+    with Image.open(io.BytesIO(body)) as image:
+        assert_same_image(image, generator.render(spec))
+    assert headers['ETag'] != request(server, 'POST', '/render', json.dumps(dict(spec, colors={})))[1]['ETag']
+
+    status, _, body = request(server, 'POST', '/render?encoder=png-fast', json.dumps({'scale': 2}))
+    assert status == 200 and Image.open(io.BytesIO(body)).size == (3840, 2160)
+
+
+@pytest.mark.parametrize('spec', [{'colors': {'primary': 'nope'}}, {'colors': ['#fff']}, {'scale': 0},
+                                  {'scale': '2'}, {'scale': 50}])
+def test_bad_scale_or_colors_are_400(server, spec):
+    status, _, payload = request(server, 'POST', '/render', json.dumps(spec))
+    assert status == 400
+    assert 'invalid spec' in json.loads(payload)['error']
+
+
+def test_pending_renders_are_bounded(monkeypatch):
+    service = RenderService(workers=1, max_pending=1)
+    server = make_server('127.0.0.1', 0, service)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    blocked = Future()
+    monkeypatch.setattr(service._executor, 'submit', lambda *args: blocked)
+    try:
+        waiting = threading.Thread(target=service.render, args=({'seed': 5},))
+        waiting.start()
+        while service.stats()['waiting'] == 0:
+            time.sleep(0.01)
+
+        status, headers, payload = request(server, 'POST', '/render', json.dumps({'seed': 6}))
+        assert status == 503 and headers['Retry-After'] == '1'
+        assert json.loads(payload)['retry'] is True
+
+        blocked.set_result(b'image')
+        waiting.join()
+        assert service.stats()['waiting'] == 0
+        # The finished render was cached for later requests
+        status, _, body = request(server, 'POST', '/render', json.dumps({'seed': 5}))
+        assert status == 200 and body == b'image'
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
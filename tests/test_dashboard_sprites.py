@@ -0,0 +1,42 @@
+import pytest
+from PIL import Image, ImageChops
+
+from dashboard_generator import DashboardGenerator, OffsetDraw, indexed_palette, paste_sprite
+from dashboard_sprites import SpriteAtlas, shadow_reach, widen
+
+
+def test_widen_repeats_one_column():
+    image = Image.frombytes('L', (3, 2), bytes([1, 2, 3, 4, 5, 6]))
+    wide = widen(image, 1, 3)
+    assert wide.size == (6, 2)
+    assert list(wide.tobytes()) == [1, 2, 2, 2, 2, 3, 4, 5, 5, 5, 5, 6]
+
+
+@pytest.mark.parametrize('scale', [1, 2])
+def test_paste_sprite_onto_an_offset_layer(scale):
+    atlas = SpriteAtlas(scale=scale)
+    sprite = atlas.chip(10, 6, 3, '#2563eb')
+    layer = Image.new('RGB', (40 * scale, 30 * scale), 'white')
+    paste_sprite(OffsetDraw(layer, 100, 50, scale), sprite, 105, 60)
+    # Dashboard (105, 60) is layer pixel (5, 10) times the scale
+    expected = Image.new('RGB', layer.size, 'white')
+    expected.paste(sprite[0], (5 * scale, 10 * scale), sprite[1])
+    assert ImageChops.difference(layer, expected).getbbox() is None
+    assert layer.getpixel((10 * scale, 13 * scale)) == (37, 99, 235)
+
+
+@pytest.mark.parametrize('scale', [1, 2, 3])
+@pytest.mark.parametrize('indexed', [False, True])
+@pytest.mark.parametrize('width', [60, 300, 1260])
+def test_card_matches_a_full_rasterization(scale, indexed, width):
+    palette = DashboardGenerator(verbose=False).palette
+    atlas = SpriteAtlas(indexed_palette=indexed_palette(palette) if indexed else None, scale=scale)
+    shadow = (palette['gray_300'], 1.0, 3, 0) if indexed else (palette['gray_900'], 0.12, 3, 4)
+    args = (width, 200, 12, palette['white'], palette['gray_200'], 60, palette['gray_50'], shadow)
+    image, mask, origin = atlas.card(*args)
+    pad = shadow_reach(shadow[2], shadow[3])
+    full_image, full_mask, full_origin = atlas.stamp(atlas._card_body(*args), (-pad, -pad))
+    assert origin == full_origin
+    assert image.size == full_image.size == ((width + 1 + 2 * pad) * scale, (201 + 2 * pad) * scale)
+    assert ImageChops.difference(image.convert('RGBA'), full_image.convert('RGBA')).getbbox() is None
+    assert ImageChops.difference(mask, full_mask).getbbox() is None
@@ -0,0 +1,68 @@
+import pytest
+
+from dashboard_generator import FontRegistry
+from dashboard_text import TextLayout
+
+SIZE = 14
+
+
+@pytest.fixture
+def layout():
+    return TextLayout(FontRegistry())
+
+
+def test_truncate_fits(layout):
+    text = "A fairly long opportunity title that will not fit"
+    width = layout.width(text, SIZE) / 2
+    truncated = layout.truncate(text, SIZE, width)
+    assert truncated.endswith("...")
+    assert text.startswith(truncated[:-3].rstrip())
+    assert layout.width(truncated, SIZE) <= width
+
+
+def test_truncate_keeps_short_text(layout):
+    assert layout.truncate("short", SIZE, 1000) == "short"
+
+
+def test_truncate_narrower_than_ellipsis(layout):
+    dot = layout.width(".", SIZE)
+    assert layout.truncate("overflowing", SIZE, dot * 2) == ".."
+    assert layout.truncate("overflowing", SIZE, dot / 2) == ""
+    assert layout.truncate("overflowing", SIZE, 0) == ""
+
+
+def test_wrap_lines_fit(layout):
+    text = "the quick brown fox jumps over the lazy dog " * 4
+    width = layout.width("the quick brown", SIZE)
+    lines = layout.wrap(text, SIZE, width)
+    assert ' '.join(lines) == ' '.join(text.split())
+    assert all(layout.width(line, SIZE) <= width for line in lines)
+
+
+def test_wrap_breaks_long_words(layout):
+    word = "supercalifragilisticexpialidocious"
+    width = layout.width(word, SIZE) / 3
+    lines = layout.wrap(word, SIZE, width)
+    assert len(lines) > 1
+    assert ''.join(lines) == word
+    assert all(layout.width(line, SIZE) <= width for line in lines)
+
+
+def test_wrap_max_lines_keeps_broken_words_joined(layout):
+    word = "supercalifragilisticexpialidocious"
+    width = layout.width(word, SIZE) * 2 / 5
+    lines = layout.wrap(word + " tail", SIZE, width, max_lines=2)
+    assert len(lines) == 2
+    assert lines[1].endswith("...")
+    assert ' ' not in lines[1]
+    assert (lines[0] + lines[1][:-3]) == word[:len(lines[0]) + len(lines[1]) - 3]
+
+
+def test_clearing_fonts_resets_layout(layout):
+    registry = layout.font_registry
+    layout.wrap("some words to wrap", SIZE, 60)
+    layout._advances[SIZE]['x'] = 1000.0
+    assert layout.width("x", SIZE) == 1000.0
+    registry.clear()
+    assert layout.width("x", SIZE) == registry.get(SIZE).getlength("x")
+    assert not layout._layouts
@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+
+import pytest
+
+from dashboard_fixtures import synthetic_spec
+from dashboard_generator import DashboardGenerator
+from dashboard_trace import FONT_PRIMITIVES, LAYOUT_PRIMITIVES, PRIMITIVES, SECTIONS, RenderProfiler
+
+# Where each card primitive is expected to be drawn
+CARD_SECTIONS = {
+    'draw_keyword_card': 'sidebar_left',
+    'draw_opportunity_card': 'main_content',
+    'draw_trending_item': 'sidebar_right',
+    'draw_alert_item': 'sidebar_right',
+}
+
+
+@pytest.fixture
+def generator():
+    generator = DashboardGenerator(verbose=False, seed=7)
+    yield generator
+    generator.close()
+
+
+def instrumented(generator):
+    return {
+        (obj, attr) for obj, names in (
+            (generator, list(SECTIONS) + list(PRIMITIVES)),
+            (generator.font_registry, FONT_PRIMITIVES),
+            (generator.text_layout, LAYOUT_PRIMITIVES),
+        ) for attr in names if attr in vars(obj)
+    }
+
+
+def test_attach_and_detach_restore_methods(generator):
+    before = generator.render()
+    profiler = RenderProfiler().attach(generator)
+    patched = len(SECTIONS) + len(PRIMITIVES) + len(FONT_PRIMITIVES) + len(LAYOUT_PRIMITIVES)
+    assert len(instrumented(generator)) == patched
+    with pytest.raises(RuntimeError):
+        profiler.attach(generator)
+
+    generator.render()
+    assert profiler.events
+    profiler.detach()
+    assert instrumented(generator) == set()
+    assert generator.draw_text.__func__ is DashboardGenerator.draw_text
+
+    count = len(profiler.events)
+    assert generator.render().tobytes() == before.tobytes()
+    assert len(profiler.events) == count
+    # A detached profiler can be attached again
+    profiler.attach(generator).detach()
+
+
+def test_enable_and_disable_profiling(generator):
+    profiler = generator.enable_profiling()
+    assert generator.enable_profiling() is profiler
+    generator.generate_dashboard(None, encoder='png-fast')
+    assert generator.disable_profiling() is profiler
+    assert generator.profiler is None and instrumented(generator) == set()
+    sections = {row['section'] for row in profiler.summary()}
+    assert {'background', 'header', 'sidebar_left', 'main_content', 'sidebar_right', 'encode'} <= sections
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_primitives_are_attributed_to_their_section(workers):
+    spec = synthetic_spec(20, 1)
+    # Leave room for alerts below the trending topics
+    spec['trending'] = spec['trending'][:3]
+    generator = DashboardGenerator(verbose=False, seed=7, workers=workers)
+    try:
+        profiler = generator.enable_profiling()
+        generator.render(spec)
+    finally:
+        generator.close()
+    seen = {}
+    for name, section, *_ in profiler.events:
+        seen.setdefault(name, set()).add(section)
+    for name, section in CARD_SECTIONS.items():
+        assert seen[name] == {section}
+    assert 'other' not in set().union(*seen.values())
+    if workers > 1:
+        # The panels really were drawn on pool threads
+        threads = {tid for name, _, _, _, tid in profiler.events if name in CARD_SECTIONS}
+        assert threading.get_ident() not in threads
+
+
+def test_summary_totals(generator):
+    profiler = generator.enable_profiling()
+    generator.render()
+    rows = profiler.summary()
+    assert sum(row['count'] for row in rows) == len(profiler.events)
+    assert [row['total_ms'] for row in rows] == sorted((row['total_ms'] for row in rows), reverse=True)
+    table = profiler.format_summary().splitlines()
+    assert table[0].split()[:2] == ['section', 'name']
+    assert len(table) == len(rows) + 1
+    profiler.reset()
+    assert profiler.summary() == []
+
+
+def test_chrome_trace_shape(generator, tmp_path):
+    profiler = generator.enable_profiling()
+    generator.render()
+    trace = profiler.write_chrome_trace(str(tmp_path / 'trace.json'))
+    with open(trace, encoding='utf-8') as f:
+        loaded = json.load(f)
+    assert loaded == json.loads(json.dumps(profiler.chrome_trace()))
+    assert loaded['displayTimeUnit'] == 'ms'
+
+    events = loaded['traceEvents']
+    assert len(events) == len(profiler.events)
+    for event in events:
+        assert set(event) == {'name', 'cat', 'ph', 'ts', 'dur', 'pid', 'tid'}
+        assert event['ph'] == 'X'
+        assert event['ts'] >= 0 and event['dur'] >= 0
+        assert event['pid'] == os.getpid()
+
+    # Complete events nest: every card lies within its section's span
+    spans = {event['cat']: event for event in events if event['name'] in SECTIONS}
+    for event in events:
+        if event['name'] in CARD_SECTIONS:
+            span = spans[event['cat']]
+            assert span['ts'] <= event['ts']
+            assert event['ts'] + event['dur'] <= span['ts'] + span['dur']